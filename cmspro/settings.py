@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
+import tempfile
 from pathlib import Path
 from datetime import timedelta
 from dotenv import load_dotenv
@@ -84,7 +85,8 @@ REST_FRAMEWORK = {
         # JWT for client/mobile apps
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    # Page numbers by default; ?cursor= switches viewsets with a cursor_ordering to keyset pagination
+    "DEFAULT_PAGINATION_CLASS": "content.pagination.PageNumberOrCursorPagination",
     "PAGE_SIZE": 10,
     # Dashboard-specific settings
     "DEFAULT_FILTER_BACKENDS": [
@@ -96,6 +98,10 @@ REST_FRAMEWORK = {
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    # Static files, before anything that would touch sessions or the database
+    "whitenoise.middleware.WhiteNoiseMiddleware",
+    # Outermost after static files, so request timings include every other middleware
+    "content.metrics.MetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -174,6 +180,91 @@ else:
         }
     }
 
+# Cache
+# Redis when REDIS_URL is set. Otherwise a per-process cache in development and
+# a file-based cache (shared by every gunicorn worker on the host) in production.
+REDIS_URL = os.getenv("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+elif DEBUG:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.getenv("CACHE_DIR", os.path.join(tempfile.gettempdir(), "cmspro-cache")),
+            "OPTIONS": {"MAX_ENTRIES": 10000},
+        }
+    }
+
+# Lifetime of cached public API responses, in seconds (0 disables the cache).
+# Entries are invalidated on every content change, so this only bounds memory.
+CONTENT_CACHE_TIMEOUT = int(os.getenv("CONTENT_CACHE_TIMEOUT", 60 * 60 * 24))
+
+# Seconds the dashboard statistics are cached (edits invalidate them sooner)
+DASHBOARD_STATS_TIMEOUT = int(os.getenv("DASHBOARD_STATS_TIMEOUT", 60))
+
+# Seconds a worker trusts its in-memory SiteConfig/Banner before revalidating
+SINGLETON_CACHE_TTL = float(os.getenv("SINGLETON_CACHE_TTL", 5))
+
+# Seconds between flushes of buffered page-view counts (0 writes every view immediately)
+VIEW_COUNT_FLUSH_INTERVAL = float(os.getenv("VIEW_COUNT_FLUSH_INTERVAL", 10))
+
+# Render blog/project/service/career/notice detail pages with their data in the
+# HTML (False serves the empty shells and lets the page scripts fetch everything)
+SERVER_SIDE_RENDERING = os.getenv("SERVER_SIDE_RENDERING", "True") == "True"
+
+# Background tasks (content.tasks) are processed by `manage.py run_task_worker`.
+# Eager mode runs them in the web process right after the commit instead.
+TASK_QUEUE_EAGER = os.getenv("TASK_QUEUE_EAGER", "False") == "True"
+# Seconds after which a running task whose worker vanished is queued again
+# (unless the task sets its own lock_timeout)
+TASK_LOCK_TIMEOUT = int(os.getenv("TASK_LOCK_TIMEOUT", 600))
+
+# Chunked uploads (/api/uploads/): chunks are staged on local disk, so every
+# web and task worker must share UPLOAD_TEMP_DIR
+UPLOAD_TEMP_DIR = os.getenv("UPLOAD_TEMP_DIR", os.path.join(tempfile.gettempdir(), "cmspro-uploads"))
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", 5 * 1024 * 1024))
+UPLOAD_MAX_SIZE = int(os.getenv("UPLOAD_MAX_SIZE", 2 * 1024 * 1024 * 1024))
+# Seconds an unfinished upload is kept after its last chunk
+UPLOAD_EXPIRY = int(os.getenv("UPLOAD_EXPIRY", 60 * 60 * 24))
+
+# Public lead and job application intake (content.intake): sliding-window
+# limits per client address and per email ("" disables), the seconds an
+# identical resubmission is answered with the first one's row (0 disables),
+# and who is emailed about new submissions (none when empty)
+INTAKE_RATE_PER_IP = os.getenv("INTAKE_RATE_PER_IP", "20/hour")
+INTAKE_RATE_PER_EMAIL = os.getenv("INTAKE_RATE_PER_EMAIL", "5/hour")
+INTAKE_DEDUPE_WINDOW = int(os.getenv("INTAKE_DEDUPE_WINDOW", 600))
+INTAKE_NOTIFY_EMAILS = [
+    address.strip() for address in os.getenv("INTAKE_NOTIFY_EMAILS", "").split(",") if address.strip()
+]
+
+# Project gallery uploads (content.gallery): images are normalized in a pool
+# of this many threads shared by the worker's requests (0 runs them in the request thread)
+GALLERY_THREADS = int(os.getenv("GALLERY_THREADS", min(4, os.cpu_count() or 1)))
+# Longest side, in pixels, a stored gallery image is scaled down to
+GALLERY_MAX_DIMENSION = int(os.getenv("GALLERY_MAX_DIMENSION", 4096))
+GALLERY_MAX_FILES = int(os.getenv("GALLERY_MAX_FILES", 100))
+DATA_UPLOAD_MAX_NUMBER_FILES = max(100, GALLERY_MAX_FILES)
+
+# Banner video renditions (content.video) are transcoded by the task worker;
+# without these binaries the original upload is served as-is
+FFMPEG_BINARY = os.getenv("FFMPEG_BINARY", "ffmpeg")
+FFPROBE_BINARY = os.getenv("FFPROBE_BINARY", "ffprobe")
+# Seconds a single ffmpeg run may take before the rendition build gives up
+VIDEO_PROCESSING_TIMEOUT = int(os.getenv("VIDEO_PROCESSING_TIMEOUT", 30 * 60))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=15),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
@@ -232,9 +323,37 @@ STATICFILES_DIRS = [
 # Where `collectstatic` will gather files for production
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
+# collectstatic fingerprints every asset (app.3f2a9c.css) and writes .gz and
+# .br copies next to it; WhiteNoise serves them from the app process with the
+# best encoding the client accepts, caching fingerprinted names forever.
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "cmspro.storage.StaticFilesStorage"},
+}
+# Unfingerprinted names (e.g. /static/img/... hardcoded in scripts) are
+# revalidated after this many seconds
+WHITENOISE_MAX_AGE = int(os.getenv("WHITENOISE_MAX_AGE", 60 * 60))
+
+# Prometheus metrics (content.metrics), served at /metrics. Scrapers send
+# "Authorization: Bearer <METRICS_TOKEN>"; without a token only superusers can
+# read them. Under gunicorn set PROMETHEUS_MULTIPROC_DIR to aggregate workers.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True") == "True"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Media is served by content.media.serve_media. Set MEDIA_SENDFILE to
+# "x-accel-redirect" (nginx) or "x-sendfile" (Apache/lighttpd) to let the front
+# server send the file body; nginx needs an `internal` location at
+# MEDIA_ACCEL_REDIRECT_PREFIX aliased to MEDIA_ROOT.
+MEDIA_SENDFILE = os.getenv("MEDIA_SENDFILE", "")
+MEDIA_ACCEL_REDIRECT_PREFIX = os.getenv("MEDIA_ACCEL_REDIRECT_PREFIX", "/protected-media/")
+# Uploads get a new name when their file changes, so public media never goes stale
+MEDIA_CACHE_CONTROL = os.getenv("MEDIA_CACHE_CONTROL", "public, max-age=31536000, immutable")
+# Uploads under these prefixes (resumes, lead attachments) are only served to admins
+MEDIA_PRIVATE_PREFIXES = ("applications/", "leads/")
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -0,0 +1,21 @@
+"""
+Static files storage.
+
+``collectstatic`` stores every asset under a content-hashed name with gzip
+and brotli copies next to it, and WhiteNoise serves those with far-future
+immutable cache headers.
+"""
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+
+class StaticFilesStorage(CompressedManifestStaticFilesStorage):
+    # A {% static %} name missing from the manifest renders unhashed instead of failing the page
+    manifest_strict = False
+
+    def hashed_name(self, name, content=None, filename=None):
+        try:
+            return super().hashed_name(name, content, filename)
+        except ValueError:
+            # Vendored CSS (rs-plugin, font-awesome, ...) refers to files that were
+            # never shipped with it; leave those references as they are
+            return name
@@ -1,7 +1,9 @@
 # website_backend/urls.py
 
+import re
+
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from rest_framework import routers
 from django.conf import settings
 from django.conf.urls.static import static
@@ -21,9 +23,17 @@ from content.views import (
     CareerViewSet,
     NoticeViewSet,
     JobApplicationViewSet,
+    ChunkedUploadViewSet,
     UserRegistrationView,
     CsrfView,
     DashboardView,
+    DashboardStatsView,
+    HomeView,
+    BlogPostPageView,
+    ProjectPageView,
+    ServicePageView,
+    CareerPageView,
+    NoticePageView,
     CustomLoginView,
     CustomLogoutView,
 )
@@ -35,6 +45,8 @@ from rest_framework_simplejwt.views import (
     TokenVerifyView,
 )
 from content.views import CsrfView
+from content.media import serve_media
+from content.metrics import metrics_view
 from django.views.generic import TemplateView
 from django.shortcuts import render
 from django.http import Http404
@@ -56,6 +68,7 @@ router.register(r"clients", ClientViewSet, basename="client")
 router.register(r"careers", CareerViewSet, basename="career")
 router.register(r"notices", NoticeViewSet, basename="notice")
 router.register(r"job-applications", JobApplicationViewSet, basename="jobapplication")
+router.register(r"uploads", ChunkedUploadViewSet, basename="upload")
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -70,15 +83,23 @@ urlpatterns = [
     
     # Projects pages
     path("projects/", TemplateView.as_view(template_name="result.html"), name="projects_list"),
-    path("projects/<slug:slug>/", TemplateView.as_view(template_name="project-detail.html"), name="project_detail"),
+    path("projects/<slug:slug>/", ProjectPageView.as_view(), name="project_detail"),
     
     # Services pages
     path("services/", TemplateView.as_view(template_name="service-landing.html"), name="services_list"),
-    path("services/<slug:slug>/", TemplateView.as_view(template_name="service-detail.html"), name="service_detail"),
+    path("services/<slug:slug>/", ServicePageView.as_view(), name="service_detail"),
+
+    # Blog, career and notice detail pages (server-rendered when SERVER_SIDE_RENDERING is on)
+    path("blog-detail.html", BlogPostPageView.as_view(), name="blog_detail"),
+    path("careers/<slug:slug>/", CareerPageView.as_view(), name="career_detail"),
+    path("notices/<slug:slug>/", NoticePageView.as_view(), name="notice_detail"),
     
     path("api/", include((router.urls, "api"))),
     path("api/csrf/", CsrfView.as_view(), name="csrf-token"),
     path("api/register/", UserRegistrationView.as_view(), name="user-register"),
+    path("api/home/", HomeView.as_view(), name="home-bundle"),
+    path("api/dashboard/stats/", DashboardStatsView.as_view(), name="dashboard-stats"),
+    path("metrics", metrics_view, name="metrics"),
     
     # JWT endpoints
     path("api/token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
@@ -115,10 +136,14 @@ def flatpage(request, page):
     except TemplateDoesNotExist:
         raise Http404()
 
-# Serve static and media files in development (must be before catch-all routes)
+# Serve static files in development (must be before catch-all routes)
 if settings.DEBUG:
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
+# Uploaded media, in every environment (Range requests, cache headers, sendfile offload)
+urlpatterns += [
+    re_path(rf"^{re.escape(settings.MEDIA_URL.lstrip('/'))}(?P<path>.+)$", serve_media, name="media"),
+]
 
 # catch-all for other frontend pages (must come after other routes)
 # Match both with and without trailing slash so original links like `about.html` still work.
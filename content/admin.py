@@ -1,6 +1,7 @@
 from django.contrib import admin
+from django.utils import timezone
 from django.utils.html import format_html
-from .models import Banner, About, Project, Lead, BlogPost, SiteConfig, Service, ServiceCategory, Client, TeamMember, Career, Notice, JobApplication
+from .models import Banner, About, Project, Lead, BlogPost, SiteConfig, Service, ServiceCategory, Client, TeamMember, Career, Notice, JobApplication, Task
 
 @admin.register(ServiceCategory)
 class ServiceCategoryAdmin(admin.ModelAdmin):
@@ -341,3 +342,19 @@ class JobApplicationAdmin(admin.ModelAdmin):
             "classes": ("collapse",)
         }),
     )
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ("id", "name", "status", "attempts", "max_attempts", "run_after", "locked_by", "created_at")
+    list_filter = ("status", "name")
+    search_fields = ("name", "last_error")
+    readonly_fields = ("created_at", "updated_at", "locked_by", "locked_at", "last_error")
+    actions = ("retry_now",)
+
+    @admin.action(description="Retry selected tasks now")
+    def retry_now(self, request, queryset):
+        updated = queryset.exclude(status=Task.RUNNING).update(
+            status=Task.QUEUED, attempts=0, run_after=timezone.now(),
+        )
+        self.message_user(request, f"{updated} task(s) queued again.")
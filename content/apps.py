@@ -4,3 +4,16 @@ from django.apps import AppConfig
 class ContentConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "content"
+
+    def ready(self):
+        from django.conf import settings
+        from django.db.models.signals import post_migrate
+
+        from .search import install_search_index
+        from .metrics import install_serializer_timer
+        from .signals import connect_signals
+
+        connect_signals()
+        if settings.METRICS_ENABLED:
+            install_serializer_timer()
+        post_migrate.connect(install_search_index, sender=self)
@@ -0,0 +1,510 @@
+"""
+Load benchmarks.
+
+``manage.py seed_benchmark`` fills the database with production-sized data
+(``VOLUMES``, scaled with ``--scale``). Rows are written with ``bulk_create``
+after the same preparation ``save()`` would do (rendered markdown, reading
+time, publication dates), and are recognisable by ``MARKER`` so
+``--clear`` can remove them again. Image fields name files that do not
+exist; no variants are built.
+
+``manage.py run_benchmark`` discovers every GET route of the URLconf, fills
+in path parameters from the database, and drives each route in turn with
+concurrent keep-alive connections against a running server. For every route
+it reports p50/p95/p99 latency, requests per second, status codes and, when
+the server's ``/metrics`` is readable, the database queries per request.
+Results are written as JSON; ``--compare`` sets them against an earlier run.
+"""
+import http.client
+import random
+import statistics
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
+from urllib.parse import urlencode, urlsplit
+
+from django.apps import apps
+from django.db import connection, transaction
+from django.urls import URLPattern, URLResolver, get_resolver, resolve, reverse
+from django.utils import timezone
+from django.utils.text import slugify
+from prometheus_client.parser import text_string_to_metric_families
+
+from .bulk import prepare
+from .caching import bump_generation
+from .metrics import label_for, metrics_view
+
+MARKER = "Benchmark"
+MARKER_DOMAIN = "benchmark.invalid"
+
+VOLUMES = {
+    "blog_posts": 10_000,
+    "projects": 2_000,
+    "images_per_project": 20,
+    "services": 200,
+    "careers": 200,
+    "notices": 2_000,
+    "team_members": 50,
+    "clients": 300,
+    "leads": 200_000,
+    "job_applications": 50_000,
+}
+
+CATEGORIES_PER_MODEL = 12
+BATCH_SIZE = 2_000
+
+WORDS = (
+    "concrete steel facade structural design client delivery schedule budget site survey permit "
+    "foundation renovation interior lighting energy efficient sustainable timber glass roof "
+    "planning engineering inspection handover maintenance residential commercial office tower"
+).split()
+
+
+# Seeding
+
+class Seeder:
+    def __init__(self, scale=1.0, seed=0, stdout=None):
+        self.volumes = {
+            name: count if name == "images_per_project" else max(1, round(count * scale))
+            for name, count in VOLUMES.items()
+        }
+        self.random = random.Random(seed)
+        self.now = timezone.now()
+        self.write = stdout.write if stdout else (lambda message: None)
+
+    def words(self, count):
+        return " ".join(self.random.choice(WORDS) for _ in range(count))
+
+    def markdown(self, paragraphs):
+        sections = []
+        for index in range(paragraphs):
+            sections.append(f"## {self.words(4).capitalize()}\n\n{self.words(self.random.randint(60, 160))}.")
+            if index % 2:
+                sections.append("\n".join(f"- {self.words(6)}" for _ in range(4)))
+        return "\n\n".join(sections)
+
+    def past(self, days=730):
+        return self.now - timedelta(seconds=self.random.randint(0, days * 86400))
+
+    def batches(self, model, total, build):
+        """bulk_create ``total`` rows made by ``build(index)``, ``BATCH_SIZE`` at a time."""
+        created = 0
+        for start in range(0, total, BATCH_SIZE):
+            instances = [build(index) for index in range(start, min(total, start + BATCH_SIZE))]
+            prepare(instances)  # slugs are set, so this renders markdown and derives fields
+            with transaction.atomic():
+                created += len(model._base_manager.bulk_create(instances, batch_size=BATCH_SIZE))
+        self.write(f"{model._meta.verbose_name_plural}: {created}")
+
+    def categories(self, model):
+        rows = [
+            model(name=f"{MARKER} {model._meta.verbose_name} {index}", created_at=self.now)
+            for index in range(CATEGORIES_PER_MODEL)
+        ]
+        for row in rows:
+            row.slug = slugify(row.name)
+        return model._base_manager.bulk_create(rows)
+
+    def run(self):
+        models = {name: apps.get_model("content", name) for name in (
+            "ProjectCategory", "BlogCategory", "ServiceCategory", "Project", "ProjectImage", "BlogPost",
+            "Service", "Career", "Notice", "TeamMember", "Client", "Lead", "JobApplication",
+        )}
+        volumes = self.volumes
+        with backdated(*models.values()):
+            project_categories = self.categories(models["ProjectCategory"])
+            blog_categories = self.categories(models["BlogCategory"])
+            service_categories = self.categories(models["ServiceCategory"])
+
+            def blog_post(index):
+                created = self.past()
+                return models["BlogPost"](
+                    title=f"{MARKER} post {index:05d}: {self.words(5)}", slug=f"benchmark-post-{index:05d}",
+                    author=self.words(2).title(), excerpt=self.words(25), content=self.markdown(6),
+                    status=self.random.choices(["published", "draft", "archived"], [85, 10, 5])[0],
+                    tags=",".join(self.random.sample(WORDS, 3)), category=self.random.choice(blog_categories),
+                    featured_image=f"blog/featured/benchmark-{index % 50}.jpg",
+                    is_featured=index % 40 == 0, view_count=self.random.randint(0, 5000),
+                    created_at=created, published_at=created,
+                )
+            self.batches(models["BlogPost"], volumes["blog_posts"], blog_post)
+
+            def project(index):
+                return models["Project"](
+                    title=f"{MARKER} project {index:05d}: {self.words(3)}", slug=f"benchmark-project-{index:05d}",
+                    short_description=self.words(20), long_description=self.words(200),
+                    status=self.random.choice(["ongoing", "completed", "planned"]),
+                    category=self.random.choice(project_categories), is_featured=index % 25 == 0,
+                    cover_image=f"projects/covers/benchmark-{index % 50}.jpg", created_at=self.past(),
+                )
+            self.batches(models["Project"], volumes["projects"], project)
+            project_ids = list(
+                models["Project"]._base_manager.filter(title__startswith=MARKER).values_list("pk", flat=True)
+            )
+            per_project = volumes["images_per_project"]
+
+            def project_image(index):
+                return models["ProjectImage"](
+                    project_id=project_ids[index // per_project], order=index % per_project,
+                    image=f"projects/gallery/benchmark-{index % 200}.jpg", caption=self.words(6),
+                    created_at=self.past(),
+                )
+            self.batches(models["ProjectImage"], len(project_ids) * per_project, project_image)
+
+            def service(index):
+                created = self.past()
+                return models["Service"](
+                    title=f"{MARKER} service {index:04d}: {self.words(3)}", slug=f"benchmark-service-{index:04d}",
+                    excerpt=self.words(25), content=self.markdown(4), status="published",
+                    category=self.random.choice(service_categories), order=index,
+                    featured_image=f"services/featured/benchmark-{index % 50}.jpg",
+                    created_at=created, published_at=created,
+                )
+            self.batches(models["Service"], volumes["services"], service)
+
+            def career(index):
+                created = self.past(180)
+                return models["Career"](
+                    title=f"{MARKER} career {index:04d}: {self.words(2)}", slug=f"benchmark-career-{index:04d}",
+                    location=self.words(1).title(), short_description=self.words(20),
+                    requirements=self.markdown(1), responsibilities=self.markdown(1),
+                    status=self.random.choices(["active", "closed", "draft"], [70, 20, 10])[0],
+                    created_at=created, published_at=created,
+                )
+            self.batches(models["Career"], volumes["careers"], career)
+            career_ids = list(
+                models["Career"]._base_manager.filter(title__startswith=MARKER).values_list("pk", flat=True)
+            )
+
+            def notice(index):
+                created = self.past(365)
+                return models["Notice"](
+                    title=f"{MARKER} notice {index:05d}: {self.words(4)}", slug=f"benchmark-notice-{index:05d}",
+                    content=self.markdown(2), excerpt=self.words(20), status="published",
+                    priority=self.random.choice(["low", "normal", "high", "urgent"]),
+                    notice_date=created.date(), is_sticky=index % 100 == 0,
+                    created_at=created, published_at=created,
+                )
+            self.batches(models["Notice"], volumes["notices"], notice)
+
+            self.batches(models["TeamMember"], volumes["team_members"], lambda index: models["TeamMember"](
+                name=f"{MARKER} member {index:03d}", position=self.words(2).title(), bio=self.words(60),
+                photo=f"team/photos/benchmark-{index % 20}.jpg", order=index, created_at=self.past(),
+            ))
+            self.batches(models["Client"], volumes["clients"], lambda index: models["Client"](
+                name=f"{MARKER} client {index:04d}", about=self.words(40),
+                logo=f"clients/logos/benchmark-{index % 20}.png", order=index, created_at=self.past(),
+            ))
+            self.batches(models["Lead"], volumes["leads"], lambda index: models["Lead"](
+                name=self.words(2).title(), email=f"lead{index}@{MARKER_DOMAIN}", phone="+10000000000",
+                message=self.words(self.random.randint(20, 120)), source=self.random.choice(["web", "ads", "referral"]),
+                status=self.random.choice(["new", "contacted", "qualified", "lost"]), is_read=self.random.random() < 0.7,
+                created_at=self.past(365),
+            ))
+            self.batches(models["JobApplication"], volumes["job_applications"], lambda index: models["JobApplication"](
+                career_id=self.random.choice(career_ids), full_name=self.words(2).title(),
+                email=f"applicant{index}@{MARKER_DOMAIN}", phone="+10000000000", cover_letter=self.words(150),
+                resume=f"applications/resumes/benchmark-{index % 100}.pdf",
+                status=self.random.choice(["pending", "reviewing", "shortlisted", "rejected", "accepted"]),
+                created_at=self.past(180),
+            ))
+        bump_generation(*models.values())
+
+
+@contextmanager
+def backdated(*models):
+    """Let ``bulk_create`` keep the ``created_at`` set on seeded rows instead of stamping now."""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, "auto_now_add", False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def seeded_querysets():
+    """Every row ``Seeder`` creates, in deletion order."""
+    model = lambda name: apps.get_model("content", name)._base_manager
+    return [
+        model("JobApplication").filter(email__endswith=f"@{MARKER_DOMAIN}"),
+        model("Lead").filter(email__endswith=f"@{MARKER_DOMAIN}"),
+        model("ProjectImage").filter(project__title__startswith=MARKER),
+        *(model(name).filter(title__startswith=MARKER) for name in ("Project", "BlogPost", "Service", "Career", "Notice")),
+        *(model(name).filter(name__startswith=MARKER) for name in (
+            "TeamMember", "Client", "ProjectCategory", "BlogCategory", "ServiceCategory",
+        )),
+    ]
+
+
+def clear_seeded():
+    deleted = 0
+    with transaction.atomic():
+        for queryset in seeded_querysets():
+            deleted += queryset.delete()[0]
+    bump_generation(*(queryset.model for queryset in seeded_querysets()))
+    return deleted
+
+
+# Route discovery
+
+def iter_patterns(patterns, namespace=""):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            prefix = f"{namespace}{pattern.namespace}:" if pattern.namespace else namespace
+            yield from iter_patterns(pattern.url_patterns, prefix)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield f"{namespace}{pattern.name}", pattern
+
+
+def public_filters():
+    """Lookups a row must match to be visible anonymously, from the server-rendered page views."""
+    from .views import ContentPageView
+
+    return {view.model: view.public_filters for view in ContentPageView.__subclasses__()}
+
+
+def sample_value(pattern, argument):
+    """A value for path argument ``argument`` of ``pattern``, or None when there is none to give."""
+    view_class = getattr(pattern.callback, "cls", None)
+    queryset = getattr(view_class, "queryset", None)
+    if argument.endswith("_id"):
+        model = next((m for m in apps.get_app_config("content").get_models() if m._meta.model_name == argument[:-3]), None)
+        queryset = model._base_manager.all() if model else None
+    elif queryset is None:
+        model = getattr(getattr(pattern.callback, "view_class", None), "model", None)
+        queryset = model._base_manager.all() if model else None
+    if queryset is None:
+        return None
+    field = "pk" if argument in ("pk", "id") or argument.endswith("_id") else argument
+    if field != "pk" and field not in {f.name for f in queryset.model._meta.fields}:
+        return None
+    queryset = queryset.filter(**public_filters().get(queryset.model, {}))
+    value = queryset.order_by("pk").values_list(field, flat=True).first()
+    return None if value is None else str(value)
+
+
+def discover_routes(exclude_namespaces=("admin",)):
+    """``(name, path, view label)`` for every named route that can be requested with GET."""
+    routes, skipped = [], []
+    for name, pattern in iter_patterns(get_resolver().url_patterns):
+        if name.split(":")[0] in exclude_namespaces or pattern.callback is metrics_view:
+            continue
+        actions = getattr(pattern.callback, "actions", None)
+        if actions is not None and "get" not in actions:
+            continue
+        arguments = list(pattern.pattern.regex.groupindex)
+        if "format" in arguments:
+            continue  # DRF's .json/.api suffix duplicates
+        kwargs = {argument: sample_value(pattern, argument) for argument in arguments}
+        missing = [argument for argument, value in kwargs.items() if value is None]
+        if missing:
+            skipped.append({"name": name, "reason": f"no value for {', '.join(missing)}"})
+            continue
+        try:
+            path = reverse(name, kwargs=kwargs)
+        except Exception as exc:
+            skipped.append({"name": name, "reason": f"cannot reverse: {exc}"})
+            continue
+        routes.append((name, path, label_for(resolve(path), "GET")))
+    return routes, skipped
+
+
+# Load driver
+
+class Client:
+    """One keep-alive connection per thread to ``base_url``."""
+
+    def __init__(self, base_url, headers=None, timeout=30):
+        parts = urlsplit(base_url)
+        self.https = parts.scheme == "https"
+        self.host = parts.netloc
+        self.prefix = parts.path.rstrip("/")
+        self.headers = {"Accept": "application/json, text/html", **(headers or {})}
+        self.timeout = timeout
+        self.local = threading.local()
+
+    def connection(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            conn = self.local.conn = cls(self.host, timeout=self.timeout)
+        return conn
+
+    def get(self, path, headers=None):
+        """``(status, seconds, body)``; status 0 when the request failed."""
+        start = time.perf_counter()
+        try:
+            conn = self.connection()
+            conn.request("GET", self.prefix + path, headers={**self.headers, **(headers or {})})
+            response = conn.getresponse()
+            body = response.read()
+            if response.getheader("Connection", "").lower() == "close":
+                self.reset()
+            return response.status, time.perf_counter() - start, body
+        except (OSError, http.client.HTTPException):
+            self.reset()
+            return 0, time.perf_counter() - start, b""
+
+    def reset(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is not None:
+            conn.close()
+        self.local.conn = None
+
+
+def percentile(ordered, fraction):
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def query_totals(client, token):
+    """``{view label: (queries, requests)}`` for GET requests, from the server's ``/metrics``."""
+    status, _, body = client.get(reverse("metrics"), headers={"Authorization": f"Bearer {token}"})
+    if status != 200:
+        return None
+    totals = {}
+    for family in text_string_to_metric_families(body.decode()):
+        if family.name != "cmspro_request_db_queries":
+            continue
+        for sample in family.samples:
+            if sample.labels.get("method") != "GET":
+                continue
+            queries, count = totals.get(sample.labels["view"], (0.0, 0.0))
+            if sample.name.endswith("_sum"):
+                queries = sample.value
+            elif sample.name.endswith("_count"):
+                count = sample.value
+            totals[sample.labels["view"]] = (queries, count)
+    return totals
+
+
+def run_route(client, path, requests, concurrency, cold=False):
+    counter = iter(range(requests))
+    lock = threading.Lock()
+    results = []
+
+    def worker():
+        while True:
+            with lock:
+                index = next(counter, None)
+            if index is None:
+                return
+            # A unique query string misses the response cache every time
+            url = f"{path}{'&' if '?' in path else '?'}{urlencode({'_bench': index})}" if cold else path
+            status, seconds, _ = client.get(url)
+            with lock:
+                results.append((status, seconds))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(seconds for _, seconds in results)
+    statuses = {}
+    for status, _ in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    milliseconds = lambda value: None if value is None else round(value * 1000, 2)
+    return {
+        "requests": len(results),
+        "errors": sum(count for status, count in statuses.items() if not 200 <= int(status) < 400),
+        "statuses": statuses,
+        "requests_per_second": round(len(results) / elapsed, 1) if elapsed else None,
+        "latency_ms": {
+            "mean": milliseconds(statistics.fmean(latencies)) if latencies else None,
+            "p50": milliseconds(percentile(latencies, 0.50)),
+            "p95": milliseconds(percentile(latencies, 0.95)),
+            "p99": milliseconds(percentile(latencies, 0.99)),
+            "max": milliseconds(latencies[-1] if latencies else None),
+        },
+    }
+
+
+def row_counts():
+    return {model.__name__: model._base_manager.count() for model in apps.get_app_config("content").get_models()}
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, timeout=5,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_benchmark(base_url, requests=200, concurrency=8, warmup=5, cold=False, token=None,
+                  metrics_token=None, only=None, stdout=None):
+    write = stdout.write if stdout else (lambda message: None)
+    client = Client(base_url, headers={"Authorization": f"Bearer {token}"} if token else None)
+    routes, skipped = discover_routes()
+    if only:
+        routes = [route for route in routes if any(part in route[0] or part in route[1] for part in only)]
+
+    results = []
+    for name, path, view in routes:
+        probe, _, _ = client.get(path)
+        if not 200 <= probe < 400:
+            skipped.append({"name": name, "path": path, "reason": f"status {probe}"})
+            continue
+        for _ in range(warmup):
+            client.get(path)
+        before = query_totals(client, metrics_token) if metrics_token else None
+        result = run_route(client, path, requests, concurrency, cold=cold)
+        after = query_totals(client, metrics_token) if metrics_token else None
+        queries = None
+        if before is not None and after is not None:
+            (q0, n0), (q1, n1) = before.get(view, (0, 0)), after.get(view, (0, 0))
+            # Counters only grow within one registry: a drop means another worker answered the scrape
+            queries = round((q1 - q0) / (n1 - n0), 2) if n1 > n0 and q1 >= q0 else None
+        results.append({"name": name, "path": path, "view": view, **result, "queries_per_request": queries})
+        latency = result["latency_ms"]
+        write(
+            f"{path:<55} {result['requests_per_second'] or 0:>8.1f} req/s  p50 {latency['p50']}ms  "
+            f"p95 {latency['p95']}ms  p99 {latency['p99']}ms  queries {queries if queries is not None else '-'}\n"
+        )
+
+    total_requests = sum(result["requests"] for result in results)
+    return {
+        "started_at": timezone.now().isoformat(),
+        "git_commit": git_commit(),
+        "base_url": base_url,
+        "database": connection.vendor,
+        "options": {"requests": requests, "concurrency": concurrency, "warmup": warmup, "cold": cold},
+        "row_counts": row_counts(),
+        "totals": {
+            "routes": len(results),
+            "requests": total_requests,
+            "errors": sum(result["errors"] for result in results),
+        },
+        "routes": results,
+        "skipped": skipped,
+    }
+
+
+def compare(previous, current):
+    """Lines setting each route of ``current`` against the same route in ``previous``."""
+    before = {route["name"]: route for route in previous.get("routes", [])}
+    lines = []
+    for route in current["routes"]:
+        old = before.get(route["name"])
+        if old is None:
+            continue
+        old_p95, new_p95 = old["latency_ms"]["p95"], route["latency_ms"]["p95"]
+        change = f"{(new_p95 - old_p95) / old_p95:+.0%}" if old_p95 and new_p95 is not None else "n/a"
+        lines.append(
+            f"{route['path']:<55} p95 {old_p95}ms -> {new_p95}ms ({change}), "
+            f"{old['requests_per_second']} -> {route['requests_per_second']} req/s"
+        )
+    return lines
@@ -0,0 +1,88 @@
+"""
+Batched writes for the ``/bulk/`` endpoints.
+
+``save()`` runs once per row and fires the cache-invalidation signals for
+each one. Here a whole batch is written with ``bulk_create``/``bulk_update``
+and the work ``save()`` would have done is applied to the batch instead:
+free slugs are allocated with a single query, markdown is rendered,
+``set_derived_fields()`` runs, image variants are queued, and cached
+responses are invalidated once. Callers wrap the write in a transaction.
+"""
+from django.db import models
+from django.utils import timezone
+from django.utils.text import slugify
+
+from .caching import bump_generation
+from .images import build_derivatives
+from .models import next_free_slug, slug_candidates
+from .rendering import apply_rendered_markdown
+
+BATCH_SIZE = 200
+
+
+def allocate_slugs(instances):
+    """Give every instance without a slug a free one, with one query for the whole batch."""
+    pending = [instance for instance in instances if not instance.slug]
+    if not pending:
+        return
+    model = type(pending[0])
+    bases = [slugify(getattr(instance, model.slug_source)) for instance in pending]
+    lookup = models.Q()
+    for base in set(bases):
+        lookup |= slug_candidates(base)
+    taken = set(model._base_manager.filter(lookup).values_list("slug", flat=True))
+    taken.update(instance.slug for instance in instances if instance.slug)
+    for instance, base in zip(pending, bases):
+        instance.slug = next_free_slug(base, taken)
+        taken.add(instance.slug)
+
+
+def prepare(instances):
+    """Apply the per-row logic of ``save()`` to every instance of the batch."""
+    model = type(instances[0])
+    if hasattr(model, "slug_source"):
+        allocate_slugs(instances)
+    for instance in instances:
+        if getattr(model, "markdown_fields", ()):
+            apply_rendered_markdown(instance, model.markdown_fields)
+        if hasattr(instance, "set_derived_fields"):
+            instance.set_derived_fields()
+
+
+def queue_image_variants(instances):
+    """Queue variant builds for image fields whose file differs from the one loaded."""
+    for instance in instances:
+        fields = getattr(instance, "responsive_image_fields", ())
+        previous = getattr(instance, "_image_sources", {})
+        current = {name: getattr(instance, name).name or "" for name in fields}
+        changed = [name for name, file_name in current.items() if file_name != previous.get(name, "")]
+        instance._image_sources = current
+        if changed:
+            build_derivatives.enqueue(instance._meta.label, instance.pk, changed)
+
+
+def bulk_create(model, instances):
+    prepare(instances)
+    created = model._base_manager.bulk_create(instances, batch_size=BATCH_SIZE)
+    queue_image_variants(created)
+    bump_generation(model)
+    return created
+
+
+def bulk_update(model, instances):
+    """Write every concrete field of ``instances`` (loaded and locked by the caller)."""
+    prepare(instances)
+    now = timezone.now()
+    fields = []
+    for field in model._meta.concrete_fields:
+        if field.primary_key or getattr(field, "auto_now_add", False):
+            continue
+        if getattr(field, "auto_now", False):
+            # bulk_update skips pre_save(), which is what stamps auto_now fields
+            for instance in instances:
+                setattr(instance, field.attname, now)
+        fields.append(field.name)
+    model._base_manager.bulk_update(instances, fields, batch_size=BATCH_SIZE)
+    queue_image_variants(instances)
+    bump_generation(model)
+    return instances
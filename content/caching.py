@@ -0,0 +1,188 @@
+"""
+Shared response cache for the public content API.
+
+Every content model has a *generation* stamp kept in the shared cache. The
+stamp is replaced whenever a row of that model is saved or deleted (see
+``content.signals``), and cached responses are keyed on the generations of
+every model they were built from, so an edit is never served stale.
+
+The same stamps double as HTTP validators: the ETag is derived from the cache
+key and Last-Modified from the newest generation, so conditional requests are
+answered with ``304`` without touching the database.
+
+Singleton rows (site config, banner) are additionally held in process memory
+and only revalidated against their generation every few seconds.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from .metrics import record_cache
+
+GENERATION_KEY = "content:gen:{}"
+RESPONSE_KEY = "content:resp:v2:{}:{}"
+PAGE_KEY = "content:page:{}:{}:{}"
+
+_MISSING = object()
+_process_singletons = {}
+
+
+def _generation_key(model):
+    return GENERATION_KEY.format(model._meta.label_lower)
+
+
+def bump_generation(*models):
+    """Invalidate every cached response built from any of ``models``."""
+    stamp = time.time_ns()
+    cache.set_many({_generation_key(model): stamp for model in models}, timeout=None)
+    # Changes made by this process are visible to it immediately; other
+    # workers notice the new stamp on their next revalidation.
+    for model in models:
+        for singleton in _process_singletons.get(model, ()):
+            singleton.clear()
+
+
+def get_generations(models):
+    """Return the current generation stamp of each model, in order."""
+    keys = [_generation_key(model) for model in models]
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        # A fresh stamp (rather than 0) keeps responses cached before an
+        # eviction from being matched again. add() keeps whichever stamp
+        # another worker managed to store first.
+        stamp = time.time_ns()
+        for key in missing:
+            cache.add(key, stamp, timeout=None)
+        found.update(cache.get_many(missing))
+    return [found.get(key, 0) for key in keys]
+
+
+class ProcessLocalSingleton:
+    """
+    Process-local copy of a singleton row.
+
+    ``loader`` is called to fetch the row. Within ``SINGLETON_CACHE_TTL``
+    seconds the copy is returned as-is; after that a single shared-cache
+    lookup of the model generation decides whether it must be reloaded.
+    The returned instance is shared and must be treated as read-only.
+    """
+
+    def __init__(self, model, loader):
+        self.model = model
+        self.loader = loader
+        self.clear()
+        _process_singletons.setdefault(model, []).append(self)
+
+    def clear(self):
+        self._value = _MISSING
+        self._generation = None
+        self._checked_at = 0.0
+
+    def get(self):
+        now = time.monotonic()
+        if self._value is not _MISSING and now - self._checked_at < settings.SINGLETON_CACHE_TTL:
+            return self._value
+
+        # Read the stamp before loading so a concurrent edit is never hidden
+        generation = get_generations([self.model])[0]
+        if self._value is _MISSING or generation != self._generation:
+            self._value = self.loader()
+            self._generation = generation
+        self._checked_at = now
+        return self._value
+
+
+class CachedResponseMixin:
+    """
+    Serve anonymous GET responses from the shared cache.
+
+    ``cache_models`` lists every model whose rows end up in the payload
+    (defaults to the queryset model); a change to any of them invalidates
+    the cached responses. Custom actions opt in by routing through
+    ``cached_response``; a handler may set ``response.instance_pk`` to the
+    row it served, which is cached with the body and set again on hits and
+    on ``304`` responses.
+    """
+    cache_models = ()
+
+    def get_cache_models(self):
+        return self.cache_models or (self.queryset.model,)
+
+    def is_response_cacheable(self, request):
+        # Authenticated users (the dashboard) may see unpublished or inactive
+        # rows, so only anonymous reads are shared.
+        return (
+            settings.CONTENT_CACHE_TIMEOUT > 0
+            and request.method in ("GET", "HEAD")
+            and not request.user.is_authenticated
+        )
+
+    def get_response_cache_key(self, request, generations):
+        # Absolute URI: serializers and paginators emit host-qualified links
+        # Generations are hashed in too: bundles spanning many models would
+        # otherwise exceed memcached's 250-character key limit.
+        fingerprint = (
+            f"{'.'.join(map(str, generations))}:"
+            f"{request.accepted_renderer.format}:{request.build_absolute_uri()}"
+        )
+        digest = hashlib.md5(fingerprint.encode()).hexdigest()
+        return RESPONSE_KEY.format(type(self).__name__, digest)
+
+    def cached_response(self, request, handler, *args, **kwargs):
+        """Return ``handler(request, *args, **kwargs)``, cached when allowed."""
+        if not self.is_response_cacheable(request):
+            return handler(request, *args, **kwargs)
+
+        generations = get_generations(self.get_cache_models())
+        key = self.get_response_cache_key(request, generations)
+        etag = quote_etag(hashlib.md5(key.encode()).hexdigest())
+        last_modified = max(generations) // 10**9
+
+        cache_name = type(self).__name__
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            cached = cache.get(key)
+            if cached is not None:
+                record_cache(cache_name, "hit")
+                data, status_code, instance_pk = cached
+                response = Response(data, status=status_code)
+                response.instance_pk = instance_pk
+            else:
+                record_cache(cache_name, "miss")
+                response = self._build_response(key, handler, request, *args, **kwargs)
+        else:
+            record_cache(cache_name, "not_modified")
+            # A 304 still served the row (view counts): take it from the entry
+            cached = cache.get(key)
+            if cached is None:
+                built = self._build_response(key, handler, request, *args, **kwargs)
+                response.instance_pk = getattr(built, "instance_pk", None)
+            else:
+                response.instance_pk = cached[2]
+
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response["ETag"] = etag
+            response["Last-Modified"] = http_date(last_modified)
+            # Let browsers keep the body but revalidate on every use
+            patch_cache_control(response, no_cache=True)
+        return response
+
+    def _build_response(self, key, handler, request, *args, **kwargs):
+        response = handler(request, *args, **kwargs)
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_404_NOT_FOUND):
+            entry = (response.data, response.status_code, getattr(response, "instance_pk", None))
+            cache.set(key, entry, settings.CONTENT_CACHE_TIMEOUT)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(request, super().retrieve, *args, **kwargs)
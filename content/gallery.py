@@ -0,0 +1,166 @@
+"""
+Project gallery uploads.
+
+``POST /api/projects/<id>/gallery/`` takes many images in one multipart
+request. Each file is decoded, verified and normalized in a shared thread
+pool; Pillow releases the GIL while it decodes, resizes and encodes, so a
+large gallery uses several cores without forking the web server worker:
+
+* EXIF orientation is applied and the metadata (camera, GPS) dropped,
+* images larger than ``GALLERY_MAX_DIMENSION`` are scaled down,
+* photos are re-encoded as progressive JPEG, images with transparency as PNG.
+
+The normalized files are stored and all ``ProjectImage`` rows are created
+with one ``bulk_create``, appended after the project's existing images in
+the order they were submitted. Their WebP/AVIF variants are queued as usual.
+"""
+import atexit
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import Max
+from django.utils.text import get_valid_filename
+from PIL import Image, ImageOps
+
+JPEG_OPTIONS = {"quality": 88, "optimize": True, "progressive": True}
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+class GalleryError(Exception):
+    pass
+
+
+def normalize_image(source, max_dimension):
+    """
+    Decode, verify and normalize one image; runs in a pool thread.
+
+    ``source`` is the raw bytes of the upload or the path of its temporary
+    file. Returns ``(data, extension, width, height)``.
+    """
+    try:
+        if isinstance(source, bytes):
+            source = BytesIO(source)
+        with Image.open(source) as probe:
+            probe.verify()
+        # verify() leaves the image unusable: decode it from the start again
+        if hasattr(source, "seek"):
+            source.seek(0)
+        with Image.open(source) as image:
+            image.load()
+            image = ImageOps.exif_transpose(image)
+    except Image.DecompressionBombError:
+        raise GalleryError("The image is too large to process.")
+    except Exception:
+        raise GalleryError("Upload a valid image. The file you uploaded was either not an image or a corrupted image.")
+
+    has_alpha = image.mode in ("RGBA", "LA", "PA") or (image.mode == "P" and "transparency" in image.info)
+    image = image.convert("RGBA" if has_alpha else "RGB")
+    if max(image.size) > max_dimension:
+        image.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+
+    buffer = BytesIO()
+    if has_alpha:
+        image.save(buffer, "PNG", optimize=True)
+        extension = "png"
+    else:
+        image.save(buffer, "JPEG", **JPEG_OPTIONS)
+        extension = "jpg"
+    return buffer.getvalue(), extension, image.width, image.height
+
+
+def get_pool():
+    """The shared worker pool, or None to normalize in the calling thread."""
+    global _pool
+    if settings.GALLERY_THREADS <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=settings.GALLERY_THREADS, thread_name_prefix="gallery")
+            atexit.register(_pool.shutdown, cancel_futures=True)
+        return _pool
+
+
+def _source_of(upload):
+    # Large uploads are already on disk: let Pillow read the file, not a copy in memory
+    if hasattr(upload, "temporary_file_path"):
+        return upload.temporary_file_path()
+    upload.seek(0)
+    return upload.read()
+
+
+def normalize_all(uploads):
+    """
+    Normalize ``uploads`` in parallel, keeping their order.
+
+    Returns one result of ``normalize_image`` per upload; raises a
+    ``{index: [message]}`` dict wrapped in GalleryError if any is invalid.
+    """
+    sources = [_source_of(upload) for upload in uploads]
+    limit = settings.GALLERY_MAX_DIMENSION
+    pool = get_pool()
+    if pool is None:
+        outcomes = [_attempt(normalize_image, source, limit) for source in sources]
+    else:
+        futures = [pool.submit(normalize_image, source, limit) for source in sources]
+        outcomes = [_attempt(future.result) for future in futures]
+    errors = {index: [str(outcome)] for index, outcome in enumerate(outcomes) if isinstance(outcome, GalleryError)}
+    if errors:
+        raise GalleryError(errors)
+    return outcomes
+
+
+def _attempt(func, *args):
+    try:
+        return func(*args)
+    except GalleryError as exc:
+        return exc
+
+
+def file_name(upload, extension):
+    stem = os.path.splitext(os.path.basename(upload.name or ""))[0]
+    try:
+        stem = get_valid_filename(stem)
+    except SuspiciousFileOperation:
+        stem = "image"
+    return f"{stem}.{extension}"
+
+
+def add_images(project, images, captions=(), alt_texts=()):
+    """Store the uploaded ``images`` as the next ones of ``project``; returns the new rows."""
+    from . import bulk
+    from .models import ProjectImage
+
+    results = normalize_all(images)
+    field = ProjectImage._meta.get_field("image")
+    storage = field.storage
+    instances, stored = [], []
+    try:
+        with transaction.atomic():
+            # Lock the project so concurrent uploads do not share order numbers
+            type(project)._base_manager.select_for_update().filter(pk=project.pk).exists()
+            last = project.images.aggregate(last=Max("order"))["last"]
+            start = 0 if last is None else last + 1
+            for index, (upload, (data, extension, _, _)) in enumerate(zip(images, results)):
+                instance = ProjectImage(
+                    project=project,
+                    caption=captions[index] if index < len(captions) else "",
+                    alt_text=alt_texts[index] if index < len(alt_texts) else "",
+                    order=start + index,
+                )
+                name = field.generate_filename(instance, file_name(upload, extension))
+                stored.append(storage.save(name, ContentFile(data)))
+                instance.image = stored[-1]
+                instances.append(instance)
+            return bulk.bulk_create(ProjectImage, instances)
+    except Exception:
+        for name in stored:
+            storage.delete(name)
+        raise
@@ -0,0 +1,138 @@
+"""
+Responsive image derivatives.
+
+Uploaded images are resized once, by a background task queued when the row
+that owns them is saved, into a fixed set of widths encoded as WebP (and AVIF where Pillow supports
+it). Each variant is stored next to its original and tracked as an
+``ImageDerivative`` row, and serializers expose them as ``srcset`` strings so
+list pages stop downloading full-size originals.
+"""
+import logging
+import os
+from io import BytesIO
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+from .caching import bump_generation
+from .tasks import task
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVE_WIDTHS = (320, 640, 960, 1280, 1920)
+
+# Pillow format name and encoder options per output format
+DERIVATIVE_ENCODERS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "avif": ("AVIF", {"quality": 60, "speed": 8}),
+}
+
+
+def derivative_formats():
+    """Output formats this Pillow build can encode, smallest files first."""
+    formats = ["webp"] if features.check("webp") else []
+    if features.check("avif"):
+        formats.insert(0, "avif")
+    return formats
+
+
+def derivative_name(source_name, width, fmt):
+    """``blog/featured/cover.jpg`` -> ``blog/featured/cover.640w.webp``"""
+    stem, _ = os.path.splitext(source_name)
+    return f"{stem}.{width}w.{fmt}"
+
+
+def target_widths(original_width):
+    # Never upscale: anything wider than the original collapses onto it
+    return sorted({min(width, original_width) for width in DERIVATIVE_WIDTHS})
+
+
+def _open_image(field_file):
+    with field_file.storage.open(field_file.name, "rb") as fh:
+        image = Image.open(fh)
+        image.load()
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ("RGB", "RGBA"):
+        has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+    return image
+
+
+def generate_derivatives(instance, field_name):
+    """
+    (Re)build every variant of ``instance.<field_name>``.
+
+    Variants made from an earlier file of the field are deleted first.
+    Returns the new ``ImageDerivative`` rows; an empty or unreadable image
+    yields none.
+    """
+    from .models import ImageDerivative
+
+    field_file = getattr(instance, field_name)
+    content_type = ContentType.objects.get_for_model(instance)
+    # Files go with the rows (see content.signals)
+    ImageDerivative.objects.filter(
+        content_type=content_type, object_id=instance.pk, field_name=field_name,
+    ).delete()
+    if not field_file:
+        return []
+
+    try:
+        image = _open_image(field_file)
+    except (FileNotFoundError, UnidentifiedImageError, OSError) as exc:
+        logger.warning("Cannot build derivatives of %s: %s", field_file.name, exc)
+        return []
+
+    storage = field_file.storage
+    derivatives = []
+    for width in target_widths(image.width):
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.Resampling.LANCZOS)
+        for fmt in derivative_formats():
+            pil_format, options = DERIVATIVE_ENCODERS[fmt]
+            buffer = BytesIO()
+            resized.save(buffer, pil_format, **options)
+            name = storage.save(derivative_name(field_file.name, width, fmt), ContentFile(buffer.getvalue()))
+            derivatives.append(ImageDerivative(
+                content_type=content_type, object_id=instance.pk, field_name=field_name,
+                source=field_file.name, file=name, format=fmt, width=width, height=height,
+            ))
+    return ImageDerivative.objects.bulk_create(derivatives)
+
+
+def sync_derivatives(instance, field_names):
+    """Regenerate ``field_names`` of ``instance`` and drop responses that embed them."""
+    for field_name in field_names:
+        generate_derivatives(instance, field_name)
+    bump_generation(type(instance))
+
+
+@task
+def build_derivatives(model_label, pk, field_names):
+    instance = apps.get_model(model_label)._base_manager.filter(pk=pk).first()
+    if instance is not None:  # deleted before the task ran
+        sync_derivatives(instance, field_names)
+
+
+def build_srcsets(instance, field_names, build_url):
+    """
+    Map each of ``field_names`` to ``{format: "url 320w, url 640w, ..."}``.
+
+    Only variants of the field's current file are listed; ``build_url`` turns
+    a storage URL into the URL handed to clients.
+    """
+    current = {name: getattr(instance, name).name for name in field_names}
+    grouped = {name: {} for name in field_names}
+    # .all() so a prefetch_related("image_derivatives") is reused
+    for derivative in sorted(instance.image_derivatives.all(), key=lambda d: d.width):
+        if derivative.field_name not in grouped or derivative.source != current[derivative.field_name]:
+            continue
+        grouped[derivative.field_name].setdefault(derivative.format, []).append(
+            f"{build_url(derivative.file.url)} {derivative.width}w"
+        )
+    return {
+        name: {fmt: ", ".join(entries) for fmt, entries in formats.items()}
+        for name, formats in grouped.items()
+    }
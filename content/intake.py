@@ -0,0 +1,171 @@
+"""
+Public form intake (contact leads, job applications).
+
+Submissions are cheap to accept however many arrive at once:
+
+* ``IntakeIPThrottle`` and ``IntakeEmailThrottle`` limit each client address
+  and each email to ``INTAKE_RATE_PER_IP`` / ``INTAKE_RATE_PER_EMAIL``
+  (sliding windows kept in the shared cache); excess requests get a 429.
+* ``accept_submission`` claims a fingerprint of the submission in the cache
+  for ``INTAKE_DEDUPE_WINDOW`` seconds: a resubmission (double click, retry,
+  replayed bot request) is acknowledged without creating a new row, and
+  without echoing the stored one, which may be someone else's.
+* The row is inserted at once without its files. Uploads are moved to
+  ``UPLOAD_TEMP_DIR`` and a ``store_intake_file`` task puts them in media
+  storage; ``notify_submission`` emails ``INTAKE_NOTIFY_EMAILS`` (and the
+  career's application email) from the task queue too.
+"""
+import hashlib
+import os
+import shutil
+import uuid
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.move import file_move_safe
+from django.core.mail import send_mail
+from django.db import transaction
+from rest_framework.throttling import SimpleRateThrottle
+
+from .tasks import task
+
+DEDUPE_KEY = "content:intake:{}"
+PENDING = "pending"
+
+
+class DuplicateSubmission(Exception):
+    """The same submission is still being written by another request."""
+
+
+class IntakeIPThrottle(SimpleRateThrottle):
+    scope = "intake_ip"
+
+    def get_rate(self):
+        return settings.INTAKE_RATE_PER_IP or None
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {"scope": self.scope, "ident": self.get_ident(request)}
+
+
+class IntakeEmailThrottle(SimpleRateThrottle):
+    scope = "intake_email"
+
+    def get_rate(self):
+        return settings.INTAKE_RATE_PER_EMAIL or None
+
+    def get_cache_key(self, request, view):
+        email = request.data.get("email")
+        if not isinstance(email, str) or not email.strip():
+            return None  # left to validation
+        ident = hashlib.md5(email.strip().lower().encode()).hexdigest()
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+
+def dedupe_key(model, data, key_fields):
+    values = []
+    for name in key_fields:
+        value = data.get(name)
+        value = getattr(value, "pk", value)
+        values.append(str(value).strip().lower() if value is not None else "")
+    fingerprint = hashlib.md5("\0".join([model._meta.label_lower, *values]).encode()).hexdigest()
+    return DEDUPE_KEY.format(fingerprint)
+
+
+def stage_upload(upload):
+    """Move an uploaded file out of the request into ``UPLOAD_TEMP_DIR``; returns its path."""
+    directory = os.path.join(settings.UPLOAD_TEMP_DIR, "intake", uuid.uuid4().hex)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, "upload")
+    if hasattr(upload, "temporary_file_path"):
+        file_move_safe(upload.temporary_file_path(), path)
+    else:
+        with open(path, "wb") as staged:
+            for chunk in upload.chunks():
+                staged.write(chunk)
+    return path
+
+
+def discard_staged(path):
+    shutil.rmtree(os.path.dirname(path), ignore_errors=True)
+
+
+def accept_submission(serializer, key_fields, file_fields=()):
+    """
+    Save a validated public submission; returns ``(instance, created)``.
+
+    Files in ``file_fields`` are stored afterwards by the task queue. Raises
+    DuplicateSubmission when an identical submission is still being saved.
+    """
+    model = serializer.Meta.model
+    data = serializer.validated_data
+    window = settings.INTAKE_DEDUPE_WINDOW
+    key = dedupe_key(model, data, key_fields) if window > 0 else None
+    if key is not None and not cache.add(key, PENDING, window):
+        existing = cache.get(key)
+        if existing in (None, PENDING):
+            raise DuplicateSubmission()
+        instance = model._base_manager.filter(pk=existing).first()
+        if instance is not None:
+            return instance, False
+        cache.set(key, PENDING, window)  # the first one was deleted since: accept this one
+
+    uploads = {name: data.pop(name) for name in file_fields if data.get(name)}
+    staged = {}
+    try:
+        for name, upload in uploads.items():
+            staged[name] = (stage_upload(upload), os.path.basename(upload.name))
+        with transaction.atomic():
+            instance = serializer.save()
+            for name, (path, file_name) in staged.items():
+                store_intake_file.enqueue(model._meta.label, instance.pk, name, path, file_name)
+            notify_submission.enqueue(model._meta.label, instance.pk)
+    except Exception:
+        if key is not None:
+            cache.delete(key)
+        for path, _ in staged.values():
+            discard_staged(path)
+        raise
+    if key is not None:
+        cache.set(key, instance.pk, window)
+    return instance, True
+
+
+@task
+def store_intake_file(model_label, pk, field_name, path, file_name):
+    """Put a staged upload in media storage and point the row's ``field_name`` at it."""
+    model = apps.get_model(model_label)
+    instance = model._base_manager.filter(pk=pk).first()
+    if instance is None or getattr(instance, field_name) or not os.path.exists(path):
+        discard_staged(path)  # row deleted, or stored by an earlier attempt
+        return
+    field = model._meta.get_field(field_name)
+    with open(path, "rb") as staged:
+        name = field.storage.save(field.generate_filename(instance, file_name), File(staged))
+    model._base_manager.filter(pk=pk).update(**{field_name: name})
+    discard_staged(path)
+
+
+@task
+def notify_submission(model_label, pk):
+    recipients = list(settings.INTAKE_NOTIFY_EMAILS)
+    if not recipients:
+        return
+    model = apps.get_model(model_label)
+    instance = model._base_manager.filter(pk=pk).first()
+    if instance is None:
+        return
+    if model._meta.model_name == "jobapplication":
+        career = instance.career
+        if career.application_email:
+            recipients.append(career.application_email)
+        subject = f"New application for {career.title} from {instance.full_name}"
+        body = (
+            f"{instance.full_name} <{instance.email}>, {instance.phone}\n"
+            f"Career: {career.title}\n\n{instance.cover_letter}"
+        )
+    else:
+        subject = f"New enquiry from {instance.name}"
+        body = f"{instance.name} <{instance.email}>, {instance.phone}\nSource: {instance.source}\n\n{instance.message}"
+    send_mail(subject, body, None, sorted(set(recipients)))
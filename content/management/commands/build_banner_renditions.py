@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from content.models import Banner
+from content.video import READY, ffmpeg_available, process_banner_video
+
+
+class Command(BaseCommand):
+    help = "Transcode banner videos that have no renditions yet (and extract missing posters)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force", action="store_true",
+            help="Rebuild renditions that are already up to date.",
+        )
+
+    def handle(self, *args, **options):
+        if not ffmpeg_available():
+            raise CommandError("ffmpeg/ffprobe not found; set FFMPEG_BINARY and FFPROBE_BINARY.")
+        built = 0
+        for banner in Banner.objects.exclude(video="").exclude(video__isnull=True):
+            renditions = banner.video_renditions or {}
+            up_to_date = renditions.get("source") == banner.video.name and renditions.get("status") == READY
+            if up_to_date and not options["force"]:
+                continue
+            process_banner_video(banner.pk, banner.video.name)
+            banner.refresh_from_db(fields=["video_renditions"])
+            status = banner.video_renditions.get("status")
+            self.stdout.write(f"Banner {banner.pk}: {status}")
+            built += status == READY
+        self.stdout.write(f"Built renditions for {built} banners")
@@ -0,0 +1,45 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from content.caching import bump_generation
+from content.images import generate_derivatives
+
+MODELS = {
+    model.__name__.lower(): model
+    for model in apps.get_app_config("content").get_models()
+    if getattr(model, "responsive_image_fields", ())
+}
+
+
+class Command(BaseCommand):
+    help = "Build the responsive WebP/AVIF variants of existing uploaded images."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "models", nargs="*",
+            help=f"Models to process: {', '.join(sorted(MODELS))} (default: all).",
+        )
+        parser.add_argument(
+            "--force", action="store_true",
+            help="Rebuild variants that are already up to date.",
+        )
+        parser.add_argument("--batch-size", type=int, default=100)
+
+    def handle(self, *args, **options):
+        unknown = set(options["models"]) - set(MODELS)
+        if unknown:
+            raise CommandError(f"Unknown model(s): {', '.join(sorted(unknown))}")
+        models = [MODELS[name] for name in options["models"]] or list(MODELS.values())
+        for model in models:
+            fields = model.responsive_image_fields
+            rows = model._base_manager.only("pk", *fields).prefetch_related("image_derivatives")
+            built = 0
+            for instance in rows.iterator(chunk_size=options["batch_size"]):
+                built_from = {(d.field_name, d.source) for d in instance.image_derivatives.all()}
+                for name in fields:
+                    field_file = getattr(instance, name)
+                    if field_file and (options["force"] or (name, field_file.name) not in built_from):
+                        built += len(generate_derivatives(instance, name))
+            self.stdout.write(f"{model.__name__}: built {built} variants")
+        # Variants are generated outside model saves; drop cached API responses explicitly.
+        bump_generation(*models)
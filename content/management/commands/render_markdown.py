@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from content.caching import bump_generation
+from content.models import BlogPost, Career, Notice, Service
+from content.rendering import backfill_rendered_markdown
+
+MODELS = {model.__name__.lower(): model for model in (BlogPost, Service, Notice, Career)}
+
+
+class Command(BaseCommand):
+    help = "Re-render stored markdown HTML, table of contents and plain-text excerpts in bulk."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "models", nargs="*",
+            help=f"Models to render: {', '.join(sorted(MODELS))} (default: all).",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        unknown = set(options["models"]) - set(MODELS)
+        if unknown:
+            raise CommandError(f"Unknown model(s): {', '.join(sorted(unknown))}")
+        models = [MODELS[name] for name in options["models"]] or list(MODELS.values())
+        for model in models:
+            count = backfill_rendered_markdown(
+                model._base_manager.all(), model.markdown_fields, batch_size=options["batch_size"]
+            )
+            self.stdout.write(f"{model.__name__}: rendered {count} rows")
+        # bulk_update sends no signals; drop cached API responses explicitly.
+        bump_generation(*models)
@@ -0,0 +1,54 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from content.benchmark import compare, run_benchmark
+
+
+class Command(BaseCommand):
+    help = "Load-test every GET route of the site against a running server (see content.benchmark)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--requests", type=int, default=200, help="Requests per route.")
+        parser.add_argument("--concurrency", type=int, default=8, help="Parallel connections.")
+        parser.add_argument("--warmup", type=int, default=5, help="Unmeasured requests per route first.")
+        parser.add_argument("--cold", action="store_true", help="Bypass the response cache on every request.")
+        parser.add_argument("--token", help="JWT access token to send, to benchmark as that user.")
+        parser.add_argument(
+            "--metrics-token", default=settings.METRICS_TOKEN,
+            help="METRICS_TOKEN of the server, to report queries per request (default: this settings').",
+        )
+        parser.add_argument("--only", action="append", help="Only routes whose name or path contains this.")
+        parser.add_argument("--output", help="Write the results as JSON to this file.")
+        parser.add_argument("--compare", help="Results JSON of an earlier run to compare with.")
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1 or options["concurrency"] < 1:
+            raise CommandError("--requests and --concurrency must be at least 1")
+        previous = None
+        if options["compare"]:
+            with open(options["compare"]) as file:
+                previous = json.load(file)
+
+        results = run_benchmark(
+            options["base_url"], requests=options["requests"], concurrency=options["concurrency"],
+            warmup=options["warmup"], cold=options["cold"], token=options["token"],
+            metrics_token=options["metrics_token"], only=options["only"], stdout=self.stdout,
+        )
+        totals = results["totals"]
+        self.stdout.write(
+            f"{totals['routes']} routes, {totals['requests']} requests, {totals['errors']} errors, "
+            f"{len(results['skipped'])} routes skipped"
+        )
+        for skipped in results["skipped"]:
+            self.stdout.write(f"  skipped {skipped['name']}: {skipped['reason']}")
+        if previous:
+            self.stdout.write(f"Compared with {previous.get('git_commit') or options['compare']}:")
+            for line in compare(previous, results):
+                self.stdout.write(f"  {line}")
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                json.dump(results, file, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
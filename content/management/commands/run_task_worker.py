@@ -0,0 +1,65 @@
+import multiprocessing
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from content.tasks import requeue_stale, run_pending, worker_id
+
+
+class Command(BaseCommand):
+    help = "Run background task workers until interrupted."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=1, help="Worker processes to run (default: 1).")
+        parser.add_argument(
+            "--sleep", type=float, default=1.0,
+            help="Seconds to wait before polling again when the queue is empty.",
+        )
+        parser.add_argument("--once", action="store_true", help="Run the tasks that are due, then exit.")
+
+    def handle(self, *args, **options):
+        requeue_stale()
+        if options["once"]:
+            count = run_pending()
+            self.stdout.write(f"Ran {count} tasks")
+            return
+
+        if options["processes"] <= 1:
+            self.stdout.write(f"Task worker {worker_id()} started")
+            work_forever(options["sleep"])
+            return
+
+        # Children must not inherit the parent's database connection
+        connections.close_all()
+        workers = [
+            multiprocessing.Process(target=work_forever, args=(options["sleep"],), daemon=True)
+            for _ in range(options["processes"])
+        ]
+        for worker in workers:
+            worker.start()
+        self.stdout.write(f"Started {len(workers)} task workers")
+
+        def stop(signum, frame):
+            for worker in workers:
+                worker.terminate()
+
+        signal.signal(signal.SIGTERM, stop)
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            stop(None, None)
+
+
+def work_forever(sleep):
+    worker = worker_id()
+    try:
+        while True:
+            close_old_connections()
+            if not run_pending(worker, limit=100):
+                requeue_stale()
+                time.sleep(sleep)
+    except KeyboardInterrupt:
+        pass
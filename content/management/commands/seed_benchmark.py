@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from content.benchmark import VOLUMES, Seeder, clear_seeded, seeded_querysets
+
+
+class Command(BaseCommand):
+    help = "Fill the database with production-sized benchmark data (see content.benchmark)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale", type=float, default=1.0,
+            help=f"Multiply the default volumes ({', '.join(f'{k}={v}' for k, v in VOLUMES.items())}).",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed, for reproducible data.")
+        parser.add_argument("--clear", action="store_true", help="Delete earlier benchmark rows first.")
+        parser.add_argument("--clear-only", action="store_true", help="Delete benchmark rows and stop.")
+
+    def handle(self, *args, **options):
+        if options["scale"] <= 0:
+            raise CommandError("--scale must be positive")
+        if options["clear"] or options["clear_only"]:
+            self.stdout.write(f"Deleted {clear_seeded()} benchmark rows")
+            if options["clear_only"]:
+                return
+        elif any(queryset.exists() for queryset in seeded_querysets()):
+            raise CommandError("Benchmark rows already exist; pass --clear to replace them.")
+        Seeder(scale=options["scale"], seed=options["seed"], stdout=self.stdout).run()
+        self.stdout.write(self.style.SUCCESS("Benchmark data seeded"))
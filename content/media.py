@@ -0,0 +1,177 @@
+"""
+Serving uploaded media in production.
+
+``serve_media`` answers ``MEDIA_URL`` requests whatever ``DEBUG`` is. It
+validates the request (path, private files, conditional headers) and then
+either hands the body to the front server (``MEDIA_SENDFILE``:
+``x-accel-redirect`` for nginx, ``x-sendfile`` for Apache/lighttpd) or
+streams it as a ``FileResponse``, which gunicorn sends with ``os.sendfile``.
+
+Responses carry an ``ETag``/``Last-Modified`` pair for revalidation and
+``MEDIA_CACHE_CONTROL``; uploads get a fresh name whenever their file
+changes, so public files can be cached as immutable. Single byte ranges are
+answered with ``206`` so browsers can seek in videos and PDFs.
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+# Types missing from (or wrong in) some platforms' mimetypes tables
+MEDIA_TYPES = {
+    ".m3u8": "application/vnd.apple.mpegurl",
+    ".ts": "video/mp2t",
+    ".webp": "image/webp",
+    ".avif": "image/avif",
+    ".mp4": "video/mp4",
+}
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeFile:
+    """
+    ``length`` bytes of an open file from its current position.
+
+    ``fileno()`` stays available, so a server with ``wsgi.file_wrapper``
+    (gunicorn) still sends the range with ``os.sendfile`` using the
+    response's ``Content-Length``; anything else reads it block by block.
+    """
+
+    def __init__(self, fh, length):
+        self.fh = fh
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.fh.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.fh.fileno()
+
+    def tell(self):
+        return self.fh.tell()
+
+    def close(self):
+        self.fh.close()
+
+
+def is_private(path):
+    return path.startswith(tuple(settings.MEDIA_PRIVATE_PREFIXES))
+
+
+def content_type_for(path):
+    ext = os.path.splitext(path)[1].lower()
+    return MEDIA_TYPES.get(ext) or mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+
+def parse_range(header, size):
+    """
+    ``(start, end)`` (inclusive) of a single-range ``Range`` header, or None
+    to send the whole file. Raises ValueError for an unsatisfiable range.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    # Malformed and multi-range requests are allowed to get the full body
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+    first, last = match.groups()
+    if first == "":
+        # "bytes=-500": the final 500 bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError(header)
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError(header)
+    return start, end
+
+
+def if_range_matches(request, etag, mtime):
+    """Whether a ``Range`` request still applies to the current file (RFC 9110 13.1.5)."""
+    validator = request.META.get("HTTP_IF_RANGE")
+    if not validator:
+        return True
+    if validator.startswith(('"', "W/")):
+        return validator == etag
+    return parse_http_date_safe(validator) == int(mtime)
+
+
+@require_safe
+def serve_media(request, path):
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("Not found")
+    if not os.path.isfile(full_path):
+        raise Http404("Not found")
+    private = is_private(path)
+    if private and not (request.user.is_authenticated and request.user.is_superuser):
+        # Resumes and lead attachments: do not reveal whether they exist
+        raise Http404("Not found")
+
+    stat = os.stat(full_path)
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(stat.st_mtime),
+        "Cache-Control": "private, no-cache" if private else settings.MEDIA_CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+    }
+    if private:
+        headers["Vary"] = "Cookie"
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if not_modified is not None:
+        for name, value in headers.items():
+            not_modified.headers.setdefault(name, value)
+        return not_modified
+
+    content_type = content_type_for(path)
+    backend = settings.MEDIA_SENDFILE
+    if backend:
+        # The front server reads the file and answers Range requests itself
+        response = HttpResponse(content_type=content_type, headers=headers)
+        if backend == "x-accel-redirect":
+            response["X-Accel-Redirect"] = settings.MEDIA_ACCEL_REDIRECT_PREFIX + quote(path)
+        elif backend == "x-sendfile":
+            response["X-Sendfile"] = full_path
+        else:
+            raise ImproperlyConfigured(f"Unknown MEDIA_SENDFILE backend {backend!r}")
+        return response
+
+    size = stat.st_size
+    range_header = request.META.get("HTTP_RANGE")
+    if range_header and not if_range_matches(request, etag, stat.st_mtime):
+        range_header = None  # the client's partial copy is stale: send it all
+    try:
+        byte_range = parse_range(range_header, size)
+    except ValueError:
+        return HttpResponse(status=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+    if request.method == "HEAD":
+        response = HttpResponse(content_type=content_type, headers=headers)
+        response["Content-Length"] = size
+        return response
+
+    fh = open(full_path, "rb")
+    if byte_range is None:
+        return FileResponse(fh, content_type=content_type, headers=headers)
+    start, end = byte_range
+    fh.seek(start)
+    response = FileResponse(RangeFile(fh, end - start + 1), status=206, content_type=content_type, headers=headers)
+    response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response["Content-Length"] = end - start + 1
+    return response
@@ -0,0 +1,201 @@
+"""
+Prometheus metrics.
+
+``MetricsMiddleware`` times every request and labels it with the view that
+served it (``ProjectViewSet.list``, ``HomeView.get``, ...). Each request
+adds one observation to each of these histograms:
+
+* ``cmspro_request_duration_seconds``: total time spent in Django,
+* ``cmspro_request_db_queries`` and ``cmspro_request_db_seconds``: how many
+  queries the request ran and how long the database took to answer them,
+* ``cmspro_request_serializer_seconds``: time spent building serializer data,
+* ``cmspro_response_size_bytes``: the body size.
+
+``cmspro_responses_total`` counts status codes per view, and
+``cmspro_cache_requests_total`` counts response-cache hits and misses.
+``/metrics`` serves all of them in the Prometheus text format.
+
+Under gunicorn each worker process keeps its own numbers. Set
+``PROMETHEUS_MULTIPROC_DIR`` to an empty directory that every worker can
+write to: prometheus_client then stores the metrics there, and ``/metrics``
+adds up every process, whichever worker answers the scrape
+(``gunicorn.conf.py`` resets the directory when the server starts).
+"""
+import hmac
+import os
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.http import Http404, HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess,
+)
+from rest_framework import serializers
+
+UNRESOLVED = "<unresolved>"
+
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144, 233)
+SIZE_BUCKETS = tuple(256 * 4 ** n for n in range(10))  # 256 B to 64 MB
+
+REQUEST_DURATION = Histogram(
+    "cmspro_request_duration_seconds", "Time spent handling a request.", ["view", "method"],
+)
+REQUEST_DB_QUERIES = Histogram(
+    "cmspro_request_db_queries", "Database queries run by a request.", ["view", "method"], buckets=QUERY_BUCKETS,
+)
+REQUEST_DB_SECONDS = Histogram(
+    "cmspro_request_db_seconds", "Time a request spent waiting on the database.", ["view", "method"],
+)
+REQUEST_SERIALIZER_SECONDS = Histogram(
+    "cmspro_request_serializer_seconds", "Time a request spent building serializer data.", ["view", "method"],
+)
+RESPONSE_SIZE = Histogram(
+    "cmspro_response_size_bytes", "Size of the response body.", ["view", "method"], buckets=SIZE_BUCKETS,
+)
+RESPONSES = Counter("cmspro_responses", "Responses sent, by status code.", ["view", "method", "status"])
+CACHE_REQUESTS = Counter(
+    "cmspro_cache_requests", "Response cache lookups, by result (hit, miss or not_modified).", ["cache", "result"],
+)
+
+_current = ContextVar("request_metrics", default=None)
+
+
+class RequestMetrics:
+    """What one request spent, filled in while it runs."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serializer_seconds = 0.0
+        self.serializing = False
+
+    def __call__(self, execute, sql, params, many, context):
+        # Database execute wrapper: time every query run while the request is handled
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - start
+            self.queries += 1
+
+
+@contextmanager
+def serializer_timer():
+    metrics = _current.get()
+    # Nested serializers run inside their parent: only time the outermost
+    if metrics is None or metrics.serializing:
+        yield
+        return
+    metrics.serializing = True
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serializer_seconds += time.perf_counter() - start
+        metrics.serializing = False
+
+
+def _timed_data(data):
+    def timed(self):
+        with serializer_timer():
+            return data.fget(self)
+    return property(timed)
+
+
+def install_serializer_timer():
+    """Time ``.data`` of every DRF serializer (called once, from the app's ready())."""
+    base = serializers.BaseSerializer
+    if not getattr(base.data, "_metrics_timed", False):
+        base.data = _timed_data(base.data)
+        base.data.fget._metrics_timed = True
+
+
+def label_for(match, method):
+    """``ViewSet.action``, ``View.method`` or the function name of the view ``match`` resolved to."""
+    if match is None:
+        return UNRESOLVED
+    func = match.func
+    view_class = getattr(func, "cls", None) or getattr(func, "view_class", None)
+    if view_class is None:
+        return getattr(func, "__name__", UNRESOLVED)
+    actions = getattr(func, "actions", None) or {}
+    method = method.lower()
+    return f"{view_class.__name__}.{actions.get(method, method)}"
+
+
+def view_label(request):
+    return label_for(getattr(request, "resolver_match", None), request.method)
+
+
+def response_size(response):
+    if not response.streaming:
+        return len(response.content)
+    length = response.get("Content-Length")
+    return int(length) if length and length.isdigit() else None
+
+
+def record_cache(cache_name, result):
+    if settings.METRICS_ENABLED:
+        CACHE_REQUESTS.labels(cache_name, result).inc()
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        duration = time.perf_counter() - start
+        match = getattr(request, "resolver_match", None)
+        if match is not None and match.func is metrics_view:
+            return response  # scrapes would only measure themselves
+
+        labels = (view_label(request), request.method)
+        REQUEST_DURATION.labels(*labels).observe(duration)
+        REQUEST_DB_QUERIES.labels(*labels).observe(metrics.queries)
+        REQUEST_DB_SECONDS.labels(*labels).observe(metrics.db_seconds)
+        REQUEST_SERIALIZER_SECONDS.labels(*labels).observe(metrics.serializer_seconds)
+        size = response_size(response)
+        if size is not None:
+            RESPONSE_SIZE.labels(*labels).observe(size)
+        RESPONSES.labels(*labels, str(response.status_code)).inc()
+        return response
+
+
+def registry():
+    """The registry to export: every worker's metrics in multiprocess mode, else this process's."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        collected = CollectorRegistry()
+        multiprocess.MultiProcessCollector(collected)
+        return collected
+    return REGISTRY
+
+
+def metrics_view(request):
+    """
+    The metrics in the Prometheus text format.
+
+    With ``METRICS_TOKEN`` set, scrapers authenticate with
+    ``Authorization: Bearer <token>``; superusers can always look.
+    """
+    token = settings.METRICS_TOKEN
+    header = request.headers.get("Authorization", "")
+    authorized = bool(token) and hmac.compare_digest(header.encode(), f"Bearer {token}".encode())
+    if not authorized and not (request.user.is_authenticated and request.user.is_superuser):
+        raise Http404("Not found")
+    return HttpResponse(generate_latest(registry()), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,70 @@
+from django.db import migrations
+
+# Weighted search documents kept up to date by a BEFORE INSERT OR UPDATE
+# trigger, as the FTS5 triggers do on SQLite (see
+# content.search.install_sqlite_search_index). The columns are not declared
+# on the models; content.search queries them with raw SQL.
+#
+# Not a GENERATED column: PostgreSQL would then refuse ALTER COLUMN on every
+# column it is computed from, so any AlterField on them would fail. The
+# trigger function names the columns only in its body, and
+# content.search.install_postgresql_search_trigger rewrites it after every
+# migrate when SEARCH_DOCUMENTS changes.
+SEARCH_DOCUMENTS = {
+    "content_blogpost": ("title", "excerpt", "content", "tags"),
+    "content_service": ("title", "excerpt", "content"),
+}
+
+
+def document(columns, prefix=""):
+    return " || ".join(
+        f"setweight(to_tsvector('english', coalesce({prefix}{column}, '')), '{weight}')"
+        for column, weight in zip(columns, "ABCD")
+    )
+
+
+def add_search_vectors(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table, columns in SEARCH_DOCUMENTS.items():
+        changed = " OR ".join(f"NEW.{column} IS DISTINCT FROM OLD.{column}" for column in columns)
+        schema_editor.execute(f"ALTER TABLE {table} ADD COLUMN search_vector tsvector")
+        schema_editor.execute(f"UPDATE {table} SET search_vector = {document(columns)}")
+        schema_editor.execute(
+            f"CREATE INDEX {table}_search_vector_gin ON {table} USING gin (search_vector)"
+        )
+        schema_editor.execute(
+            f"CREATE FUNCTION {table}_search_vector_update() RETURNS trigger LANGUAGE plpgsql AS $search$\n"
+            f"BEGIN\n"
+            f"    IF TG_OP = 'INSERT' OR {changed} THEN\n"
+            f"        NEW.search_vector := {document(columns, 'NEW.')};\n"
+            f"    END IF;\n"
+            f"    RETURN NEW;\n"
+            f"END;\n"
+            f"$search$"
+        )
+        # Not "UPDATE OF <columns>": PostgreSQL would then refuse to alter those columns' types
+        schema_editor.execute(
+            f"CREATE TRIGGER {table}_search_vector BEFORE INSERT OR UPDATE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION {table}_search_vector_update()"
+        )
+
+
+def remove_search_vectors(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table in SEARCH_DOCUMENTS:
+        schema_editor.execute(f"DROP TRIGGER {table}_search_vector ON {table}")
+        schema_editor.execute(f"DROP FUNCTION {table}_search_vector_update()")
+        schema_editor.execute(f"ALTER TABLE {table} DROP COLUMN search_vector")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0025_delete_sitelogo'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_vectors, remove_search_vectors),
+    ]
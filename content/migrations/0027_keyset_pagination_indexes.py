@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-16 19:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0026_blogpost_service_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['-published_at', '-created_at', 'id'], name='content_blo_publish_722144_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['-created_at', 'id'], name='content_job_created_786840_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lead',
+            index=models.Index(fields=['-created_at', 'id'], name='content_lea_created_195f64_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notice',
+            index=models.Index(fields=['-is_sticky', '-is_featured', '-notice_date', '-created_at', 'id'], name='content_not_is_stic_2f8faa_idx'),
+        ),
+    ]
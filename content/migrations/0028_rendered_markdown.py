@@ -0,0 +1,94 @@
+# Generated by Django 5.2.8 on 2026-10-16 19:39
+
+from django.db import migrations, models
+
+from content.rendering import backfill_rendered_markdown
+
+MARKDOWN_FIELDS = {
+    "BlogPost": ("content",),
+    "Service": ("content",),
+    "Notice": ("content",),
+    "Career": ("requirements", "responsibilities", "qualifications", "benefits"),
+}
+
+
+def render_existing_rows(apps, schema_editor):
+    for model_name, sources in MARKDOWN_FIELDS.items():
+        model = apps.get_model("content", model_name)
+        backfill_rendered_markdown(model._base_manager.using(schema_editor.connection.alias), sources)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0027_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='content_toc',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='plain_excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=300),
+        ),
+        migrations.AddField(
+            model_name='career',
+            name='benefits_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='career',
+            name='qualifications_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='career',
+            name='requirements_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='career',
+            name='responsibilities_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='notice',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='notice',
+            name='content_toc',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name='notice',
+            name='plain_excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=300),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='content_toc',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='plain_excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=300),
+        ),
+        migrations.RunPython(render_existing_rows, migrations.RunPython.noop),
+    ]
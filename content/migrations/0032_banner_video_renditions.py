@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-16 19:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0031_chunked_uploads'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='banner',
+            name='video_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
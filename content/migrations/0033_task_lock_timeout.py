@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-16 20:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0032_banner_video_renditions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='lock_timeout',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
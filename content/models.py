@@ -1,11 +1,124 @@
-from django.db import models, transaction
+import uuid
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
+from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, models, transaction
+from django.db.models import Q
 from django.utils import timezone
 from django.utils.text import slugify
-from django.core.files.storage import default_storage
-from django.core.exceptions import ObjectDoesNotExist
 
+from .caching import ProcessLocalSingleton, bump_generation
+from .images import build_derivatives
+from .rendering import apply_rendered_markdown
+from .tasks import delete_files
+from .uploads import UPLOAD_TARGETS
+from .video import PENDING, process_banner_video
 
-class Banner(models.Model):
+
+class RenderedMarkdownMixin:
+    """Re-render ``markdown_fields`` into their stored HTML on every save."""
+    markdown_fields = ()
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        written = apply_rendered_markdown(self, self.markdown_fields, update_fields)
+        if update_fields is not None and written:
+            kwargs["update_fields"] = {*update_fields, *written}
+        super().save(*args, **kwargs)
+
+
+class ResponsiveImagesMixin:
+    """
+    Queue a rebuild of the WebP/AVIF variants of ``responsive_image_fields``
+    whenever a save changes their file.
+    """
+    responsive_image_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Raw file names as loaded; deferred fields are not tracked
+        instance._image_sources = {
+            name: instance.__dict__[name] or "" for name in cls.responsive_image_fields
+            if name in field_names
+        }
+        return instance
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        super().save(*args, **kwargs)
+        previous = getattr(self, "_image_sources", {})
+        deferred = self.get_deferred_fields()
+        current = {
+            name: getattr(self, name).name or "" for name in self.responsive_image_fields
+            if name not in deferred
+        }
+        changed = [
+            name for name, file_name in current.items()
+            if file_name != previous.get(name, "") and (update_fields is None or name in update_fields)
+        ]
+        self._image_sources = {**previous, **current}
+        if changed:
+            build_derivatives.enqueue(self._meta.label, self.pk, changed)
+
+
+class UniqueSlugMixin:
+    """
+    Fill an empty ``slug`` from ``slug_source`` on save, suffixing ``-1``,
+    ``-2``... when it is taken. The free suffix is found in a single query;
+    if a concurrent save takes it first, the next one is tried.
+    """
+    slug_source = "title"
+    slug_attempts = 5
+
+    def save(self, *args, **kwargs):
+        if self.slug:
+            return super().save(*args, **kwargs)
+        base = slugify(getattr(self, self.slug_source))
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "slug"}
+        for attempt in range(self.slug_attempts):
+            self.slug = allocate_slug(self, base)
+            try:
+                # A savepoint, so a clash leaves the caller's transaction usable
+                with transaction.atomic(using=kwargs.get("using")):
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                taken = type(self)._base_manager.filter(slug=self.slug).exclude(pk=self.pk).exists()
+                if not taken or attempt == self.slug_attempts - 1:
+                    self.slug = ""
+                    raise
+
+
+def slug_candidates(base):
+    """Filter matching ``base`` and every ``base-N`` slug that could collide with it."""
+    return Q(slug=base) | Q(slug__startswith=f"{base}-")
+
+
+def next_free_slug(base, taken):
+    """``base`` if it is free, else ``base-N`` one past the highest suffix in ``taken``."""
+    taken = set(taken)
+    if base not in taken:
+        return base
+    suffixes = [0]
+    for slug in taken:
+        suffix = slug[len(base) + 1:]
+        if slug.startswith(f"{base}-") and suffix.isdigit():
+            suffixes.append(int(suffix))
+    return f"{base}-{max(suffixes) + 1}"
+
+
+def allocate_slug(instance, base):
+    """A free slug for ``instance`` from ``base``, found in one query."""
+    taken = type(instance)._base_manager.filter(slug_candidates(base))
+    if instance.pk is not None:
+        taken = taken.exclude(pk=instance.pk)
+    return next_free_slug(base, taken.values_list("slug", flat=True))
+
+
+class Banner(ResponsiveImagesMixin, models.Model):
  
     title = models.CharField(max_length=200, blank=True)
     subtitle = models.CharField(max_length=400, blank=True)
@@ -17,18 +130,48 @@ class Banner(models.Model):
     video_autoplay = models.BooleanField(default=True)
     video_muted = models.BooleanField(default=True)
     video_loop = models.BooleanField(default=True)
+    # Transcoded streams of `video`, filled in by content.video.process_banner_video
+    video_renditions = models.JSONField(default=dict, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    image_derivatives = GenericRelation("ImageDerivative")
 
     class Meta:
         verbose_name = "Banner"
         verbose_name_plural = "Banners"
 
+    responsive_image_fields = ("video_poster",)
+
     def __str__(self):
         return self.title or "Banner"
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        # Commits a fresh upload now (rather than during the save) so its final name is known
+        source = self._meta.get_field("video").pre_save(self, self._state.adding).name or ""
+        previous = self.video_renditions or {}
+        changed = source != previous.get("source", "") and (update_fields is None or "video" in update_fields)
+        if changed:
+            self.video_renditions = {"source": source, "status": PENDING} if source else {}
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "video_renditions"}
+        super().save(*args, **kwargs)
+        if changed:
+            if previous.get("files"):
+                delete_files.enqueue(previous["files"])
+            if source:
+                process_banner_video.enqueue(self.pk, source)
 
-class About(models.Model):
+    @classmethod
+    def get_cached(cls):
+        """Return the singleton banner (or None) from the process-local cache"""
+        return _banner_cache.get()
+
+
+_banner_cache = ProcessLocalSingleton(Banner, lambda: Banner.objects.prefetch_related("image_derivatives").first())
+
+
+class About(ResponsiveImagesMixin, models.Model):
     title = models.CharField(max_length=200)
     content = models.TextField()
     image = models.ImageField(upload_to="about/images/", null=True, blank=True)
@@ -52,11 +195,16 @@ class About(models.Model):
 
     is_published = models.BooleanField(default=True)
     updated_at = models.DateTimeField(auto_now=True)
+    image_derivatives = GenericRelation("ImageDerivative")
 
     class Meta:
         verbose_name = "About Page Content"
         verbose_name_plural = "About Page Contents"
 
+    responsive_image_fields = (
+        "image", "mission_image", "vision_image", "goals_image", "achievements_image",
+    )
+
     def __str__(self):
         return self.title
 
@@ -82,7 +230,7 @@ class ProjectCategory(models.Model):
         super().save(*args, **kwargs)
 
 
-class Project(models.Model):
+class Project(UniqueSlugMixin, ResponsiveImagesMixin, models.Model):
     STATUS_CHOICES = [
         ("ongoing", "Ongoing"),
         ("completed", "Completed"),
@@ -105,28 +253,19 @@ class Project(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    image_derivatives = GenericRelation("ImageDerivative")
 
     class Meta:
         ordering = ["-is_featured", "-created_at"]
         verbose_name = "Project"
         verbose_name_plural = "Projects"
 
+    responsive_image_fields = ("cover_image",)
+
     def __str__(self):
         return self.title
 
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            base_slug = slugify(self.title)
-            slug = base_slug
-            counter = 1
-            while Project.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
-        super().save(*args, **kwargs)
-
-
-class ProjectImage(models.Model):
+class ProjectImage(ResponsiveImagesMixin, models.Model):
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="images")
     image = models.ImageField(upload_to="projects/gallery/")
     caption = models.CharField(max_length=255, blank=True)
@@ -134,12 +273,15 @@ class ProjectImage(models.Model):
     order = models.PositiveSmallIntegerField(default=0)
 
     created_at = models.DateTimeField(auto_now_add=True)
+    image_derivatives = GenericRelation("ImageDerivative")
 
     class Meta:
         ordering = ["order", "id"]
         verbose_name = "Project Image"
         verbose_name_plural = "Project Images"
 
+    responsive_image_fields = ("image",)
+
     def __str__(self):
         return f"Image for {self.project.title}"
 
@@ -166,12 +308,15 @@ class Lead(models.Model):
         ordering = ["-created_at"]
         verbose_name = "Lead"
         verbose_name_plural = "Leads"
+        indexes = [
+            models.Index(fields=["-created_at", "id"]),
+        ]
 
     def __str__(self):
         return f"{self.name} <{self.email}>"
 
 
-class TeamMember(models.Model):
+class TeamMember(ResponsiveImagesMixin, models.Model):
     name = models.CharField(max_length=150)
     position = models.CharField(max_length=150)
     bio = models.TextField(blank=True)
@@ -184,12 +329,15 @@ class TeamMember(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    image_derivatives = GenericRelation("ImageDerivative")
 
     class Meta:
         ordering = ["order", "name"]
 
+    responsive_image_fields = ("photo",)
+
 
-class Client(models.Model):
+class Client(ResponsiveImagesMixin, models.Model):
     name = models.CharField(max_length=255, unique=True)
     address = models.TextField(blank=True)
     phone = models.CharField(max_length=50, blank=True)
@@ -201,10 +349,13 @@ class Client(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    image_derivatives = GenericRelation("ImageDerivative")
 
     class Meta:
         ordering = ["order", "name"]
 
+    responsive_image_fields = ("logo",)
+
 
 class BlogCategory(models.Model):
     name = models.CharField(max_length=100, unique=True)
@@ -228,7 +379,7 @@ class BlogCategory(models.Model):
         super().save(*args, **kwargs)
 
 
-class BlogPost(models.Model):
+class BlogPost(UniqueSlugMixin, ResponsiveImagesMixin, RenderedMarkdownMixin, models.Model):
     STATUS_CHOICES = [
         ("draft", "Draft"),
         ("published", "Published"),
@@ -250,6 +401,9 @@ class BlogPost(models.Model):
     thumbnail = models.ImageField(upload_to="blog/thumbnails/", null=True, blank=True)
     excerpt = models.CharField(max_length=500, blank=True)
     content = models.TextField()  # Markdown
+    content_html = models.TextField(blank=True, editable=False)
+    content_toc = models.JSONField(default=list, blank=True, editable=False)
+    plain_excerpt = models.CharField(max_length=300, blank=True, editable=False)
     reading_time_minutes = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
 
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="draft")
@@ -271,28 +425,30 @@ class BlogPost(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     published_at = models.DateTimeField(null=True, blank=True)
+    image_derivatives = GenericRelation("ImageDerivative")
 
     class Meta:
         ordering = ["-published_at", "-created_at"]
         indexes = [
             models.Index(fields=["-published_at"]),
+            # Keyset pagination (BlogPostViewSet.cursor_ordering)
+            models.Index(fields=["-published_at", "-created_at", "id"]),
             models.Index(fields=["slug"]),
             models.Index(fields=["status"]),
         ]
 
+    markdown_fields = ("content",)
+    responsive_image_fields = ("featured_image", "thumbnail")
+
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            base_slug = slugify(self.title)
-            slug = base_slug
-            counter = 1
-            while BlogPost.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
+        self.set_derived_fields()
+        super().save(*args, **kwargs)
 
+    def set_derived_fields(self):
+        """Fields computed from the others; also applied to batch writes (content.bulk)."""
         # Auto reading time (rough estimate: ~200 words per minute)
         if self.content:
             words = len(self.content.split())
@@ -304,8 +460,6 @@ class BlogPost(models.Model):
         elif self.status != "published":
             self.published_at = None
 
-        super().save(*args, **kwargs)
-
 
 class ServiceCategory(models.Model):
     name = models.CharField(max_length=100, unique=True)
@@ -325,7 +479,7 @@ class ServiceCategory(models.Model):
         super().save(*args, **kwargs)
 
 
-class Service(models.Model):
+class Service(UniqueSlugMixin, ResponsiveImagesMixin, RenderedMarkdownMixin, models.Model):
     STATUS_CHOICES = BlogPost.STATUS_CHOICES  # Reuse same choices
     ROBOTS_CHOICES = BlogPost.ROBOTS_CHOICES
 
@@ -335,6 +489,9 @@ class Service(models.Model):
     featured_image = models.ImageField(upload_to="services/featured/", null=True, blank=True)
     featured_image_alt = models.CharField(max_length=255, blank=True)
     content = models.TextField()  # Markdown
+    content_html = models.TextField(blank=True, editable=False)
+    content_toc = models.JSONField(default=list, blank=True, editable=False)
+    plain_excerpt = models.CharField(max_length=300, blank=True, editable=False)
     reading_time_minutes = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
 
     category = models.ForeignKey(
@@ -358,6 +515,7 @@ class Service(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     published_at = models.DateTimeField(null=True, blank=True)
+    image_derivatives = GenericRelation("ImageDerivative")
 
     class Meta:
         ordering = ["-is_featured", "order", "-created_at"]
@@ -366,19 +524,18 @@ class Service(models.Model):
             models.Index(fields=["status"]),
         ]
 
+    markdown_fields = ("content",)
+    responsive_image_fields = ("featured_image",)
+
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            base_slug = slugify(self.title)
-            slug = base_slug
-            counter = 1
-            while Service.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
+        self.set_derived_fields()
+        super().save(*args, **kwargs)
 
+    def set_derived_fields(self):
+        """Fields computed from the others; also applied to batch writes (content.bulk)."""
         if self.content:
             words = len(self.content.split())
             self.reading_time_minutes = max(1, round(words / 200))
@@ -388,10 +545,8 @@ class Service(models.Model):
         elif self.status != "published":
             self.published_at = None
 
-        super().save(*args, **kwargs)
 
-
-class SiteConfig(models.Model):
+class SiteConfig(ResponsiveImagesMixin, models.Model):
     """Singleton model for site configuration - only one config is active"""
     company_name = models.CharField(max_length=255)
     about_excerpt = models.TextField(blank=True)
@@ -413,24 +568,25 @@ class SiteConfig(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    image_derivatives = GenericRelation("ImageDerivative")
 
     class Meta:
         verbose_name = "Site Configuration"
         verbose_name_plural = "Site Configuration"
 
+    responsive_image_fields = ("logo",)
+
     def __str__(self):
         return f"{self.company_name} Configuration"
 
     def save(self, *args, **kwargs):
         """Ensure only one config instance exists"""
-        # Delete old logo file if being replaced
+        # Delete old logo file if being replaced (the name as loaded is
+        # tracked by ResponsiveImagesMixin, so no need to re-read the row)
         if self.pk:
-            try:
-                old = SiteConfig.objects.get(pk=self.pk)
-                if old.logo and old.logo != self.logo and default_storage.exists(old.logo.name):
-                    default_storage.delete(old.logo.name)
-            except ObjectDoesNotExist:
-                pass
+            old_logo = getattr(self, "_image_sources", {}).get("logo")
+            if old_logo and old_logo != self.logo.name:
+                delete_files.enqueue([old_logo])
         else:
             # Delete existing config when creating new one (singleton pattern)
             SiteConfig.objects.all().delete()
@@ -439,8 +595,8 @@ class SiteConfig(models.Model):
 
     def delete(self, *args, **kwargs):
         """Delete logo file when config is deleted"""
-        if self.logo and default_storage.exists(self.logo.name):
-            default_storage.delete(self.logo.name)
+        if self.logo:
+            delete_files.enqueue([self.logo.name])
         super().delete(*args, **kwargs)
 
     @classmethod
@@ -449,8 +605,22 @@ class SiteConfig(models.Model):
         config, created = cls.objects.get_or_create(pk=1)
         return config
 
+    @classmethod
+    def get_cached_config(cls):
+        """Read-only site configuration from the process-local cache"""
+        return _site_config_cache.get()
+
+
+def _load_site_config():
+    config = SiteConfig.get_config()
+    models.prefetch_related_objects([config], "image_derivatives")
+    return config
 
-class Career(models.Model):
+
+_site_config_cache = ProcessLocalSingleton(SiteConfig, _load_site_config)
+
+
+class Career(UniqueSlugMixin, RenderedMarkdownMixin, models.Model):
     """Career/Job opportunities model"""
     STATUS_CHOICES = [
         ("draft", "Draft"),
@@ -478,6 +648,10 @@ class Career(models.Model):
     responsibilities = models.TextField(blank=True, help_text="Job responsibilities (one per line or markdown)")
     qualifications = models.TextField(blank=True, help_text="Required qualifications")
     benefits = models.TextField(blank=True, help_text="Job benefits")
+    requirements_html = models.TextField(blank=True, editable=False)
+    responsibilities_html = models.TextField(blank=True, editable=False)
+    qualifications_html = models.TextField(blank=True, editable=False)
+    benefits_html = models.TextField(blank=True, editable=False)
 
     application_email = models.EmailField(blank=True, help_text="Email to receive applications")
     application_url = models.URLField(blank=True, help_text="External application URL")
@@ -501,19 +675,12 @@ class Career(models.Model):
             models.Index(fields=["status"]),
         ]
 
+    markdown_fields = ("requirements", "responsibilities", "qualifications", "benefits")
+
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            base_slug = slugify(self.title)
-            slug = base_slug
-            counter = 1
-            while Career.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
-
         if self.status == "active" and not self.published_at:
             self.published_at = timezone.now()
         elif self.status != "active":
@@ -522,7 +689,7 @@ class Career(models.Model):
         super().save(*args, **kwargs)
 
 
-class Notice(models.Model):
+class Notice(UniqueSlugMixin, ResponsiveImagesMixin, RenderedMarkdownMixin, models.Model):
     """Notice/Announcement model"""
     STATUS_CHOICES = [
         ("draft", "Draft"),
@@ -540,6 +707,9 @@ class Notice(models.Model):
     title = models.CharField(max_length=255)
     slug = models.SlugField(max_length=300, unique=True, blank=True)
     content = models.TextField(help_text="Notice content (supports markdown)")
+    content_html = models.TextField(blank=True, editable=False)
+    content_toc = models.JSONField(default=list, blank=True, editable=False)
+    plain_excerpt = models.CharField(max_length=300, blank=True, editable=False)
     excerpt = models.CharField(max_length=500, blank=True, help_text="Short summary")
 
     attachment = models.FileField(upload_to="notices/attachments/", null=True, blank=True, help_text="PDF or document attachment")
@@ -559,6 +729,7 @@ class Notice(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     published_at = models.DateTimeField(null=True, blank=True)
+    image_derivatives = GenericRelation("ImageDerivative")
 
     class Meta:
         ordering = ["-is_sticky", "-is_featured", "-notice_date", "-created_at"]
@@ -568,21 +739,16 @@ class Notice(models.Model):
             models.Index(fields=["slug"]),
             models.Index(fields=["status"]),
             models.Index(fields=["-notice_date"]),
+            models.Index(fields=["-is_sticky", "-is_featured", "-notice_date", "-created_at", "id"]),
         ]
 
+    markdown_fields = ("content",)
+    responsive_image_fields = ("featured_image",)
+
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            base_slug = slugify(self.title)
-            slug = base_slug
-            counter = 1
-            while Notice.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
-
         if self.status == "published" and not self.published_at:
             self.published_at = timezone.now()
         elif self.status != "published":
@@ -598,6 +764,32 @@ class Notice(models.Model):
         return False
 
 
+class JobApplicationQuerySet(models.QuerySet):
+    def set_status(self, status, admin_notes=None):
+        """
+        Move every application in the queryset to ``status`` with one UPDATE;
+        returns the number of rows changed.
+
+        ``reviewed_at`` is stamped as ``JobApplication.save()`` does it: on rows
+        leaving "pending" that have none yet. The CASE reads each row's status
+        before the update.
+        """
+        now = timezone.now()
+        values = {}
+        if status != "pending":
+            # Listed first: MySQL evaluates SET assignments left to right
+            values["reviewed_at"] = models.Case(
+                models.When(status="pending", reviewed_at__isnull=True, then=models.Value(now)),
+                default=models.F("reviewed_at"),
+            )
+        values.update(status=status, updated_at=now)
+        if admin_notes is not None:
+            values["admin_notes"] = admin_notes
+        updated = self.update(**values)
+        bump_generation(self.model)  # update() sends no post_save
+        return updated
+
+
 class JobApplication(models.Model):
     """Job Application model for career opportunities"""
     STATUS_CHOICES = [
@@ -639,6 +831,8 @@ class JobApplication(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     reviewed_at = models.DateTimeField(null=True, blank=True)
 
+    objects = JobApplicationQuerySet.as_manager()
+
     class Meta:
         ordering = ["-created_at"]
         verbose_name = "Job Application"
@@ -646,16 +840,151 @@ class JobApplication(models.Model):
         indexes = [
             models.Index(fields=["career", "status"]),
             models.Index(fields=["-created_at"]),
+            models.Index(fields=["-created_at", "id"]),
             models.Index(fields=["email"]),
         ]
 
     def __str__(self):
         return f"{self.full_name} - {self.career.title}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Status as loaded, so save() can spot a change without re-reading the row
+        instance._loaded_status = instance.__dict__.get("status")
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, *args, **kwargs):
+        # Also runs when a deferred status is first read
+        super().refresh_from_db(using, fields, *args, **kwargs)
+        if fields is None or "status" in fields:
+            self._loaded_status = self.__dict__.get("status")
+
     def save(self, *args, **kwargs):
         # Set reviewed_at when status changes from pending
-        if self.pk:
-            old_instance = JobApplication.objects.get(pk=self.pk)
-            if old_instance.status == "pending" and self.status != "pending" and not self.reviewed_at:
+        if self.pk and not self._state.adding:
+            old_status = getattr(self, "_loaded_status", None)
+            if old_status is None:  # built by hand rather than loaded, or status never read
+                old_status = JobApplication.objects.filter(pk=self.pk).values_list("status", flat=True).first()
+            if old_status == "pending" and self.status != "pending" and not self.reviewed_at:
                 self.reviewed_at = timezone.now()
+                if kwargs.get("update_fields") is not None:
+                    kwargs["update_fields"] = {*kwargs["update_fields"], "reviewed_at"}
         super().save(*args, **kwargs)
+        if kwargs.get("update_fields") is None or "status" in kwargs["update_fields"]:
+            self._loaded_status = self.__dict__.get("status")
+
+
+class ImageDerivative(models.Model):
+    """A resized WebP/AVIF copy of an uploaded image (see content.images)"""
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveBigIntegerField()
+    content_object = GenericForeignKey("content_type", "object_id")
+    field_name = models.CharField(max_length=100)
+    # Name of the original file the variant was made from
+    source = models.CharField(max_length=255)
+    file = models.FileField(max_length=255)
+    format = models.CharField(max_length=10)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Image Derivative"
+        verbose_name_plural = "Image Derivatives"
+        indexes = [
+            models.Index(fields=["content_type", "object_id"]),
+        ]
+
+    def __str__(self):
+        return f"{self.source} ({self.width}w {self.format})"
+
+
+class Task(models.Model):
+    """A queued background task (see content.tasks)"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (FAILED, "Failed"),
+    ]
+
+    # Dotted path of the @task function
+    name = models.CharField(max_length=255)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=255, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    # Seconds without a heartbeat before a running task is requeued (TASK_LOCK_TIMEOUT when empty)
+    lock_timeout = models.PositiveIntegerField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["run_after", "id"]
+        verbose_name = "Task"
+        verbose_name_plural = "Tasks"
+        indexes = [
+            models.Index(fields=["status", "run_after"]),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
+
+
+class ChunkedUpload(models.Model):
+    """A file being uploaded in chunks (see content.uploads)"""
+    UPLOADING = "uploading"
+    ASSEMBLING = "assembling"
+    COMPLETE = "complete"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (UPLOADING, "Uploading"),
+        (ASSEMBLING, "Assembling"),
+        (COMPLETE, "Complete"),
+        (FAILED, "Failed"),
+    ]
+    TARGET_CHOICES = [(target, target) for target in UPLOAD_TARGETS]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    target = models.CharField(max_length=50, choices=TARGET_CHOICES)
+    # Row that receives the file; when empty a new row is created from create_fields
+    object_id = models.PositiveBigIntegerField(null=True, blank=True)
+    create_fields = models.JSONField(default=dict, blank=True)
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    chunk_size = models.PositiveIntegerField()
+    sha256 = models.CharField(max_length=64, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=UPLOADING)
+    error = models.TextField(blank=True)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Chunked Upload"
+        verbose_name_plural = "Chunked Uploads"
+
+    def __str__(self):
+        return f"{self.filename} -> {self.target} ({self.status})"
+
+    @property
+    def total_chunks(self):
+        return max(1, -(-self.size // self.chunk_size))
+
+    @property
+    def target_field(self):
+        model_label, field_name = UPLOAD_TARGETS[self.target]
+        return apps.get_model(model_label)._meta.get_field(field_name)
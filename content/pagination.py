@@ -0,0 +1,198 @@
+"""
+Pagination for the REST API.
+
+Page-number pagination remains the default. Viewsets that declare a
+``cursor_ordering`` also accept ``?cursor=`` (empty for the first page) and
+are then paginated by keyset: the cursor carries the ordering values of the
+last row seen, so each page is an index range scan with no ``OFFSET`` and no
+``COUNT(*)``, and rows inserted meanwhile never shift a page. ``?ordering=``
+on model fields is honoured in both modes, with ``id`` breaking ties.
+
+Both modes sort NULLs as the largest value (PostgreSQL's default, spelled
+out so SQLite agrees), so the same listing pages identically either way.
+"""
+import base64
+import binascii
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound, ParseError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def order_expression(name, reverse=False):
+    """``name`` ("field" or "-field") as an ordering expression with NULLs as the largest value."""
+    field = F(name.lstrip("-"))
+    if name.startswith("-") != reverse:
+        return field.desc(nulls_first=True)
+    return field.asc(nulls_last=True)
+
+
+def concrete_field(model, name):
+    try:
+        field = model._meta.get_field(name.lstrip("-"))
+    except FieldDoesNotExist:
+        return None
+    return field if field.concrete and not field.is_relation else None
+
+
+class PageNumberOrCursorPagination(PageNumberPagination):
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        cursor_ordering = getattr(view, "cursor_ordering", None)
+        self.cursor_mode = bool(cursor_ordering) and self.cursor_query_param in request.query_params
+        if not self.cursor_mode:
+            if cursor_ordering:
+                queryset = self.stable_ordering(queryset)
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.ordering = self.get_cursor_ordering(request, queryset, cursor_ordering)
+        self.page_size = self.get_page_size(request)
+        values, reverse = self.decode_cursor(request.query_params[self.cursor_query_param], queryset.model)
+
+        if values is not None:
+            queryset = queryset.filter(self._keyset_filter(queryset.model, values, reverse))
+        rows = list(queryset.order_by(*self._order_by(reverse))[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        # Moving backwards we always came from a later page, and vice versa.
+        self.has_next = has_more if not reverse else True
+        self.has_previous = has_more if reverse else values is not None
+        self.first_row = rows[0] if rows else None
+        self.last_row = rows[-1] if rows else None
+        return rows
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_next_link(self):
+        if not self.cursor_mode:
+            return super().get_next_link()
+        if not (self.has_next and self.last_row):
+            return None
+        return self._cursor_link(self.last_row, reverse=False)
+
+    def get_previous_link(self):
+        if not self.cursor_mode:
+            return super().get_previous_link()
+        if not (self.has_previous and self.first_row):
+            return None
+        return self._cursor_link(self.first_row, reverse=True)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        if getattr(view, "cursor_ordering", None):
+            parameters.append({
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Keyset pagination cursor. Pass an empty value for the first page, "
+                               "then follow the next/previous links.",
+                "schema": {"type": "string"},
+            })
+        return parameters
+
+    def stable_ordering(self, queryset):
+        """
+        ``queryset`` in its current order with NULLs placed as in cursor mode
+        and ``id`` breaking ties, so OFFSET pages neither repeat nor skip rows.
+        """
+        query = queryset.query
+        terms = list(query.order_by or (queryset.model._meta.ordering if query.default_ordering else ()))
+        ordering = []
+        for term in terms:
+            field = concrete_field(queryset.model, term) if isinstance(term, str) else None
+            ordering.append(order_expression(term) if field is not None and field.null else term)
+        if not any(isinstance(term, str) and term.lstrip("-") in ("id", "pk") for term in terms):
+            ordering.append("id")
+        return queryset.order_by(*ordering)
+
+    def get_cursor_ordering(self, request, queryset, cursor_ordering):
+        """The view's ``cursor_ordering``, or the ``?ordering=`` it was given followed by ``id``."""
+        if not request.query_params.get(api_settings.ORDERING_PARAM):
+            return tuple(cursor_ordering)
+        # OrderingFilter has already validated the parameter and applied it
+        terms = [term for term in queryset.query.order_by if isinstance(term, str)]
+        invalid = [term.lstrip("-") for term in terms if concrete_field(queryset.model, term) is None]
+        if invalid or len(terms) != len(queryset.query.order_by):
+            raise ParseError(f"Cursor pagination cannot order by {', '.join(invalid) or 'this ordering'}")
+        if not any(term.lstrip("-") in ("id", "pk") for term in terms):
+            terms.append("id")
+        return tuple("-id" if term == "-pk" else "id" if term == "pk" else term for term in terms)
+
+    def encode_cursor(self, row, reverse):
+        values = [getattr(row, name.lstrip("-")) for name in self.ordering]
+        # Full-precision isoformat: DjangoJSONEncoder would drop microseconds
+        payload = json.dumps(
+            {"v": values, "r": reverse, "o": list(self.ordering)}, default=lambda value: value.isoformat(),
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, cursor, model):
+        """Return ``(values, reverse)``; ``values`` is None for the first page."""
+        if not cursor:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            raw_values, reverse = payload["v"], bool(payload["r"])
+            # A cursor only makes sense in the ordering it was made for
+            if payload.get("o", list(self.ordering)) != list(self.ordering) or len(raw_values) != len(self.ordering):
+                raise ValueError
+            values = [
+                None if raw is None else model._meta.get_field(name.lstrip("-")).to_python(raw)
+                for name, raw in zip(self.ordering, raw_values)
+            ]
+        except (binascii.Error, ValueError, KeyError, TypeError, UnicodeDecodeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    def _cursor_link(self, row, reverse):
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(row, reverse))
+
+    def _order_by(self, reverse):
+        # NULLs sort as the largest value on every backend (PostgreSQL's
+        # default), so the plain column indexes stay usable.
+        return [order_expression(name, reverse) for name in self.ordering]
+
+    def _keyset_filter(self, model, values, reverse):
+        """Rows strictly after ``values`` in the (possibly reversed) ordering."""
+        condition = Q(pk__in=[])
+        equal_so_far = Q()
+        for name, value in zip(self.ordering, values):
+            field_name = name.lstrip("-")
+            nullable = model._meta.get_field(field_name).null
+            larger = name.startswith("-") == reverse
+            beyond = self._beyond(field_name, value, larger, nullable)
+            if beyond is not None:
+                condition |= equal_so_far & beyond
+            equal_so_far &= Q(**{f"{field_name}__isnull": True}) if value is None else Q(**{field_name: value})
+        return condition
+
+    @staticmethod
+    def _beyond(field_name, value, larger, nullable):
+        if larger:
+            if value is None:
+                return None
+            q = Q(**{f"{field_name}__gt": value})
+            return q | Q(**{f"{field_name}__isnull": True}) if nullable else q
+        if value is None:
+            return Q(**{f"{field_name}__isnull": False})
+        return Q(**{f"{field_name}__lt": value})
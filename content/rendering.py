@@ -0,0 +1,122 @@
+"""
+Server-side markdown rendering.
+
+Markdown (and the HTML the dashboard editor produces, which markdown passes
+through) is rendered once, when a row is saved, into sanitized HTML stored
+next to its source, together with a table of contents and a plain-text
+excerpt. API clients opt in with ``?render=html``.
+"""
+import html
+import json
+import re
+from dataclasses import dataclass, field
+
+import markdown
+import nh3
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+RENDER_QUERY_PARAM = "render"
+
+MARKDOWN_EXTENSIONS = ["extra", "sane_lists", "toc"]
+
+PLAIN_EXCERPT_LENGTH = 300
+
+ALLOWED_TAGS = nh3.ALLOWED_TAGS | {"tfoot"}
+HEADINGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+ALLOWED_ATTRIBUTES = {
+    **{tag: set(attrs) for tag, attrs in nh3.ALLOWED_ATTRIBUTES.items()},
+    **{heading: {"id"} for heading in HEADINGS},
+    "a": {"href", "hreflang", "title"},
+    "img": {"src", "alt", "title", "width", "height"},
+    "*": {"class"},
+}
+
+
+@dataclass
+class RenderedMarkdown:
+    html: str = ""
+    toc: list = field(default_factory=list)
+    plain_excerpt: str = ""
+
+
+def is_quill_delta(text):
+    """Delta JSON from the rich-text editor is converted client-side, not here."""
+    stripped = text.lstrip()
+    if not stripped.startswith(("{", "[")):
+        return False
+    try:
+        return isinstance(json.loads(stripped).get("ops"), list)
+    except (ValueError, AttributeError):
+        return False
+
+
+def render_markdown(text):
+    if not text or is_quill_delta(text):
+        return RenderedMarkdown()
+
+    md = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+    rendered = nh3.clean(md.convert(text), tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRIBUTES)
+    return RenderedMarkdown(
+        html=rendered,
+        toc=_flatten_toc(md.toc_tokens),
+        plain_excerpt=plain_text(rendered, PLAIN_EXCERPT_LENGTH),
+    )
+
+
+def plain_text(rendered_html, length):
+    text = re.sub(r"\s+", " ", html.unescape(strip_tags(rendered_html))).strip()
+    return Truncator(text).chars(length)
+
+
+def _flatten_toc(tokens):
+    entries = []
+    for token in tokens:
+        entries.append({"level": token["level"], "id": token["id"], "title": html.unescape(token["name"])})
+        entries.extend(_flatten_toc(token["children"]))
+    return entries
+
+
+def apply_rendered_markdown(instance, sources, update_fields=None):
+    """
+    Render each markdown ``source`` field of ``instance`` into its
+    ``<source>_html`` field, plus ``<source>_toc`` and ``plain_excerpt``
+    where the model has them.
+
+    With ``update_fields`` only those sources are rendered. Returns the names
+    of the fields that were written.
+    """
+    field_names = {f.name for f in instance._meta.concrete_fields}
+    written = []
+    for source in sources:
+        if update_fields is not None and source not in update_fields:
+            continue
+        rendered = render_markdown(getattr(instance, source))
+        values = {f"{source}_html": rendered.html, f"{source}_toc": rendered.toc}
+        if source == sources[0]:
+            values["plain_excerpt"] = rendered.plain_excerpt
+        for name, value in values.items():
+            if name in field_names:
+                setattr(instance, name, value)
+                written.append(name)
+    return written
+
+
+def backfill_rendered_markdown(queryset, sources, batch_size=500):
+    """
+    Re-render ``sources`` for every row of ``queryset``, writing each batch
+    with a single ``bulk_update``. Returns the number of rows rendered.
+    """
+    manager = queryset.model._base_manager.db_manager(queryset.db)
+    batch, fields, count = [], [], 0
+    for instance in queryset.only("pk", *sources).iterator(chunk_size=batch_size):
+        fields = apply_rendered_markdown(instance, sources)
+        batch.append(instance)
+        if len(batch) >= batch_size:
+            manager.bulk_update(batch, fields)
+            count += len(batch)
+            batch = []
+    if batch:
+        manager.bulk_update(batch, fields)
+        count += len(batch)
+    return count
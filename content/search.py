@@ -0,0 +1,236 @@
+"""
+Full-text search for blog posts and services.
+
+Both database backends keep their index up to date with triggers built from
+``SEARCH_DOCUMENTS`` and (re)installed after every ``migrate``:
+
+* PostgreSQL: a weighted ``search_vector`` tsvector column (GIN indexed; see
+  migration 0026) filled in by a ``BEFORE INSERT OR UPDATE`` trigger. The
+  trigger function names the columns only in its body, so ``AlterField`` on
+  them needs no extra steps; after a rename, update ``SEARCH_DOCUMENTS`` and
+  the next ``migrate`` rewrites the function and rebuilds the vectors.
+* SQLite, used in development: an FTS5 index.
+
+Other backends fall back to DRF's ``ILIKE`` search.
+"""
+import re
+
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVectorField
+from django.db import connections
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from rest_framework import filters
+
+from .models import BlogPost, Service
+
+SEARCH_CONFIG = "english"
+
+# Indexed columns per model, most important first. The order doubles as the
+# weight order (A, B, C, ...) on PostgreSQL and the bm25 column weights on SQLite.
+SEARCH_DOCUMENTS = {
+    BlogPost: ("title", "excerpt", "content", "tags"),
+    Service: ("title", "excerpt", "content"),
+}
+SQLITE_COLUMN_WEIGHTS = (10.0, 4.0, 1.0, 2.0)
+
+# The databases mark matches with these control characters; render_snippet()
+# escapes the text around them and only then turns them into <mark> tags.
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_STOP = "\x03"
+SEARCH_WEIGHTS = "ABCD"
+
+
+def is_searchable(model, connection):
+    return model in SEARCH_DOCUMENTS and connection.vendor in ("postgresql", "sqlite")
+
+
+def search(queryset, terms):
+    """
+    Filter ``queryset`` to rows matching ``terms``.
+
+    Annotates ``search_rank`` (higher is better) and ``search_snippet`` (an
+    excerpt of the best matching text; see ``render_snippet``).
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == "postgresql":
+        return _search_postgresql(queryset, terms)
+    return _search_sqlite(queryset, terms)
+
+
+def render_snippet(snippet):
+    """``search_snippet`` as HTML: the source text escaped, matches in ``<mark>``."""
+    if snippet is None:
+        return None
+    return escape(snippet).replace(HIGHLIGHT_START, "<mark>").replace(HIGHLIGHT_STOP, "</mark>")
+
+
+def _search_postgresql(queryset, terms):
+    table = queryset.model._meta.db_table
+    query = SearchQuery(terms, config=SEARCH_CONFIG, search_type="websearch")
+    vector = RawSQL(f'"{table}"."search_vector"', [], output_field=SearchVectorField())
+    return (
+        queryset.alias(search_vector=vector)
+        .filter(search_vector=query)
+        .annotate(
+            search_rank=SearchRank(vector, query),
+            search_snippet=SearchHeadline(
+                "content", query, config=SEARCH_CONFIG,
+                start_sel=HIGHLIGHT_START, stop_sel=HIGHLIGHT_STOP,
+                max_words=35, min_words=15,
+            ),
+        )
+    )
+
+
+def _fts5_query(terms):
+    # Quote every token so user input can never be parsed as FTS5 syntax.
+    tokens = re.findall(r"\w+", terms)
+    return " ".join(f'"{token}"' for token in tokens)
+
+
+def _search_sqlite(queryset, terms):
+    match = _fts5_query(terms)
+    if not match:
+        return queryset.none()
+
+    table = queryset.model._meta.db_table
+    fts = f"{table}_fts"
+    weights = ", ".join(str(w) for w in SQLITE_COLUMN_WEIGHTS[:len(SEARCH_DOCUMENTS[queryset.model])])
+    lookup = f'FROM "{fts}" WHERE "{fts}" MATCH %s AND rowid = "{table}"."id"'
+    return queryset.filter(
+        pk__in=RawSQL(f'SELECT rowid FROM "{fts}" WHERE "{fts}" MATCH %s', [match])
+    ).annotate(
+        # bm25() is lower-is-better; negate it to match ts_rank
+        search_rank=RawSQL(f'SELECT -bm25("{fts}", {weights}) {lookup}', [match]),
+        search_snippet=RawSQL(
+            f"""SELECT snippet("{fts}", -1, '{HIGHLIGHT_START}', '{HIGHLIGHT_STOP}', '…', 24) {lookup}""",
+            [match],
+        ),
+    )
+
+
+def install_search_index(using="default", **kwargs):
+    """post_migrate handler: install the search triggers of the database ``using``."""
+    vendor = connections[using].vendor
+    if vendor == "postgresql":
+        install_postgresql_search_trigger(using)
+    elif vendor == "sqlite":
+        install_sqlite_search_index(using)
+
+
+def tsvector_document(columns, prefix=""):
+    """The weighted tsvector of ``columns`` (prefixed with ``NEW.`` in a trigger)."""
+    return " || ".join(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({prefix}{column}, '')), '{weight}')"
+        for column, weight in zip(columns, SEARCH_WEIGHTS)
+    )
+
+
+def install_postgresql_search_trigger(using="default"):
+    """
+    Create or update the trigger that fills ``search_vector`` on PostgreSQL.
+
+    When the function body changes (first install, or ``SEARCH_DOCUMENTS``
+    edited) every row's vector is rebuilt.
+    """
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        for model, columns in SEARCH_DOCUMENTS.items():
+            table = model._meta.db_table
+            cursor.execute(
+                "SELECT 1 FROM pg_attribute WHERE attrelid = %s::regclass "
+                "AND attname = 'search_vector' AND NOT attisdropped",
+                [table],
+            )
+            if cursor.fetchone() is None:
+                continue  # migrated back to before 0026
+            function = f"{table}_search_vector_update"
+            changed = " OR ".join(f"NEW.{column} IS DISTINCT FROM OLD.{column}" for column in columns)
+            body = (
+                f"\nBEGIN\n"
+                f"    IF TG_OP = 'INSERT' OR {changed} THEN\n"
+                f"        NEW.search_vector := {tsvector_document(columns, 'NEW.')};\n"
+                f"    END IF;\n"
+                f"    RETURN NEW;\n"
+                f"END;\n"
+            )
+            cursor.execute("SELECT prosrc FROM pg_proc WHERE proname = %s", [function])
+            row = cursor.fetchone()
+            if row and row[0] == body:
+                continue
+
+            cursor.execute(
+                f"CREATE OR REPLACE FUNCTION {function}() RETURNS trigger LANGUAGE plpgsql AS $search${body}$search$"
+            )
+            # Not "UPDATE OF <columns>": PostgreSQL would then refuse to alter those columns' types
+            cursor.execute(f"DROP TRIGGER IF EXISTS {table}_search_vector ON {table}")
+            cursor.execute(
+                f"CREATE TRIGGER {table}_search_vector BEFORE INSERT OR UPDATE ON {table} "
+                f"FOR EACH ROW EXECUTE FUNCTION {function}()"
+            )
+            cursor.execute(f"UPDATE {table} SET search_vector = {tsvector_document(columns)}")
+
+
+def install_sqlite_search_index(using="default", **kwargs):
+    """
+    Create the FTS5 tables and their sync triggers on SQLite.
+
+    Runs after every ``migrate``: SQLite migrations rebuild altered tables,
+    which drops their triggers, so missing triggers are recreated and the
+    index rebuilt from the content table.
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+
+    with connection.cursor() as cursor:
+        for model, columns in SEARCH_DOCUMENTS.items():
+            table = model._meta.db_table
+            fts = f"{table}_fts"
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = %s", [f"{fts}_au"]
+            )
+            if cursor.fetchone():
+                continue
+
+            names = ", ".join(columns)
+            new = ", ".join(f"new.{c}" for c in columns)
+            old = ", ".join(f"old.{c}" for c in columns)
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({names}, "
+                f"content='{table}', content_rowid='id', tokenize='porter unicode61')"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new}); END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old}); END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {names} ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old}); "
+                f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new}); END"
+            )
+            cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    ``?search=`` backed by the full-text index where one exists.
+
+    Results are ordered by relevance unless ``?ordering=`` is given; place
+    this backend after ``OrderingFilter`` so the rank ordering wins.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = request.query_params.get(self.search_param, "").strip()
+        if not terms or not is_searchable(queryset.model, connections[queryset.db]):
+            return super().filter_queryset(request, queryset, view)
+
+        queryset = search(queryset, terms)
+        if not request.query_params.get(filters.OrderingFilter.ordering_param):
+            ordering = queryset.query.order_by or queryset.model._meta.ordering
+            queryset = queryset.order_by("-search_rank", *ordering)
+        return queryset
@@ -15,12 +15,242 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
             last_name=validated_data.get('last_name', ''),
         )
         return user
+import os
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import IntegrityError, transaction
+from rest_framework.validators import UniqueValidator
 from drf_spectacular.utils import OpenApiExample, extend_schema_serializer, extend_schema_field, OpenApiTypes
 from .models import (
     Banner, About, Project, Lead, ProjectCategory, TeamMember,
     BlogPost, BlogCategory, SiteConfig, Service, ServiceCategory, Client, ProjectImage,
-    Career, Notice, JobApplication
+    Career, Notice, JobApplication, ChunkedUpload
 )
+from . import bulk
+from .images import build_srcsets
+from .uploads import received_chunks
+from .video import READY
+from .rendering import RENDER_QUERY_PARAM
+from .search import render_snippet
+
+class SearchSnippetMixin:
+    """Expose the full-text search rank and highlighted snippet when present."""
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if hasattr(instance, 'search_snippet'):
+            data['search_rank'] = instance.search_rank
+            data['search_snippet'] = render_snippet(instance.search_snippet)
+        return data
+
+
+class DatabaseUniqueMixin:
+    """
+    Leave unique columns to the database constraint rather than a SELECT per
+    field on every write. A duplicate surfaces as an IntegrityError and is
+    reported as the usual 400 validation error.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for field in fields.values():
+            field.validators = [v for v in field.validators if not isinstance(v, UniqueValidator)]
+        return fields
+
+    def save(self, **kwargs):
+        try:
+            with transaction.atomic():
+                return super().save(**kwargs)
+        except IntegrityError:
+            errors = self.unique_violations()
+            if not errors:
+                raise
+            raise serializers.ValidationError(errors)
+
+    def unique_violations(self):
+        """Which unique fields clashed; only queried after a write failed."""
+        model = self.Meta.model
+        errors = {}
+        for name, value in self.validated_data.items():
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if not field.unique or field.primary_key:
+                continue
+            clash = model._base_manager.filter(**{name: value})
+            if self.instance is not None:
+                clash = clash.exclude(pk=self.instance.pk)
+            if clash.exists():
+                errors[name] = [f"A {model._meta.verbose_name.lower()} with this {field.verbose_name} already exists."]
+        return errors
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    ``many=True`` writes for the ``/bulk/`` endpoints: the whole list is
+    stored with one ``bulk_create`` or ``bulk_update`` (see content.bulk).
+
+    For updates ``instance`` is a ``{pk: instance}`` map and every item
+    carries the ``id`` of the row it changes.
+    """
+
+    def run_child_validation(self, data):
+        if isinstance(self.instance, dict):
+            self.child.instance = self.instance.get(data.get('id')) if isinstance(data, dict) else None
+            self.child.initial_data = data
+        return super().run_child_validation(data)
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        return bulk.bulk_create(model, [model(**attrs) for attrs in validated_data])
+
+    def update(self, instances, validated_data):
+        changed = []
+        for item, attrs in zip(self.initial_data, validated_data):
+            instance = instances[item['id']]
+            for name, value in attrs.items():
+                setattr(instance, name, value)
+            changed.append(instance)
+        return bulk.bulk_update(self.child.Meta.model, changed)
+
+    def save(self, **kwargs):
+        try:
+            with transaction.atomic():
+                return super().save(**kwargs)
+        except IntegrityError:
+            errors = self.unique_violations()
+            if not any(errors):
+                raise
+            raise serializers.ValidationError(errors)
+
+    def unique_violations(self):
+        """Per-item errors for unique values taken by other rows or repeated in the batch."""
+        model = self.child.Meta.model
+        own_pks = set(self.instance) if isinstance(self.instance, dict) else set()
+        errors = [{} for _ in self.validated_data]
+        for field in model._meta.concrete_fields:
+            if not field.unique or field.primary_key:
+                continue
+            values = [attrs.get(field.name) for attrs in self.validated_data]
+            present = [value for value in values if value is not None]
+            taken = set(
+                model._base_manager.filter(**{f'{field.name}__in': present})
+                .exclude(pk__in=own_pks).values_list(field.name, flat=True)
+            ) if present else set()
+            seen = set()
+            for index, value in enumerate(values):
+                if value is None:
+                    continue
+                if value in taken or value in seen:
+                    errors[index][field.name] = [
+                        f"A {model._meta.verbose_name.lower()} with this {field.verbose_name} already exists."
+                    ]
+                seen.add(value)
+        return errors
+
+
+class SparseFieldsMixin:
+    """
+    Serialize a subset of the fields: only ``fields``, or all but ``omit``
+    (the views pass ``?fields=``/``?omit=``). With neither, ``summary=True``
+    keeps ``Meta.summary_fields``: the compact card representation of list
+    actions. Names that are not fields are ignored.
+
+    ``deferred_columns()`` lists the ``Meta.heavy_fields`` columns the
+    selected fields never read, for the view to ``defer()``.
+    """
+
+    def __init__(self, *args, fields=None, omit=None, summary=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.summary = summary and not (fields or omit)
+        if fields:
+            self.selected = set(fields)
+        elif self.summary:
+            self.selected = set(self.Meta.summary_fields)
+        else:
+            self.selected = None
+        self.omitted = set(omit or ())
+
+    def get_fields(self):
+        fields = super().get_fields()
+        return {
+            name: field for name, field in fields.items()
+            if (self.selected is None or name in self.selected) and name not in self.omitted
+        }
+
+    def read_columns(self):
+        """Model columns ``to_representation`` reads."""
+        return {field.source for field in self.fields.values() if not field.write_only}
+
+    def deferred_columns(self):
+        read = self.read_columns()
+        return [name for name in getattr(self.Meta, 'heavy_fields', ()) if name not in read]
+
+
+class RenderedHtmlMixin:
+    """
+    With ``?render=html``, add the HTML rendered on save (plus the table of
+    contents and plain-text excerpt) and drop the markdown it replaces.
+    In the summary representation an empty ``excerpt`` falls back to the
+    plain-text excerpt, since the markdown it would be cut from is left out.
+    """
+
+    def wants_rendered_html(self):
+        if self.context.get('render_html'):
+            return True
+        request = self.context.get('request')
+        return request is not None and request.query_params.get(RENDER_QUERY_PARAM) == 'html'
+
+    def read_columns(self):
+        columns = super().read_columns() | {'plain_excerpt'}
+        if self.wants_rendered_html():
+            for source in self.Meta.model.markdown_fields:
+                if source in columns:
+                    columns.update((f'{source}_html', f'{source}_toc'))
+        return columns
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if getattr(self, 'summary', False) and 'excerpt' in data and not data['excerpt']:
+            data['excerpt'] = getattr(instance, 'plain_excerpt', '')
+        if not self.wants_rendered_html():
+            return data
+        for source in instance.markdown_fields:
+            if source not in data:
+                continue  # not selected: its rendering is not wanted either
+            rendered = getattr(instance, f'{source}_html')
+            data[f'{source}_html'] = rendered
+            if hasattr(instance, f'{source}_toc'):
+                data[f'{source}_toc'] = getattr(instance, f'{source}_toc')
+            # Delta JSON is not rendered server-side; keep it for the client
+            if rendered:
+                data.pop(source, None)
+        if hasattr(instance, 'plain_excerpt'):
+            data['plain_excerpt'] = instance.plain_excerpt
+        return data
+
+
+class ResponsiveImageMixin:
+    """
+    Add ``<field>_srcset`` next to each of the model's responsive image
+    fields: a ``{format: "url 320w, url 640w, ..."}`` map of its variants.
+    """
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        fields = [name for name in getattr(instance, 'responsive_image_fields', ()) if name in data]
+        with_files = [name for name in fields if getattr(instance, name)]
+        srcsets = {name: {} for name in fields}
+        if with_files:
+            request = self.context.get('request')
+            build_url = request.build_absolute_uri if request else str
+            srcsets.update(build_srcsets(instance, with_files, build_url))
+        for name, srcset in srcsets.items():
+            data[f'{name}_srcset'] = srcset
+        return data
+
 
 @extend_schema_serializer(
     examples=[
@@ -36,22 +266,37 @@ from .models import (
                 "video_poster": "http://127.0.0.1:8000/media/banners/posters/poster.jpg",
                 "video_autoplay": True,
                 "video_muted": True,
-                "video_loop": True
+                "video_loop": True,
+                "video_renditions": {
+                    "status": "ready",
+                    "hls": "http://127.0.0.1:8000/media/banners/renditions/banner-video-1a2b3c4d/master.m3u8",
+                    "mp4": [
+                        {
+                            "url": "http://127.0.0.1:8000/media/banners/renditions/banner-video-1a2b3c4d/360p.mp4",
+                            "width": 640, "height": 360, "bitrate": 920000
+                        },
+                        {
+                            "url": "http://127.0.0.1:8000/media/banners/renditions/banner-video-1a2b3c4d/720p.mp4",
+                            "width": 1280, "height": 720, "bitrate": 3124000
+                        }
+                    ]
+                }
             },
         )
     ]
 )
-class BannerSerializer(serializers.ModelSerializer):
+class BannerSerializer(ResponsiveImageMixin, serializers.ModelSerializer):
     # Accept uploaded files while still returning absolute URLs in responses
     video = serializers.FileField(required=False, allow_null=True)
     video_poster = serializers.ImageField(required=False, allow_null=True)
+    video_renditions = serializers.SerializerMethodField()
 
     class Meta:
         model = Banner
         fields = [
             "id", "title", "subtitle", "description",
             "video", "video_poster", "video_autoplay", "video_muted", "video_loop",
-            "created_at", "updated_at"
+            "video_renditions", "created_at", "updated_at"
         ]
         read_only_fields = ("id", "created_at", "updated_at")
 
@@ -66,6 +311,48 @@ class BannerSerializer(serializers.ModelSerializer):
                 return None
         return None
 
+    def _build_storage_url(self, name):
+        request = self.context.get('request')
+        url = Banner._meta.get_field('video').storage.url(name)
+        return request.build_absolute_uri(url) if request else url
+
+    @extend_schema_field({
+        "type": "object",
+        "properties": {
+            "status": {"type": "string", "enum": ["pending", "ready", "failed", "unavailable"], "nullable": True},
+            "hls": {"type": "string", "format": "uri", "nullable": True},
+            "mp4": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "url": {"type": "string", "format": "uri"},
+                        "width": {"type": "integer"},
+                        "height": {"type": "integer"},
+                        "bitrate": {"type": "integer"},
+                    },
+                },
+            },
+        },
+    })
+    def get_video_renditions(self, obj):
+        """Transcoded streams of the current video, cheapest MP4 first (empty until processed)."""
+        renditions = obj.video_renditions or {}
+        if not obj.video or renditions.get("source") != obj.video.name:
+            return {"status": None, "hls": None, "mp4": []}
+        ready = renditions.get("status") == READY
+        return {
+            "status": renditions.get("status"),
+            "hls": self._build_storage_url(renditions["hls"]) if ready else None,
+            "mp4": [
+                {
+                    "url": self._build_storage_url(rung["file"]),
+                    "width": rung["width"], "height": rung["height"], "bitrate": rung["bitrate"],
+                }
+                for rung in sorted(renditions.get("mp4", []), key=lambda rung: rung["bitrate"])
+            ] if ready else [],
+        }
+
     def to_representation(self, instance):
         """Return absolute URLs; banner is video-focused."""
         data = super().to_representation(instance)
@@ -106,7 +393,7 @@ class BannerSerializer(serializers.ModelSerializer):
         )
     ]
 )
-class AboutSerializer(serializers.ModelSerializer):
+class AboutSerializer(ResponsiveImageMixin, serializers.ModelSerializer):
     image = serializers.ImageField(required=False, allow_null=True)
     mission_image = serializers.ImageField(required=False, allow_null=True)
     vision_image = serializers.ImageField(required=False, allow_null=True)
@@ -154,7 +441,7 @@ class AboutSerializer(serializers.ModelSerializer):
         )
     ]
 )
-class ProjectCategorySerializer(serializers.ModelSerializer):
+class ProjectCategorySerializer(DatabaseUniqueMixin, serializers.ModelSerializer):
     class Meta:
         model = ProjectCategory
         fields = [
@@ -176,7 +463,7 @@ class ProjectCategorySerializer(serializers.ModelSerializer):
         )
     ]
 )
-class BlogCategorySerializer(serializers.ModelSerializer):
+class BlogCategorySerializer(DatabaseUniqueMixin, serializers.ModelSerializer):
     class Meta:
         model = BlogCategory
         fields = [
@@ -185,7 +472,7 @@ class BlogCategorySerializer(serializers.ModelSerializer):
         read_only_fields = ("id", "slug", "created_at")
 
 
-class ProjectImageSerializer(serializers.ModelSerializer):
+class ProjectImageSerializer(ResponsiveImageMixin, serializers.ModelSerializer):
     class Meta:
         model = ProjectImage
         fields = [
@@ -209,7 +496,7 @@ class ProjectImageSerializer(serializers.ModelSerializer):
         )
     ]
 )
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(ResponsiveImageMixin, serializers.ModelSerializer):
     category = ProjectCategorySerializer(read_only=True)
     category_id = serializers.PrimaryKeyRelatedField(
         queryset=ProjectCategory.objects.all(), source="category", write_only=True, required=False, allow_null=True
@@ -243,7 +530,7 @@ class ProjectSerializer(serializers.ModelSerializer):
         )
     ]
 )
-class ClientSerializer(serializers.ModelSerializer):
+class ClientSerializer(DatabaseUniqueMixin, ResponsiveImageMixin, serializers.ModelSerializer):
     logo = serializers.ImageField(required=False, allow_null=True)
     
     class Meta:
@@ -281,7 +568,7 @@ class ClientSerializer(serializers.ModelSerializer):
         )
     ]
 )
-class TeamMemberSerializer(serializers.ModelSerializer):
+class TeamMemberSerializer(ResponsiveImageMixin, serializers.ModelSerializer):
     class Meta:
         model = TeamMember
         fields = [
@@ -346,7 +633,7 @@ class LeadSerializer(serializers.ModelSerializer):
         )
     ]
 )
-class BlogPostSerializer(serializers.ModelSerializer):
+class BlogPostSerializer(DatabaseUniqueMixin, ResponsiveImageMixin, RenderedHtmlMixin, SearchSnippetMixin, SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = BlogPost
         fields = [
@@ -360,20 +647,12 @@ class BlogPostSerializer(serializers.ModelSerializer):
             "id", "slug", "reading_time_minutes", "view_count",
             "created_at", "updated_at", "published_at"
         )
-
-    def validate_title(self, value):
-        """Validate title uniqueness, excluding current instance on updates"""
-        instance = self.instance
-        queryset = BlogPost.objects.filter(title=value)
-        
-        # If updating, exclude the current instance
-        if instance:
-            queryset = queryset.exclude(pk=instance.pk)
-        
-        if queryset.exists():
-            raise serializers.ValidationError("A blog post with this title already exists.")
-        
-        return value
+        summary_fields = [
+            "id", "title", "slug", "author", "featured_image", "featured_image_alt", "thumbnail",
+            "excerpt", "reading_time_minutes", "status", "tags", "category", "view_count",
+            "is_featured", "created_at", "updated_at", "published_at"
+        ]
+        heavy_fields = ("content", "content_html", "content_toc")
 
 @extend_schema_serializer(
     examples=[
@@ -391,7 +670,7 @@ class BlogPostSerializer(serializers.ModelSerializer):
         )
     ]
 )
-class ServiceCategorySerializer(serializers.ModelSerializer):
+class ServiceCategorySerializer(DatabaseUniqueMixin, serializers.ModelSerializer):
     class Meta:
         model = ServiceCategory
         fields = [
@@ -426,7 +705,7 @@ class ServiceCategorySerializer(serializers.ModelSerializer):
         )
     ]
 )
-class ServiceSerializer(serializers.ModelSerializer):
+class ServiceSerializer(DatabaseUniqueMixin, ResponsiveImageMixin, RenderedHtmlMixin, SearchSnippetMixin, SparseFieldsMixin, serializers.ModelSerializer):
     category = ServiceCategorySerializer(read_only=True)
     category_id = serializers.PrimaryKeyRelatedField(
         queryset=ServiceCategory.objects.all(),
@@ -450,6 +729,12 @@ class ServiceSerializer(serializers.ModelSerializer):
             "id", "slug", "reading_time_minutes", "view_count",
             "created_at", "updated_at", "published_at"
         )
+        summary_fields = [
+            "id", "title", "slug", "excerpt", "featured_image", "featured_image_alt",
+            "reading_time_minutes", "category", "status", "is_featured", "order", "view_count",
+            "created_at", "updated_at", "published_at"
+        ]
+        heavy_fields = ("content", "content_html", "content_toc")
 
 @extend_schema_serializer(
     examples=[
@@ -504,7 +789,7 @@ class ServiceSerializer(serializers.ModelSerializer):
         )
     ]
 )
-class SiteConfigSerializer(serializers.ModelSerializer):
+class SiteConfigSerializer(ResponsiveImageMixin, serializers.ModelSerializer):
     # Accept direct logo upload; return absolute URL in representation
     logo = serializers.ImageField(required=False, allow_null=True)
 
@@ -563,7 +848,7 @@ class SiteConfigSerializer(serializers.ModelSerializer):
         )
     ]
 )
-class CareerSerializer(serializers.ModelSerializer):
+class CareerSerializer(RenderedHtmlMixin, SparseFieldsMixin, serializers.ModelSerializer):
     is_expired = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
@@ -577,6 +862,16 @@ class CareerSerializer(serializers.ModelSerializer):
             "created_at", "updated_at", "published_at", "is_expired"
         ]
         read_only_fields = ("id", "slug", "view_count", "created_at", "updated_at", "published_at")
+        summary_fields = [
+            "id", "title", "slug", "location", "job_type", "department", "experience_required",
+            "salary_range", "short_description", "application_email", "application_url",
+            "application_deadline", "status", "is_featured", "order", "view_count",
+            "created_at", "updated_at", "published_at", "is_expired"
+        ]
+        heavy_fields = (
+            "requirements", "responsibilities", "qualifications", "benefits",
+            "requirements_html", "responsibilities_html", "qualifications_html", "benefits_html",
+        )
 
     @extend_schema_field(OpenApiTypes.BOOL)
     def get_is_expired(self, obj) -> bool:
@@ -614,7 +909,7 @@ class CareerSerializer(serializers.ModelSerializer):
         )
     ]
 )
-class NoticeSerializer(serializers.ModelSerializer):
+class NoticeSerializer(ResponsiveImageMixin, RenderedHtmlMixin, SparseFieldsMixin, serializers.ModelSerializer):
     is_expired = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
@@ -626,6 +921,12 @@ class NoticeSerializer(serializers.ModelSerializer):
             "view_count", "created_at", "updated_at", "published_at", "is_expired"
         ]
         read_only_fields = ("id", "slug", "view_count", "created_at", "updated_at", "published_at")
+        summary_fields = [
+            "id", "title", "slug", "excerpt", "attachment", "featured_image", "status", "priority",
+            "notice_date", "expiry_date", "is_featured", "is_sticky", "order", "view_count",
+            "created_at", "updated_at", "published_at", "is_expired"
+        ]
+        heavy_fields = ("content", "content_html", "content_toc")
 
     @extend_schema_field(OpenApiTypes.BOOL)
     def get_is_expired(self, obj) -> bool:
@@ -695,3 +996,90 @@ class JobApplicationSerializer(serializers.ModelSerializer):
             )
 
         return value
+
+
+class JobApplicationTriageSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False, max_length=500,
+        help_text="Applications to move",
+    )
+    status = serializers.ChoiceField(choices=JobApplication.STATUS_CHOICES)
+    admin_notes = serializers.CharField(required=False, allow_blank=True, help_text="Replaces the notes of every application")
+
+
+class ChunkedUploadSerializer(serializers.ModelSerializer):
+    project = serializers.PrimaryKeyRelatedField(
+        queryset=Project.objects.all(), write_only=True, required=False,
+        help_text="For projectimage.image without object_id: project the new gallery image is added to",
+    )
+    total_chunks = serializers.IntegerField(read_only=True)
+    received_chunks = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ChunkedUpload
+        fields = [
+            "id", "target", "object_id", "project", "filename", "size", "chunk_size",
+            "total_chunks", "received_chunks", "status", "error", "created_at", "completed_at",
+        ]
+        read_only_fields = ("id", "chunk_size", "status", "error", "created_at", "completed_at")
+
+    @extend_schema_field({"type": "array", "items": {"type": "integer"}})
+    def get_received_chunks(self, obj):
+        if obj.status != ChunkedUpload.UPLOADING:
+            return []
+        return received_chunks(obj)
+
+    def validate_filename(self, value):
+        name = os.path.basename(value.replace("\\", "/")).strip()
+        if not name:
+            raise serializers.ValidationError("A file name is required.")
+        return name
+
+    def validate_size(self, value):
+        if not 0 < value <= settings.UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(f"Size must be between 1 and {settings.UPLOAD_MAX_SIZE} bytes.")
+        return value
+
+    def validate(self, attrs):
+        target_model = ChunkedUpload(target=attrs["target"]).target_field.model
+        project = attrs.pop("project", None)
+        object_id = attrs.get("object_id")
+        if object_id:
+            if not target_model._base_manager.filter(pk=object_id).exists():
+                raise serializers.ValidationError({"object_id": "No such object for this target."})
+        elif target_model is ProjectImage:
+            if project is None:
+                raise serializers.ValidationError({"project": "Required when object_id is not given."})
+            attrs["create_fields"] = {"project_id": project.pk}
+        elif target_model is Banner:
+            # The singleton banner, or a new one if none exists yet
+            attrs["object_id"] = Banner.objects.values_list("pk", flat=True).first()
+        else:
+            raise serializers.ValidationError({"object_id": "This field is required."})
+        attrs["chunk_size"] = settings.UPLOAD_CHUNK_SIZE
+        return attrs
+
+
+class ProjectGalleryUploadSerializer(serializers.Serializer):
+    images = serializers.ListField(
+        child=serializers.FileField(), allow_empty=False, max_length=settings.GALLERY_MAX_FILES,
+        help_text="Image files, in gallery order",
+    )
+    captions = serializers.ListField(
+        child=serializers.CharField(max_length=255, allow_blank=True), required=False,
+        help_text="Caption of each image, by position",
+    )
+    alt_texts = serializers.ListField(
+        child=serializers.CharField(max_length=255, allow_blank=True), required=False,
+        help_text="Alt text of each image, by position",
+    )
+
+    def validate(self, attrs):
+        for name in ("captions", "alt_texts"):
+            if len(attrs.get(name, ())) > len(attrs["images"]):
+                raise serializers.ValidationError({name: "There are more entries than images."})
+        return attrs
+
+
+class ChunkedUploadCompleteSerializer(serializers.Serializer):
+    sha256 = serializers.RegexField(r"^[0-9a-fA-F]{64}$", help_text="SHA-256 of the whole file, hex encoded")
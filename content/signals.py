@@ -0,0 +1,51 @@
+from django.apps import apps
+from django.db.models.signals import post_delete, post_save
+
+from .caching import bump_generation
+from .tasks import delete_files
+
+# Internal state that never ends up in a response
+BOOKKEEPING_MODELS = ("task", "chunkedupload")
+
+
+def invalidate_cached_responses(sender, update_fields=None, **kwargs):
+    """Bump the model generation so cached responses built from it are dropped."""
+    # View counters are written on every read; they must not invalidate reads.
+    if update_fields and set(update_fields) <= {"view_count"}:
+        return
+    bump_generation(sender)
+
+
+def delete_derivative_file(sender, instance, **kwargs):
+    """Derivative files belong to their row alone; remove them once it is gone."""
+    if instance.file:
+        delete_files.enqueue([instance.file.name])
+
+
+def delete_banner_renditions(sender, instance, **kwargs):
+    """Transcoded streams go with the banner they were made for."""
+    files = (instance.video_renditions or {}).get("files")
+    if files:
+        delete_files.enqueue(files)
+
+
+def connect_signals():
+    for model in apps.get_app_config("content").get_models():
+        if model._meta.model_name in BOOKKEEPING_MODELS:
+            continue
+        post_save.connect(
+            invalidate_cached_responses, sender=model,
+            dispatch_uid=f"invalidate_cached_responses_save_{model._meta.model_name}",
+        )
+        post_delete.connect(
+            invalidate_cached_responses, sender=model,
+            dispatch_uid=f"invalidate_cached_responses_delete_{model._meta.model_name}",
+        )
+    post_delete.connect(
+        delete_derivative_file, sender=apps.get_model("content", "ImageDerivative"),
+        dispatch_uid="delete_derivative_file",
+    )
+    post_delete.connect(
+        delete_banner_renditions, sender=apps.get_model("content", "Banner"),
+        dispatch_uid="delete_banner_renditions",
+    )
@@ -0,0 +1,122 @@
+"""
+Dashboard statistics.
+
+``dashboard_stats()`` gathers every counter the dashboard shows with one
+conditional-aggregate query per table (``COUNT(*) FILTER (WHERE ...)``),
+instead of a ``count()`` per number, plus one grouped query for each daily
+series. The result is cached for ``DASHBOARD_STATS_TIMEOUT`` seconds and
+keyed on the generations of the models it counts, so an edit shows up on
+the next load; view counters, which do not bump generations, lag by at most
+the timeout.
+"""
+import hashlib
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .caching import get_generations
+from .metrics import record_cache
+from .models import BlogPost, Career, JobApplication, Lead, Notice, Project, Service, TeamMember
+
+STATS_KEY = "content:stats:{}"
+SERIES_DAYS = 90
+
+STATS_MODELS = (BlogPost, Project, Service, TeamMember, Lead, Career, JobApplication, Notice)
+
+
+def status_counts(field, choices):
+    """A ``Count`` aggregate for every value of a choices field, keyed by the value."""
+    return {value: Count("pk", filter=Q(**{field: value})) for value, _ in choices}
+
+
+def daily_series(queryset, start, days):
+    """Rows of ``queryset`` created per day since ``start``, zeros included."""
+    counts = dict(
+        # A range on the column itself, so an index on created_at can be used
+        queryset.filter(created_at__gte=timezone.make_aware(datetime.combine(start, time.min)))
+        .annotate(day=TruncDate("created_at"))
+        .values("day")
+        .annotate(count=Count("pk"))
+        .values_list("day", "count")
+    )
+    return [
+        {"date": day.isoformat(), "count": counts.get(day, 0)}
+        for day in (start + timedelta(days=offset) for offset in range(days))
+    ]
+
+
+def compute_stats():
+    today = timezone.localdate()
+    start = today - timedelta(days=SERIES_DAYS - 1)
+
+    posts = BlogPost.objects.aggregate(
+        total=Count("pk"), views=Sum("view_count", default=0), **status_counts("status", BlogPost.STATUS_CHOICES),
+    )
+    projects = Project.objects.aggregate(
+        total=Count("pk"), featured=Count("pk", filter=Q(is_featured=True)),
+        **status_counts("status", Project.STATUS_CHOICES),
+    )
+    services = Service.objects.aggregate(
+        total=Count("pk"), published=Count("pk", filter=Q(status="published")),
+    )
+    leads = Lead.objects.aggregate(
+        total=Count("pk"), unread=Count("pk", filter=Q(is_read=False)),
+        **status_counts("status", Lead.STATUS_CHOICES),
+    )
+    notices = Notice.objects.aggregate(
+        total=Count("pk"), **status_counts("status", Notice.STATUS_CHOICES),
+    )
+
+    # One row per career with its applications counted by status (LEFT JOIN,
+    # so careers without applications are listed too)
+    per_career = list(
+        Career.objects.order_by("-created_at").values("id", "title", "status").annotate(
+            total=Count("applications"),
+            **status_counts("applications__status", JobApplication.STATUS_CHOICES),
+        )
+    )
+    statuses = [value for value, _ in JobApplication.STATUS_CHOICES]
+    applications = {
+        "total": sum(career["total"] for career in per_career),
+        **{value: sum(career[value] for career in per_career) for value in statuses},
+        "by_career": per_career,
+    }
+    careers = {
+        "total": len(per_career),
+        **{value: sum(career["status"] == value for career in per_career) for value, _ in Career.STATUS_CHOICES},
+    }
+
+    return {
+        "generated_at": timezone.now().isoformat(),
+        "blog_posts": posts,
+        "projects": projects,
+        "services": services,
+        "team_members": {"total": TeamMember.objects.count()},
+        "leads": leads,
+        "careers": careers,
+        "applications": applications,
+        "notices": notices,
+        "series": {
+            "days": SERIES_DAYS,
+            "leads": daily_series(Lead.objects.all(), start, SERIES_DAYS),
+            "applications": daily_series(JobApplication.objects.all(), start, SERIES_DAYS),
+        },
+    }
+
+
+def dashboard_stats():
+    """The dashboard counters, from the cache when fresh."""
+    generations = get_generations(STATS_MODELS)
+    # The date is part of the key: the daily series roll over at midnight
+    fingerprint = f"{timezone.localdate().isoformat()}:{'.'.join(map(str, generations))}"
+    key = STATS_KEY.format(hashlib.md5(fingerprint.encode()).hexdigest())
+    stats = cache.get(key)
+    record_cache("dashboard_stats", "miss" if stats is None else "hit")
+    if stats is None:
+        stats = compute_stats()
+        cache.set(key, stats, settings.DASHBOARD_STATS_TIMEOUT)
+    return stats
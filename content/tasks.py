@@ -0,0 +1,165 @@
+"""
+Database-backed background tasks.
+
+Functions decorated with ``@task`` are queued with ``fn.enqueue(*args,
+**kwargs)``. The queue row is written in the caller's transaction, so work
+queued from a ``save()`` or signal only becomes visible to workers once that
+save commits, and disappears with it on rollback. Arguments must be JSON
+serializable: pass primary keys and file names, never model instances.
+
+``manage.py run_task_worker`` runs worker processes that claim due rows
+(``SELECT ... FOR UPDATE SKIP LOCKED`` where the database has it), run them
+and retry failures with exponential backoff until ``max_attempts``. A task
+left running for longer than its lock timeout (``TASK_LOCK_TIMEOUT`` unless
+the task sets its own) is taken to have lost its worker and is queued again;
+long tasks call ``heartbeat()`` to show they are still alive. With
+``TASK_QUEUE_EAGER`` tasks instead run in-process right after the commit.
+"""
+import logging
+import os
+import socket
+import traceback
+from contextvars import ContextVar
+from datetime import timedelta
+from functools import partial
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+_running = ContextVar("running_task", default=None)
+
+
+def task(func=None, *, max_attempts=3, retry_delay=30, lock_timeout=None):
+    """
+    Register ``func`` as a background task and give it an ``enqueue`` method.
+
+    A failed attempt is retried after ``retry_delay`` seconds, doubling each
+    time, until ``max_attempts`` attempts have been made. ``lock_timeout``
+    (seconds, or a callable returning them when the task is queued) replaces
+    ``TASK_LOCK_TIMEOUT`` for this task.
+    """
+    if func is None:
+        return partial(task, max_attempts=max_attempts, retry_delay=retry_delay, lock_timeout=lock_timeout)
+
+    name = f"{func.__module__}.{func.__qualname__}"
+    func.task_name = name
+    func.max_attempts = max_attempts
+    func.retry_delay = retry_delay
+    func.lock_timeout = lock_timeout
+    func.enqueue = partial(enqueue, func)
+    _registry[name] = func
+    return func
+
+
+def enqueue(func, *args, **kwargs):
+    """Queue ``func(*args, **kwargs)``; returns the Task row (None when eager)."""
+    if settings.TASK_QUEUE_EAGER:
+        transaction.on_commit(partial(func, *args, **kwargs))
+        return None
+    Task = apps.get_model("content", "Task")
+    lock_timeout = func.lock_timeout() if callable(func.lock_timeout) else func.lock_timeout
+    return Task.objects.create(
+        name=func.task_name, args=list(args), kwargs=kwargs, max_attempts=func.max_attempts,
+        lock_timeout=lock_timeout,
+    )
+
+
+def resolve(name):
+    if name not in _registry:
+        # Tasks defined outside already imported modules register on import
+        import_string(name)
+    return _registry[name]
+
+
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def heartbeat():
+    """Tell the queue the running task is still alive, restarting its lock timeout."""
+    task_pk = _running.get()
+    if task_pk is not None:
+        apps.get_model("content", "Task").objects.filter(pk=task_pk).update(locked_at=timezone.now())
+
+
+def requeue_stale():
+    """Put back tasks whose worker died mid-run (locked for longer than their lock timeout)."""
+    Task = apps.get_model("content", "Task")
+    now = timezone.now()
+    running = Task.objects.filter(status=Task.RUNNING)
+    stale = Q(lock_timeout__isnull=True, locked_at__lt=now - timedelta(seconds=settings.TASK_LOCK_TIMEOUT))
+    for seconds in running.filter(lock_timeout__isnull=False).values_list("lock_timeout", flat=True).distinct():
+        stale |= Q(lock_timeout=seconds, locked_at__lt=now - timedelta(seconds=seconds))
+    return running.filter(stale).update(status=Task.QUEUED, locked_by="", locked_at=None)
+
+
+def claim_next(worker):
+    """Mark the next due task as running for ``worker`` and return it, or None."""
+    Task = apps.get_model("content", "Task")
+    now = timezone.now()
+    with transaction.atomic():
+        due = Task.objects.filter(status=Task.QUEUED, run_after__lte=now).order_by("run_after", "id")
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        candidate = due.values_list("pk", flat=True).first()
+        if candidate is None:
+            return None
+        # Without row locks (SQLite) the status check keeps the claim exclusive
+        claimed = Task.objects.filter(pk=candidate, status=Task.QUEUED).update(
+            status=Task.RUNNING, locked_by=worker, locked_at=now, attempts=F("attempts") + 1,
+        )
+    return Task.objects.get(pk=candidate) if claimed else None
+
+
+def run_task(task_row):
+    """Run a claimed task; delete it on success, reschedule or fail it otherwise."""
+    Task = type(task_row)
+    token = _running.set(task_row.pk)
+    try:
+        func = resolve(task_row.name)
+        func(*task_row.args, **task_row.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        retry_delay = getattr(_registry.get(task_row.name), "retry_delay", 30)
+        if task_row.attempts >= task_row.max_attempts:
+            logger.error("Task %s (%s) failed permanently:\n%s", task_row.pk, task_row.name, error)
+            updates = {"status": Task.FAILED}
+        else:
+            delay = retry_delay * 2 ** (task_row.attempts - 1)
+            logger.warning("Task %s (%s) failed, retrying in %ss", task_row.pk, task_row.name, delay)
+            updates = {"status": Task.QUEUED, "run_after": timezone.now() + timedelta(seconds=delay)}
+        Task.objects.filter(pk=task_row.pk).update(last_error=error, locked_by="", locked_at=None, **updates)
+        return False
+    finally:
+        _running.reset(token)
+    Task.objects.filter(pk=task_row.pk).delete()
+    return True
+
+
+def run_pending(worker=None, limit=None):
+    """Run due tasks until none are left (or ``limit`` ran); returns how many ran."""
+    worker = worker or worker_id()
+    count = 0
+    while limit is None or count < limit:
+        task_row = claim_next(worker)
+        if task_row is None:
+            break
+        run_task(task_row)
+        count += 1
+    return count
+
+
+@task
+def delete_files(names):
+    """Remove stored files once the rows that referenced them are gone."""
+    from django.core.files.storage import default_storage
+
+    for name in names:
+        default_storage.delete(name)
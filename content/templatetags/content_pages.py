@@ -0,0 +1,21 @@
+from django import template
+from django.utils.dateparse import parse_datetime
+
+register = template.Library()
+
+
+@register.filter
+def isodate(value):
+    """Parse an ISO 8601 date or datetime from serialized API data, for ``|date``."""
+    if not value:
+        return None
+    try:
+        return parse_datetime(value)
+    except ValueError:
+        return None
+
+
+@register.filter
+def status_label(value, default=""):
+    """Format a status slug the way the page scripts do: ``on-hold`` -> ``ON HOLD``."""
+    return (value or default).replace("-", " ", 1).upper()
@@ -1,3 +1,1147 @@
-from django.test import TestCase
+import base64
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from datetime import timedelta
+from io import BytesIO
+from unittest import mock
+from urllib.parse import unquote
 
-# Create your tests here.
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import DatabaseError, IntegrityError, connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APIClient
+
+from cmspro.urls import router
+from .models import (
+    About, Banner, BlogCategory, BlogPost, Career, Client, ImageDerivative, JobApplication, Lead, Notice, Project,
+    ProjectCategory, ProjectImage, Service, ServiceCategory, SiteConfig, Task, TeamMember, allocate_slug,
+)
+from . import gallery
+from .caching import GENERATION_KEY, bump_generation, get_generations
+from .counters import _flush_forever, flush_view_counts, record_view
+from .images import build_derivatives, derivative_formats
+from .intake import notify_submission, store_intake_file
+from .serializers import BlogPostSerializer
+from .tasks import claim_next, heartbeat, requeue_stale, run_pending, run_task, task
+from .video import process_banner_video
+from .views import DashboardStatsView, HomeView
+
+ROWS = 12  # more than a page, so list endpoints are measured at full page size
+# Tests that write files use these instead of the project's media/ and upload staging directory
+TEST_FILES = tempfile.mkdtemp(prefix="cmspro-test-")
+TEST_MEDIA_ROOT = os.path.join(TEST_FILES, "media")
+TEST_UPLOAD_TEMP_DIR = os.path.join(TEST_FILES, "uploads")
+temporary_files = override_settings(MEDIA_ROOT=TEST_MEDIA_ROOT, UPLOAD_TEMP_DIR=TEST_UPLOAD_TEMP_DIR)
+
+
+def tearDownModule():
+    shutil.rmtree(TEST_FILES, ignore_errors=True)
+
+
+def add_derivative(instance, field_name):
+    source = getattr(instance, field_name).name
+    ImageDerivative.objects.create(
+        content_type=ContentType.objects.get_for_model(instance), object_id=instance.pk,
+        field_name=field_name, source=source, file=f"{source}.320w.webp", format="webp", width=320, height=240,
+    )
+
+
+@override_settings(VIEW_COUNT_FLUSH_INTERVAL=0)
+class QueryBudgetTests(TestCase):
+    """
+    Every read endpoint stays within the ``query_budgets`` declared on its
+    view, however many rows (and nested rows) it serializes.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("admin", "admin@example.com", "password")
+        project_categories = [ProjectCategory.objects.create(name=f"Project category {i}") for i in range(3)]
+        blog_categories = [BlogCategory.objects.create(name=f"Blog category {i}") for i in range(3)]
+        service_categories = [ServiceCategory.objects.create(name=f"Service category {i}") for i in range(3)]
+        deadline = timezone.now().date() + timedelta(days=30)
+        Banner.objects.create(title="Welcome")
+        config = SiteConfig.objects.create(
+            company_name="Example", address="Street 1", phone="123", email="info@example.com", logo="site_logos/logo.png",
+        )
+        add_derivative(config, "logo")
+        about = About.objects.create(title="About", content="Who we are", image="about/images/team.jpg")
+        add_derivative(about, "image")
+        for i in range(ROWS):
+            project = Project.objects.create(
+                title=f"Project {i}", status="completed", cover_image=f"projects/cover-{i}.jpg",
+                category=project_categories[i % 3],
+            )
+            add_derivative(project, "cover_image")
+            for order in range(3):
+                image = ProjectImage.objects.create(
+                    project=project, image=f"projects/gallery/{i}-{order}.jpg", order=2 - order,
+                )
+                add_derivative(image, "image")
+            post = BlogPost.objects.create(
+                title=f"Post {i}", content="Some *markdown*", status="published",
+                featured_image=f"blog/featured/{i}.jpg", category=blog_categories[i % 3],
+            )
+            add_derivative(post, "featured_image")
+            service = Service.objects.create(
+                title=f"Service {i}", content="Some *markdown*", status="published",
+                featured_image=f"services/{i}.jpg", category=service_categories[i % 3],
+            )
+            add_derivative(service, "featured_image")
+            member = TeamMember.objects.create(name=f"Member {i}", position="Engineer", photo=f"team/{i}.jpg")
+            add_derivative(member, "photo")
+            client = Client.objects.create(name=f"Client {i}", logo=f"clients/{i}.png")
+            add_derivative(client, "logo")
+            career = Career.objects.create(
+                title=f"Career {i}", location="Remote", requirements="- Python", status="active",
+                application_deadline=deadline,
+            )
+            Notice.objects.create(
+                title=f"Notice {i}", content="Some *markdown*", status="published", notice_date=timezone.now().date(),
+            )
+            Lead.objects.create(name=f"Lead {i}", email=f"lead{i}@example.com", message="Hello")
+            JobApplication.objects.create(
+                career=career, full_name=f"Applicant {i}", email=f"applicant{i}@example.com",
+                phone="123", cover_letter="Hi", resume=f"applications/resumes/{i}.pdf",
+            )
+        cls.project = Project.objects.first()
+        cls.post = BlogPost.objects.first()
+        cls.service = Service.objects.first()
+        cls.career = Career.objects.first()
+        cls.application = JobApplication.objects.first()
+
+    def setUp(self):
+        cache.clear()
+        # Content types are cached per process: measure the steady state
+        ContentType.objects.get_for_models(*apps.get_app_config("content").get_models())
+        self.client = APIClient()
+
+    def endpoints(self):
+        """``(view, endpoint, url, as admin)`` for every budgeted endpoint."""
+        views = dict((prefix, viewset) for prefix, viewset, _ in router.registry)
+        return [
+            (views["about"], "list", "/api/about/", False),
+            (views["site-config"], "list", "/api/site-config/", False),
+            (views["projects"], "list", "/api/projects/", False),
+            (views["projects"], "retrieve", f"/api/projects/{self.project.pk}/", False),
+            (views["projects"], "completed", "/api/projects/completed/", False),
+            (views["projects"], "by_slug", f"/api/projects/slug/{self.project.slug}/", False),
+            (views["blog-posts"], "list", "/api/blog-posts/", False),
+            (views["blog-posts"], "retrieve", f"/api/blog-posts/{self.post.pk}/", False),
+            (views["blog-posts"], "published", "/api/blog-posts/published/", False),
+            (views["blog-posts"], "by_slug", f"/api/blog-posts/slug/{self.post.slug}/", False),
+            (views["services"], "list", "/api/services/", False),
+            (views["services"], "retrieve", f"/api/services/{self.service.pk}/", False),
+            (views["services"], "by_slug", f"/api/services/slug/{self.service.slug}/", False),
+            (views["project-categories"], "list", "/api/project-categories/", False),
+            (views["blog-categories"], "list", "/api/blog-categories/", False),
+            (views["service-categories"], "list", "/api/service-categories/", False),
+            (views["team-members"], "list", "/api/team-members/", False),
+            (views["clients"], "list", "/api/clients/", False),
+            (views["careers"], "list", "/api/careers/", True),
+            (views["careers"], "active", "/api/careers/active/", False),
+            (views["careers"], "by_slug", f"/api/careers/slug/{self.career.slug}/", False),
+            (views["notices"], "list", "/api/notices/", True),
+            (views["notices"], "published", "/api/notices/published/", False),
+            (views["leads"], "list", "/api/leads/", True),
+            (views["job-applications"], "list", "/api/job-applications/", True),
+            (views["job-applications"], "retrieve", f"/api/job-applications/{self.application.pk}/", True),
+            (views["job-applications"], "by_career", f"/api/job-applications/by-career/{self.career.pk}/", True),
+            (HomeView, "get", "/api/home/", False),
+            (DashboardStatsView, "get", "/api/dashboard/stats/", True),
+        ]
+
+    def test_endpoints_stay_within_budget(self):
+        for view, endpoint, url, as_admin in self.endpoints():
+            with self.subTest(url=url):
+                self.client.force_authenticate(self.admin if as_admin else None)
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                budget = view.query_budgets[endpoint]
+                self.assertLessEqual(
+                    len(queries), budget,
+                    f"{url} ran {len(queries)} queries (budget {budget}):\n"
+                    + "\n".join(query["sql"] for query in queries.captured_queries),
+                )
+
+    def test_every_budget_is_tested(self):
+        tested = {(view, endpoint) for view, endpoint, _, _ in self.endpoints()}
+        for view in {view for view, _, _, _ in self.endpoints()}:
+            for endpoint in view.query_budgets:
+                self.assertIn((view, endpoint), tested, f"{view.__name__}.{endpoint} has an untested budget")
+
+    def test_dashboard_stats(self):
+        self.client.force_authenticate(self.admin)
+        stats = self.client.get("/api/dashboard/stats/").data
+        self.assertEqual(stats["blog_posts"]["published"], ROWS)
+        self.assertEqual(stats["projects"]["completed"], ROWS)
+        self.assertEqual(stats["leads"]["unread"], ROWS)
+        self.assertEqual(stats["careers"]["active"], ROWS)
+        self.assertEqual(stats["applications"]["pending"], ROWS)
+        self.assertEqual([career["pending"] for career in stats["applications"]["by_career"]], [1] * ROWS)
+        self.assertEqual(len(stats["series"]["leads"]), stats["series"]["days"])
+        self.assertEqual(stats["series"]["applications"][-1], {"date": timezone.localdate().isoformat(), "count": ROWS})
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get("/api/dashboard/stats/")
+        self.assertEqual(len(queries), 0)
+        Lead.objects.create(name="New lead", email="new@example.com", message="Hello")
+        self.assertEqual(self.client.get("/api/dashboard/stats/").data["leads"]["unread"], ROWS + 1)
+        self.client.post("/api/leads/mark-read/")
+        self.assertEqual(self.client.get("/api/dashboard/stats/").data["leads"]["unread"], 0)
+        self.client.force_authenticate(None)
+        self.assertIn(self.client.get("/api/dashboard/stats/").status_code, (401, 403))
+
+    def test_project_images_are_ordered(self):
+        response = self.client.get(f"/api/projects/{self.project.pk}/")
+        self.assertEqual([image["order"] for image in response.data["images"]], [0, 1, 2])
+
+
+class PaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("admin", "admin@example.com", "password")
+        now = timezone.now()
+        for i in range(25):
+            # Drafts have no published_at; the rest share a few dates, and so do created_at
+            post = BlogPost.objects.create(title=f"Post {i}", content="Body", status="draft" if i % 5 == 0 else "published")
+            BlogPost.objects.filter(pk=post.pk).update(
+                published_at=None if i % 5 == 0 else now - timedelta(days=i % 3),
+                created_at=now - timedelta(hours=i % 4),
+                view_count=i % 7,
+            )
+        posts = list(BlogPost.objects.all())
+        # NULLs sort as the largest value: first when descending
+        cls.expected = [
+            post.pk for post in sorted(posts, key=lambda post: (
+                post.published_at is not None, -(post.published_at or now).timestamp(), -post.created_at.timestamp(), post.pk,
+            ))
+        ]
+        cls.by_views = [post.pk for post in sorted(posts, key=lambda post: (-post.view_count, post.pk))]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def follow(self, url, link="next"):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids += [item["id"] for item in response.data["results"]]
+            url = response.data[link]
+        return ids
+
+    def test_page_numbers_and_cursors_agree(self):
+        self.assertEqual(self.follow("/api/blog-posts/"), self.expected)
+        self.assertEqual(self.follow("/api/blog-posts/?cursor="), self.expected)
+
+        last = self.client.get("/api/blog-posts/?cursor=")
+        while last.data["next"]:
+            last = self.client.get(last.data["next"])
+        backwards = self.follow(last.data["previous"], link="previous")
+        expected_backwards = []
+        for start in range(0, len(self.expected) - len(last.data["results"]), 10):
+            expected_backwards = self.expected[start:start + 10] + expected_backwards
+        self.assertEqual(backwards, expected_backwards)
+
+    def test_cursor_honours_ordering(self):
+        self.assertEqual(self.follow("/api/blog-posts/?ordering=-view_count"), self.by_views)
+        self.assertEqual(self.follow("/api/blog-posts/?ordering=-view_count&cursor="), self.by_views)
+
+        cursor = self.client.get("/api/blog-posts/?cursor=").data["next"].split("cursor=")[1]
+        self.assertEqual(self.client.get(f"/api/blog-posts/?ordering=-view_count&cursor={cursor}").status_code, 404)
+
+    def test_cursor_with_wrongly_typed_values_is_rejected(self):
+        cursor = self.client.get("/api/blog-posts/?cursor=").data["next"].split("cursor=")[1]
+        payload = json.loads(base64.urlsafe_b64decode(unquote(cursor)))
+        for values in (["garbage", "garbage", 1], [None, None, "abc"]):
+            with self.subTest(values=values):
+                forged = base64.urlsafe_b64encode(json.dumps({**payload, "v": values}).encode()).decode()
+                response = self.client.get("/api/blog-posts/", {"cursor": forged})
+                self.assertEqual(response.status_code, 404)
+
+
+class UniqueSlugTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("admin", "admin@example.com", "password")
+
+    def test_slug_taken_by_a_concurrent_save_is_reallocated(self):
+        BlogPost.objects.create(title="Launch", content="Body")
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        # The other request allocated "launch" too, and committed first
+        stale = iter(["launch"])
+        with mock.patch("content.models.allocate_slug", side_effect=lambda instance, base: next(stale, None) or allocate_slug(instance, base)):
+            response = client.post("/api/blog-posts/", {"title": "Launch!", "content": "Body", "status": "draft"}, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["slug"], "launch-1")
+
+    def test_free_base_slug_is_used_even_if_suffixed_ones_exist(self):
+        BlogPost.objects.create(title="Python 3", content="Body")
+        self.assertEqual(BlogPost.objects.create(title="Python", content="Body").slug, "python")
+        self.assertEqual(BlogPost.objects.create(title="Python!", content="Body").slug, "python-4")
+
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        response = client.post("/api/blog-posts/bulk/", [
+            {"title": "Django 5", "content": "Body", "status": "draft"},
+            {"title": "Django", "content": "Body", "status": "draft"},
+            {"title": "Django?", "content": "Body", "status": "draft"},
+        ], format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([item["slug"] for item in response.data], ["django-5", "django", "django-6"])
+
+    def test_other_integrity_errors_are_raised(self):
+        BlogPost.objects.create(title="Launch", content="Body")
+        with self.assertRaises(IntegrityError):
+            BlogPost.objects.create(title="Launch", content="Body")  # title is unique too
+
+
+class MarkdownRenderingTests(TestCase):
+    source = "\n".join([
+        "# Title",
+        "## Section",
+        "",
+        "- one",
+        "- two",
+        "",
+        "Some `inline` code and a [link](https://example.com/docs).",
+        "",
+        "    block = 1",
+        "",
+        '<script>alert("x")</script>',
+        "[bad](javascript:alert(1))",
+        '<a href="javascript:alert(2)" onclick="steal()">click</a>',
+        '<img src="/logo.png" onerror="steal()" alt="Logo">',
+    ])
+
+    def test_save_renders_sanitized_html(self):
+        post = BlogPost.objects.create(title="Markdown", content=self.source, status="published")
+        rendered = post.content_html
+        for markup in ('<h1 id="title">Title</h1>', '<h2 id="section">Section</h2>', "<li>one</li>", "<code>inline</code>",
+                       "<pre><code>block = 1", '<a href="https://example.com/docs"', '<img src="/logo.png" alt="Logo">'):
+            self.assertIn(markup, rendered)
+        for unsafe in ("<script", "javascript:", "onclick", "onerror"):
+            self.assertNotIn(unsafe, rendered)
+        self.assertEqual([entry["title"] for entry in post.content_toc], ["Title", "Section"])
+
+        post.content = "Plain *emphasis* <b onmouseover=\"steal()\">bold</b>"
+        post.save(update_fields=["content"])
+        post.refresh_from_db()
+        self.assertEqual(post.content_html, "<p>Plain <em>emphasis</em> <b>bold</b></p>")
+        self.assertEqual(post.plain_excerpt, "Plain emphasis bold")
+
+
+@override_settings(SERVER_SIDE_RENDERING=True)
+class ServerRenderedPageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.post = BlogPost.objects.create(
+            title="Green roofs", content="## Why\n\nPlants *cool* the building.", status="published",
+            meta_description="Roofs covered in plants",
+        )
+        cls.draft = BlogPost.objects.create(title="Unfinished", content="Body", status="draft")
+        cls.service = Service.objects.create(title="Renovation", excerpt="Old houses made new", content="Body", status="published")
+        cls.career = Career.objects.create(
+            title="Site engineer", location="Oslo", requirements="- Degree", short_description="Run our sites", status="active",
+        )
+        cls.closed = Career.objects.create(title="Foreman", location="Oslo", requirements="- Years", status="closed")
+
+    def setUp(self):
+        cache.clear()
+
+    def test_published_pages_render_their_content_and_meta_tags(self):
+        pages = (
+            (f"/blog-detail.html?slug={self.post.slug}", ("<title>Green roofs - BUILDSTATE</title>",
+             '<meta content="Roofs covered in plants" name="description">', '<h2 id="why">Why</h2>', "<em>cool</em>")),
+            (f"/services/{self.service.slug}/", ('<title id="page-title">Renovation - BUILDSTATE</title>',
+             '<meta content="Old houses made new" name="description" id="page-description">')),
+            (f"/careers/{self.career.slug}/", ("Site engineer - BUILDSTATE Careers", '<meta content="Run our sites" name="description" />',
+             "<li>Degree</li>")),
+        )
+        for url, markup in pages:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, 'id="initial-data"')
+                for fragment in markup:
+                    self.assertContains(response, fragment, html=False)
+
+    def test_unpublished_and_unknown_slugs_are_not_found(self):
+        for url in (f"/blog-detail.html?slug={self.draft.slug}", "/blog-detail.html?slug=missing",
+                    f"/careers/{self.closed.slug}/", "/services/missing/"):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class SearchTests(TestCase):
+    def search(self, terms):
+        response = APIClient().get("/api/blog-posts/", {"search": terms})
+        return [item["id"] for item in response.data["results"]]
+
+    def test_index_follows_inserts_and_updates(self):
+        post = BlogPost.objects.create(title="Solar roofs", content="Panels on every house", status="published")
+        self.assertEqual(self.search("panels"), [post.pk])
+        post.content = "Batteries in every garage"
+        post.save()
+        cache.clear()
+        self.assertEqual(self.search("panels"), [])
+        self.assertEqual(self.search("batteries"), [post.pk])
+
+    def test_snippet_escapes_the_source_text(self):
+        BlogPost.objects.create(
+            title="Markup", content="Solar <script>alert(1)</script> & panels on <b>every</b> roof", status="published",
+        )
+        response = APIClient().get("/api/blog-posts/", {"search": "panels"})
+        snippet = response.data["results"][0]["search_snippet"]
+        self.assertIn("<mark>panels</mark>", snippet)
+        self.assertIn("&amp;", snippet)
+        # PostgreSQL drops the tags from headlines, SQLite keeps them escaped
+        self.assertNotRegex(snippet.replace("<mark>", "").replace("</mark>", ""), "[<>]")
+
+    def test_source_columns_can_be_altered(self):
+        if connection.vendor != "postgresql":
+            self.skipTest("The search vector is a trigger-maintained column on PostgreSQL only")
+        with connection.cursor() as cursor:
+            # What an AlterField on title runs; a generated column would block it
+            cursor.execute("ALTER TABLE content_blogpost ALTER COLUMN title TYPE varchar(400)")
+        post = BlogPost.objects.create(title="Heat pumps", content="Efficient heating", status="published")
+        self.assertEqual(self.search("heat"), [post.pk])
+
+
+class ResponseCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("admin", "admin@example.com", "password")
+        cls.category = ProjectCategory.objects.create(name="Houses")
+        cls.project = Project.objects.create(title="Villa", status="completed", category=cls.category)
+        cls.image = ProjectImage.objects.create(project=cls.project, image="projects/gallery/1.jpg")
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def get(self, url="/api/projects/", **headers):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, headers=headers)
+        return response, len(queries)
+
+    def assertCached(self, url="/api/projects/"):
+        response, queries = self.get(url)
+        self.assertEqual(queries, 0)
+        return response
+
+    def assertRebuilt(self, url="/api/projects/"):
+        response, queries = self.get(url)
+        self.assertGreater(queries, 0)
+        return response
+
+    def test_changes_to_the_model_and_related_models_invalidate(self):
+        self.assertRebuilt()
+        response = self.assertCached()
+        self.assertEqual(self.get(If_None_Match=response["ETag"])[0].status_code, 304)
+
+        self.project.title = "Chalet"
+        self.project.save()
+        self.assertEqual(self.assertRebuilt().data["results"][0]["title"], "Chalet")
+        self.assertCached()
+
+        self.category.name = "Cabins"
+        self.category.save()
+        self.assertEqual(self.assertRebuilt().data["results"][0]["category"]["name"], "Cabins")
+
+        self.image.delete()
+        self.assertEqual(self.assertRebuilt().data["results"][0]["images"], [])
+
+        self.project.delete()
+        self.assertEqual(self.assertRebuilt().data["results"], [])
+
+    def test_singleton_reads_are_revalidated(self):
+        config = SiteConfig.get_config()
+        Banner.objects.create(title="Welcome")
+        About.objects.create(title="About us", content="Body", is_published=True)
+        for url in ("/api/site-config/", "/api/site-config/active/", "/api/banners/singleton/", "/api/banners/active/", "/api/about/"):
+            with self.subTest(url=url):
+                response = self.get(url)[0]  # the singletons may come from process memory
+                self.assertEqual(response.status_code, 200)
+                self.assertIn("Last-Modified", response)
+                self.assertEqual(self.assertCached(url)["ETag"], response["ETag"])
+                not_modified, queries = self.get(url, If_None_Match=response["ETag"])
+                self.assertEqual((not_modified.status_code, queries), (304, 0))
+
+        etag = self.get("/api/site-config/")[0]["ETag"]
+        config.company_name = "Renamed"
+        config.save()
+        response = self.get("/api/site-config/", If_None_Match=etag)[0]
+        self.assertEqual((response.status_code, response.data["company_name"]), (200, "Renamed"))
+
+    def test_authenticated_requests_bypass_the_cache(self):
+        self.assertRebuilt()
+        self.assertCached()
+        self.client.force_authenticate(self.admin)
+        for _ in range(2):
+            response = self.assertRebuilt()
+            self.assertNotIn("ETag", response)
+
+    def test_view_count_saves_keep_the_generation(self):
+        post = BlogPost.objects.create(title="Post", content="Body", status="published")
+        before = get_generations([BlogPost])
+        post.view_count += 1
+        post.save(update_fields=["view_count"])
+        self.assertEqual(get_generations([BlogPost]), before)
+        post.save(update_fields=["view_count", "title"])
+        self.assertNotEqual(get_generations([BlogPost]), before)
+
+
+@override_settings(VIEW_COUNT_FLUSH_INTERVAL=60)
+class ViewCounterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.posts = [
+            BlogPost.objects.create(title=f"Post {i}", content="Body", status="published") for i in range(2)
+        ]
+        cls.service = Service.objects.create(title="Service", content="Body", status="published")
+
+    def setUp(self):
+        flush_view_counts()  # start from an empty buffer
+
+    def view_counts(self):
+        return [BlogPost.objects.get(pk=post.pk).view_count for post in self.posts] + [
+            Service.objects.get(pk=self.service.pk).view_count
+        ]
+
+    def test_views_are_buffered_then_flushed(self):
+        with mock.patch("content.counters.threading.Thread") as thread, mock.patch("content.counters._flusher_pid", None):
+            for model, pk in ((BlogPost, self.posts[0].pk), (BlogPost, self.posts[0].pk), (BlogPost, self.posts[1].pk), (Service, self.service.pk)):
+                record_view(model, pk)
+        thread.return_value.start.assert_called_once()  # one flusher per process
+        self.assertEqual(self.view_counts(), [0, 0, 0])
+
+        with self.assertNumQueries(2):  # one UPDATE per model
+            self.assertEqual(flush_view_counts(), 4)
+        self.assertEqual(self.view_counts(), [2, 1, 1])
+        self.assertEqual(flush_view_counts(), 0)
+
+    def test_flusher_writes_every_interval(self):
+        with mock.patch("content.counters._ensure_flusher"):
+            record_view(BlogPost, self.posts[0].pk)
+        with mock.patch("content.counters.time.sleep", side_effect=[None, SystemExit]) as sleep, \
+                mock.patch("content.counters.close_old_connections") as close_old_connections:
+            with self.assertRaises(SystemExit):
+                _flush_forever()
+        sleep.assert_called_with(60)
+        close_old_connections.assert_called_once()
+        self.assertEqual(self.view_counts(), [1, 0, 0])
+
+    def test_failed_flush_keeps_the_views(self):
+        with mock.patch("content.counters._ensure_flusher"):
+            record_view(BlogPost, self.posts[0].pk)
+        with mock.patch("django.db.models.query.QuerySet.update", side_effect=DatabaseError), self.assertLogs("content.counters"):
+            self.assertEqual(flush_view_counts(), 0)
+        self.assertEqual(flush_view_counts(), 1)
+        self.assertEqual(self.view_counts(), [1, 0, 0])
+
+    @override_settings(VIEW_COUNT_FLUSH_INTERVAL=0)
+    def test_revalidated_visits_are_counted(self):
+        cache.clear()
+        client = APIClient()
+        for url, model in ((f"/api/blog-posts/slug/{self.posts[0].slug}/", BlogPost), (f"/api/services/slug/{self.service.slug}/", Service)):
+            with self.subTest(url=url):
+                etag = client.get(url)["ETag"]
+                response = client.get(url, headers={"If-None-Match": etag})
+                self.assertEqual(response.status_code, 304)
+                # The entry evicted: the handler runs again to find the row
+                with mock.patch("content.caching.cache", wraps=cache) as shared:
+                    shared.get.side_effect = lambda key, *args: None if key.startswith("content:resp:") else cache.get(key, *args)
+                    self.assertEqual(client.get(url, headers={"If-None-Match": etag}).status_code, 304)
+        self.assertEqual(self.view_counts(), [3, 0, 3])
+
+
+@override_settings(SINGLETON_CACHE_TTL=3600)
+class ProcessLocalSingletonTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        bump_generation(SiteConfig, Banner)  # also drops this process's copies
+
+    def test_save_and_delete_invalidate_the_process_copy(self):
+        config = SiteConfig.get_cached_config()
+        with self.assertNumQueries(0):
+            self.assertIs(SiteConfig.get_cached_config(), config)
+        edited = SiteConfig.objects.get(pk=config.pk)
+        edited.company_name = "Renamed"
+        edited.save()
+        self.assertEqual(SiteConfig.get_cached_config().company_name, "Renamed")
+
+        self.assertIsNone(Banner.get_cached())
+        banner = Banner.objects.create(title="Welcome")
+        self.assertEqual(Banner.get_cached().title, "Welcome")
+        banner.title = "Hello"
+        banner.save()
+        self.assertEqual(Banner.get_cached().title, "Hello")
+        banner.delete()
+        self.assertIsNone(Banner.get_cached())
+
+    def test_edits_by_other_processes_are_seen_after_the_ttl(self):
+        Banner.objects.create(title="Welcome")
+        self.assertEqual(Banner.get_cached().title, "Welcome")
+        # Another worker's edit: the row and the shared stamp change, this copy is not cleared
+        Banner.objects.update(title="Hello")
+        cache.set(GENERATION_KEY.format("content.banner"), 1, timeout=None)
+        self.assertEqual(Banner.get_cached().title, "Welcome")
+        with override_settings(SINGLETON_CACHE_TTL=0):
+            self.assertEqual(Banner.get_cached().title, "Hello")
+
+
+class SparseFieldsetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.post = BlogPost.objects.create(title="Post", content="# Heading\n\nA long *markdown* body.", status="published")
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def get_item(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        data = response.data
+        item = data["results"][0] if isinstance(data, dict) and "results" in data else data[0] if isinstance(data, list) else data
+        selects = [query["sql"] for query in queries.captured_queries if 'FROM "content_blogpost"' in query["sql"]]
+        return item, "\n".join(selects)
+
+    def test_lists_default_to_the_summary(self):
+        for url in ("/api/blog-posts/", "/api/blog-posts/published/"):
+            with self.subTest(url=url):
+                item, sql = self.get_item(url)
+                self.assertEqual(set(item) - {"featured_image_srcset", "thumbnail_srcset"}, set(BlogPostSerializer.Meta.summary_fields))
+                # The excerpt falls back to the one derived from the markdown
+                self.assertEqual(item["excerpt"], self.post.plain_excerpt)
+                self.assertNotIn('"content_blogpost"."content"', sql)
+
+    def test_fields_and_omit(self):
+        item, sql = self.get_item("/api/blog-posts/?fields=id,title,content,unknown")
+        self.assertEqual(set(item), {"id", "title", "content"})
+        self.assertIn('"content_blogpost"."content"', sql)
+
+        item, sql = self.get_item(f"/api/blog-posts/{self.post.pk}/?omit=content,meta_keywords")
+        self.assertNotIn("content", item)
+        self.assertNotIn("meta_keywords", item)
+        self.assertIn("og_title", item)
+        self.assertNotIn('"content_blogpost"."content"', sql)
+
+        item, _ = self.get_item("/api/blog-posts/?fields=id,content&render=html")
+        self.assertEqual(set(item), {"id", "content_html", "content_toc", "plain_excerpt"})
+
+    @override_settings(VIEW_COUNT_FLUSH_INTERVAL=0)
+    def test_by_slug_counts_views_without_id(self):
+        service = Service.objects.create(title="Service", content="Body", status="published")
+        career = Career.objects.create(title="Career", location="Remote", requirements="- Python", status="active")
+        for instance, url in (
+            (self.post, f"/api/blog-posts/slug/{self.post.slug}/"),
+            (service, f"/api/services/slug/{service.slug}/"),
+            (career, f"/api/careers/slug/{career.slug}/"),
+        ):
+            with self.subTest(url=url):
+                for query in ("?fields=title", "?fields=title", "?omit=id"):  # miss, cached hit, other fields
+                    response = self.client.get(url + query)
+                    self.assertEqual(response.status_code, 200)
+                    self.assertNotIn("id", response.data)
+                instance.refresh_from_db()
+                self.assertEqual(instance.view_count, 3)
+
+
+@temporary_files
+@override_settings(MEDIA_SENDFILE="")
+class MediaServingTests(TestCase):
+    body = bytes(range(256)) * 4  # 1024 bytes
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("admin", "admin@example.com", "password")
+
+    def setUp(self):
+        for name in ("projects/plan.bin", "applications/resumes/cv.pdf"):
+            path = f"{TEST_MEDIA_ROOT}/{name}"
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as fh:
+                fh.write(self.body)
+
+    def get(self, path="projects/plan.bin", **headers):
+        response = self.client.get(f"/media/{path}", headers=headers)
+        # The test client closes a streamed file once it has been read
+        content = b"".join(response.streaming_content) if response.streaming else response.content
+        return response, content
+
+    def test_private_files_need_an_admin(self):
+        for path in ("applications/resumes/cv.pdf", "applications/resumes/missing.pdf", "../cmspro/settings.py"):
+            self.assertEqual(self.get(path)[0].status_code, 404)
+        self.client.force_login(self.admin)
+        response, content = self.get("applications/resumes/cv.pdf")
+        self.assertEqual((response.status_code, content), (200, self.body))
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+
+    def test_ranges(self):
+        response, content = self.get()
+        self.assertEqual((response.status_code, content), (200, self.body))
+        self.assertEqual(self.get(If_None_Match=response["ETag"])[0].status_code, 304)
+
+        for header, start, end in (("bytes=0-", 0, 1023), ("bytes=100-199", 100, 199), ("bytes=-100", 924, 1023),
+                                   ("bytes=1000-5000", 1000, 1023), ("bytes=-5000", 0, 1023)):
+            with self.subTest(range=header):
+                response, content = self.get(Range=header)
+                self.assertEqual(response.status_code, 206)
+                self.assertEqual(response["Content-Range"], f"bytes {start}-{end}/1024")
+                self.assertEqual(content, self.body[start:end + 1])
+
+        # Several ranges, or a header we do not understand: the whole file
+        for header in ("bytes=0-1,5-6", "items=0-5", "bytes=-"):
+            with self.subTest(range=header):
+                response, content = self.get(Range=header)
+                self.assertEqual((response.status_code, content), (200, self.body))
+
+        for header in ("bytes=1024-", "bytes=-0", "bytes=10-5"):
+            with self.subTest(range=header):
+                response, _ = self.get(Range=header)
+                self.assertEqual(response.status_code, 416)
+                self.assertEqual(response["Content-Range"], "bytes */1024")
+
+    def test_if_range(self):
+        etag, last_modified = (self.get()[0][name] for name in ("ETag", "Last-Modified"))
+        for validator, status_code in ((etag, 206), (last_modified, 206), ('"stale"', 200), ("Thu, 01 Jan 2015 00:00:00 GMT", 200)):
+            with self.subTest(if_range=validator):
+                response, content = self.get(Range="bytes=0-9", If_Range=validator)
+                self.assertEqual(response.status_code, status_code)
+                self.assertEqual(content, self.body[:10] if status_code == 206 else self.body)
+
+    @override_settings(MEDIA_SENDFILE="x-accel-redirect", MEDIA_ACCEL_REDIRECT_PREFIX="/protected-media/")
+    def test_x_accel_redirect(self):
+        response, content = self.get(Range="bytes=0-9")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Accel-Redirect"], "/protected-media/projects/plan.bin")
+        self.assertEqual(content, b"")
+        self.assertEqual(self.get("applications/resumes/cv.pdf")[0].status_code, 404)
+
+
+@temporary_files
+@override_settings(TASK_QUEUE_EAGER=False)
+class ImageDerivativeTests(TestCase):
+    def png(self, name, size=(700, 350)):
+        buffer = BytesIO()
+        Image.new("RGB", size, "teal").save(buffer, "PNG")
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+    def test_saving_an_image_builds_and_exposes_derivatives(self):
+        post = BlogPost.objects.create(title="Pictures", content="Body", status="published", featured_image=self.png("cover.png"))
+        task_row = Task.objects.get()
+        self.assertEqual(task_row.name, build_derivatives.task_name)
+        self.assertEqual(task_row.args, ["content.BlogPost", post.pk, ["featured_image"]])
+
+        run_pending()
+        formats = derivative_formats()
+        derivatives = ImageDerivative.objects.filter(object_id=post.pk, field_name="featured_image")
+        self.assertEqual(
+            sorted(derivatives.values_list("width", "height", "format")),
+            sorted((width, width // 2, fmt) for width in (320, 640, 700) for fmt in formats),
+        )
+        self.assertTrue(all(derivative.source == post.featured_image.name for derivative in derivatives))
+
+        response = APIClient().get(f"/api/blog-posts/slug/{post.slug}/")
+        srcset = response.data["featured_image_srcset"]
+        self.assertEqual(sorted(srcset), sorted(formats))
+        self.assertRegex(srcset["webp"], r"^http://testserver/media/blog/\S+\.320w\.webp 320w, \S+\.640w\.webp 640w, \S+\.700w\.webp 700w$")
+
+        # Saves that leave the file alone queue nothing
+        post.title = "Renamed pictures"
+        post.save()
+        self.assertFalse(Task.objects.filter(status=Task.QUEUED).exists())
+
+
+class BulkWriteTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("admin", "admin@example.com", "password")
+        category = ServiceCategory.objects.create(name="Category")
+        # One with and one without a category: the list query LEFT JOINs it
+        cls.services = [
+            Service.objects.create(title="With category", content="Body", status="published", category=category),
+            Service.objects.create(title="Without category", content="Body", status="draft"),
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_create_update_delete(self):
+        response = self.client.post("/api/services/bulk/", [
+            {"title": "First", "content": "Body", "status": "draft"},
+            {"title": "Second", "content": "Body", "status": "draft"},
+        ], format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([item["title"] for item in response.data], ["First", "Second"])
+
+        ids = [service.pk for service in self.services]
+        response = self.client.patch("/api/services/bulk/", [
+            {"id": ids[1], "status": "published"}, {"id": ids[0], "title": "Renamed"},
+        ], format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item["id"] for item in response.data], [ids[1], ids[0]])
+        self.assertEqual(Service.objects.get(pk=ids[0]).title, "Renamed")
+        self.assertEqual(Service.objects.get(pk=ids[1]).status, "published")
+
+        response = self.client.delete("/api/services/bulk/", {"ids": [ids[0], 0]}, format="json")
+        self.assertEqual(response.data["results"], [{"id": ids[0], "status": "deleted"}, {"id": 0, "status": "not_found"}])
+        self.assertEqual(Service.objects.count(), 3)
+
+    def test_one_invalid_item_rejects_the_batch(self):
+        ids = [service.pk for service in self.services]
+        response = self.client.patch("/api/services/bulk/", [
+            {"id": ids[0], "title": "Renamed"}, {"id": ids[1], "status": "unknown"},
+        ], format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("status", response.data[1])
+        self.assertEqual(Service.objects.get(pk=ids[0]).title, "With category")
+
+        response = self.client.patch("/api/services/bulk/", [{"id": 0, "title": "Missing"}], format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+@temporary_files
+@override_settings(
+    INTAKE_RATE_PER_IP="100/hour", INTAKE_RATE_PER_EMAIL="2/hour", INTAKE_DEDUPE_WINDOW=600, TASK_QUEUE_EAGER=False,
+)
+class IntakeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.career = Career.objects.create(title="Engineer", location="Remote", requirements="- Python", status="active")
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def apply(self, email="applicant@example.com"):
+        return self.client.post("/api/job-applications/", {
+            "career": self.career.pk, "full_name": "Applicant", "email": email, "phone": "123",
+            "cover_letter": "Hello", "resume": SimpleUploadedFile("cv.pdf", b"%PDF-1.4 resume"),
+        }, format="multipart")
+
+    def test_resume_is_stored_by_the_task_queue(self):
+        response = self.apply()
+        self.assertEqual(response.status_code, 201)
+        application = JobApplication.objects.get(pk=response.data["id"])
+        self.assertFalse(application.resume)
+        tasks = {task.name: task for task in Task.objects.all()}
+        self.assertEqual(set(tasks), {store_intake_file.task_name, notify_submission.task_name})
+        store_intake_file(*tasks[store_intake_file.task_name].args)
+        application.refresh_from_db()
+        self.assertTrue(application.resume.name.startswith("applications/resumes/cv"))
+        with application.resume.open() as resume:
+            self.assertEqual(resume.read(), b"%PDF-1.4 resume")
+        application.resume.delete(save=False)
+
+    def test_resubmission_is_acknowledged_without_the_first_row(self):
+        first = self.apply()
+        again = self.apply()
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual(again.data, {"status": "received"})
+        for field in ("id", "full_name", "email", "phone", "address", "cover_letter", "resume", "admin_notes"):
+            self.assertIn(field, first.data)
+            self.assertNotIn(field, again.data)
+        self.assertEqual(JobApplication.objects.count(), 1)
+
+    def test_throttled_per_email(self):
+        self.client.post("/api/leads/", {"name": "A", "email": "lead@example.com", "message": "One"})
+        self.client.post("/api/leads/", {"name": "A", "email": "Lead@example.com", "message": "Two"})
+        response = self.client.post("/api/leads/", {"name": "A", "email": "lead@example.com", "message": "Three"})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(Lead.objects.count(), 2)
+        response = self.client.post("/api/leads/", {"name": "B", "email": "other@example.com", "message": "One"})
+        self.assertEqual(response.status_code, 201)
+
+
+@temporary_files
+@override_settings(UPLOAD_CHUNK_SIZE=10, UPLOAD_MAX_SIZE=100, TASK_QUEUE_EAGER=False)
+class ChunkedUploadTests(TestCase):
+    data = b"0123456789abcdefghijKLMNO"  # three chunks: 10, 10 and 5 bytes
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("admin", "admin@example.com", "password")
+        cls.notice = Notice.objects.create(title="Notice", content="Body", notice_date=timezone.now().date())
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def start(self, size=len(data)):
+        return self.client.post("/api/uploads/", {
+            "target": "notice.attachment", "object_id": self.notice.pk, "filename": "../notes.txt", "size": size,
+        }, format="json")
+
+    def put(self, upload_id, index, body):
+        return self.client.put(f"/api/uploads/{upload_id}/chunks/{index}/", body, content_type="application/octet-stream")
+
+    def complete(self, upload_id, body):
+        response = self.client.post(f"/api/uploads/{upload_id}/complete/", {"sha256": hashlib.sha256(body).hexdigest()}, format="json")
+        run_pending()
+        return response, self.client.get(f"/api/uploads/{upload_id}/").data
+
+    def test_size_limit(self):
+        self.assertEqual(self.start(size=101).status_code, 400)
+        self.assertEqual(self.start(size=0).status_code, 400)
+
+    def test_chunks_in_any_order_then_complete(self):
+        upload = self.start().data
+        self.assertEqual((upload["filename"], upload["total_chunks"]), ("notes.txt", 3))
+        upload_id = upload["id"]
+
+        self.assertEqual(self.put(upload_id, 2, self.data[20:]).status_code, 200)
+        self.assertEqual(self.put(upload_id, 0, b"x" * 10).status_code, 200)
+        response = self.client.post(f"/api/uploads/{upload_id}/complete/", {"sha256": "0" * 64}, format="json")
+        self.assertEqual((response.status_code, response.data["missing_chunks"]), (400, [1]))
+
+        # Every chunk but the last is exactly chunk_size bytes, and the index must exist
+        for index, body in ((1, self.data[10:19]), (1, self.data[10:21]), (2, self.data[20:24]), (3, b"x")):
+            with self.subTest(index=index, length=len(body)):
+                self.assertEqual(self.put(upload_id, index, body).status_code, 400)
+        self.assertEqual(self.client.get(f"/api/uploads/{upload_id}/").data["received_chunks"], [0, 2])
+
+        self.put(upload_id, 1, self.data[10:20])
+        self.put(upload_id, 0, self.data[:10])  # re-sending replaces the chunk
+        response, upload = self.complete(upload_id, self.data)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(upload["status"], "complete")
+        self.notice.refresh_from_db()
+        with self.notice.attachment.open() as attachment:
+            self.assertEqual(attachment.read(), self.data)
+        self.assertFalse(os.path.exists(os.path.join(TEST_UPLOAD_TEMP_DIR, str(upload_id))))
+        self.assertEqual(self.put(upload_id, 0, self.data[:10]).status_code, 400)  # upload is complete
+
+    def test_checksum_mismatch_fails_the_upload(self):
+        upload_id = self.start().data["id"]
+        for index in range(3):
+            self.put(upload_id, index, self.data[index * 10:index * 10 + 10])
+        _, upload = self.complete(upload_id, b"something else")
+        self.assertEqual(upload["status"], "failed")
+        self.assertIn("Checksum mismatch", upload["error"])
+        self.notice.refresh_from_db()
+        self.assertFalse(self.notice.attachment)
+
+
+@temporary_files
+@override_settings(GALLERY_THREADS=2, GALLERY_MAX_DIMENSION=64, TASK_QUEUE_EAGER=False)
+class GalleryUploadTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("admin", "admin@example.com", "password")
+        cls.project = Project.objects.create(title="Gallery project")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def image(self, name, mode="RGB", size=(100, 50)):
+        buffer = BytesIO()
+        Image.new(mode, size).save(buffer, "PNG")
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+    def upload(self, *files):
+        return self.client.post(f"/api/projects/{self.project.pk}/gallery/", {"images": list(files)}, format="multipart")
+
+    def test_images_are_normalized_in_the_thread_pool(self):
+        threads = []
+
+        def normalize(*args):
+            threads.append(threading.current_thread().name)
+            return normalize_image(*args)
+
+        normalize_image = gallery.normalize_image
+        with mock.patch("content.gallery.normalize_image", normalize):
+            response = self.upload(self.image("photo.png"), self.image("logo.png", mode="RGBA", size=(20, 20)))
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(len(threads), 2)
+        self.assertTrue(all(name.startswith("gallery") for name in threads))
+
+        images = list(self.project.images.order_by("order"))
+        self.assertEqual([image.order for image in images], [0, 1])
+        self.assertTrue(images[0].image.name.endswith(".jpg"))
+        self.assertTrue(images[1].image.name.endswith(".png"))
+        with Image.open(images[0].image) as photo:
+            self.assertEqual(photo.size, (64, 32))
+
+    def test_invalid_image_rejects_the_whole_upload(self):
+        bad = SimpleUploadedFile("bad.png", b"not an image", content_type="image/png")
+        response = self.upload(self.image("photo.png"), bad)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(list(response.data["images"]), [1])
+        self.assertFalse(self.project.images.exists())
+
+
+class ApplicationTriageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("admin", "admin@example.com", "password")
+        cls.career = Career.objects.create(title="Engineer", location="Remote", requirements="- Python", status="active")
+        cls.reviewed = timezone.now() - timedelta(days=3)
+        cls.applications = [
+            JobApplication.objects.create(
+                career=cls.career, full_name=f"Applicant {i}", email=f"applicant{i}@example.com", phone="123",
+                cover_letter="Hi", resume=f"applications/resumes/{i}.pdf",
+                **({"status": "reviewing", "reviewed_at": cls.reviewed} if i % 3 == 0 else {}),
+            )
+            for i in range(ROWS)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_save_detects_the_transition_in_memory(self):
+        application = JobApplication.objects.get(pk=self.applications[1].pk)
+        application.status = "shortlisted"
+        with CaptureQueriesContext(connection) as queries:
+            application.save(update_fields=["status"])
+        self.assertEqual(len(queries), 1)
+        application.refresh_from_db()
+        self.assertIsNotNone(application.reviewed_at)
+
+    def test_triage_is_one_update(self):
+        ids = [application.pk for application in self.applications]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post("/api/job-applications/triage/", {"ids": [*ids, 0], "status": "rejected"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["status"] for row in response.data["results"]], ["updated"] * ROWS + ["not_found"])
+        self.assertEqual(sum(query["sql"].startswith("UPDATE") for query in queries), 1)
+        for application in JobApplication.objects.all():
+            self.assertEqual(application.status, "rejected")
+            if application.full_name in {f"Applicant {i}" for i in range(0, ROWS, 3)}:
+                self.assertEqual(application.reviewed_at, self.reviewed)  # reviewed earlier: kept
+            else:
+                self.assertIsNotNone(application.reviewed_at)
+                self.assertGreater(application.reviewed_at, self.reviewed)
+
+        response = self.client.post("/api/job-applications/triage/", {"ids": ids, "status": "hired"}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_by_career_is_paginated_with_status_counts(self):
+        response = self.client.get(f"/api/job-applications/by-career/{self.career.pk}/")
+        self.assertEqual(response.data["count"], ROWS)
+        self.assertEqual(len(response.data["results"]), 10)
+        response = self.client.get(f"/api/job-applications/by-career/{self.career.pk}/", {"status": "pending"})
+        self.assertEqual(response.data["count"], ROWS - ROWS // 3)
+        self.assertEqual(response.data["status_counts"]["total"], ROWS)
+        self.assertEqual(response.data["status_counts"]["reviewing"], ROWS // 3)
+        self.assertEqual(response.data["status_counts"]["pending"], ROWS - ROWS // 3)
+
+
+@task(max_attempts=3, retry_delay=10)
+def failing_task(message):
+    raise RuntimeError(message)
+
+
+@task(lock_timeout=lambda: 3600)
+def beating_task():
+    heartbeat()
+
+
+@override_settings(TASK_QUEUE_EAGER=False, TASK_LOCK_TIMEOUT=600)
+class TaskQueueTests(TestCase):
+    def test_failures_back_off_until_max_attempts(self):
+        row = failing_task.enqueue("boom")
+        for attempt, delay in ((1, 10), (2, 20)):
+            claimed = claim_next("worker")
+            self.assertEqual((claimed.pk, claimed.status, claimed.attempts), (row.pk, Task.RUNNING, attempt))
+            self.assertFalse(run_task(claimed))
+            row.refresh_from_db()
+            self.assertEqual((row.status, row.locked_by, row.locked_at), (Task.QUEUED, "", None))
+            self.assertIn("RuntimeError: boom", row.last_error)
+            self.assertAlmostEqual((row.run_after - timezone.now()).total_seconds(), delay, delta=5)
+            self.assertIsNone(claim_next("worker"))  # not due yet
+            Task.objects.filter(pk=row.pk).update(run_after=timezone.now())
+
+        self.assertFalse(run_task(claim_next("worker")))
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.attempts), (Task.FAILED, 3))
+        self.assertIsNone(claim_next("worker"))
+
+    def test_success_deletes_the_row_and_heartbeat_renews_the_lock(self):
+        row = beating_task.enqueue()
+        self.assertEqual(row.lock_timeout, 3600)
+        claimed = claim_next("worker")
+        Task.objects.filter(pk=row.pk).update(locked_at=timezone.now() - timedelta(hours=2))
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(run_task(claimed))
+        self.assertTrue(any(query["sql"].startswith("UPDATE") for query in queries))
+        self.assertFalse(Task.objects.filter(pk=row.pk).exists())
+
+    def test_requeue_stale_uses_each_task_lock_timeout(self):
+        locked_at = timezone.now() - timedelta(minutes=20)
+        running = {"status": Task.RUNNING, "locked_by": "gone:1", "locked_at": locked_at, "attempts": 1}
+        default = Task.objects.create(name=failing_task.task_name, **running)
+        long_running = Task.objects.create(name=beating_task.task_name, lock_timeout=3600, **running)
+        short = Task.objects.create(name=beating_task.task_name, lock_timeout=60, **running)
+        fresh = Task.objects.create(name=failing_task.task_name, **{**running, "locked_at": timezone.now()})
+
+        self.assertEqual(requeue_stale(), 2)
+        statuses = dict(Task.objects.values_list("pk", "status"))
+        self.assertEqual(statuses[default.pk], Task.QUEUED)
+        self.assertEqual(statuses[short.pk], Task.QUEUED)
+        self.assertEqual(statuses[long_running.pk], Task.RUNNING)
+        self.assertEqual(statuses[fresh.pk], Task.RUNNING)
+
+    @override_settings(VIDEO_PROCESSING_TIMEOUT=1800)
+    def test_video_processing_is_not_requeued_mid_transcode(self):
+        row = process_banner_video.enqueue(1, "banners/videos/intro.mp4")
+        self.assertEqual(row.lock_timeout, 1800 + 600)
+        claim_next("worker")
+        # Well past TASK_LOCK_TIMEOUT, as a single ffmpeg run may be
+        Task.objects.filter(pk=row.pk).update(locked_at=timezone.now() - timedelta(minutes=25))
+        self.assertEqual(requeue_stale(), 0)
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.locked_by), (Task.RUNNING, "worker"))
+
+        Task.objects.filter(pk=row.pk).update(locked_at=timezone.now() - timedelta(minutes=45))
+        self.assertEqual(requeue_stale(), 1)
+
+
+@override_settings(TASK_QUEUE_EAGER=False)
+class TaskClaimLockingTests(TransactionTestCase):
+    @skipUnlessDBFeature("has_select_for_update_skip_locked")
+    def test_claim_skips_rows_locked_by_another_worker(self):
+        first, second = failing_task.enqueue("first"), failing_task.enqueue("second")
+        locked, release = threading.Event(), threading.Event()
+
+        def hold_first():
+            try:
+                with transaction.atomic():
+                    Task.objects.select_for_update().get(pk=first.pk)
+                    locked.set()
+                    release.wait(10)
+            finally:
+                connection.close()
+
+        holder = threading.Thread(target=hold_first)
+        holder.start()
+        try:
+            self.assertTrue(locked.wait(10))
+            self.assertEqual(claim_next("worker").pk, second.pk)
+            self.assertIsNone(claim_next("worker"))
+        finally:
+            release.set()
+            holder.join()
+        self.assertEqual(claim_next("worker").pk, first.pk)
@@ -0,0 +1,183 @@
+"""
+Chunked, resumable uploads.
+
+Large files (banner videos, notice attachments, gallery images) are sent to
+``/api/uploads/`` in numbered chunks instead of one multipart request:
+
+1. ``POST /api/uploads/`` with the target, file name and size starts an upload.
+2. ``PUT /api/uploads/<id>/chunks/<n>/`` with the raw bytes stores chunk ``n``.
+   Sending a chunk again replaces it, so an interrupted upload resumes by
+   re-sending whatever ``GET /api/uploads/<id>/`` does not list as received.
+3. ``POST /api/uploads/<id>/complete/`` with the file's SHA-256 queues the
+   assembly; poll the upload until its status is ``complete`` or ``failed``.
+
+Chunks are streamed to ``UPLOAD_TEMP_DIR`` in small blocks, so memory use is
+bounded whatever the file size. A background task joins and verifies them
+and stores the result on the target field in a single transaction.
+"""
+import hashlib
+import logging
+import os
+import shutil
+import uuid
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files import File
+from django.db import models, transaction
+from django.utils import timezone
+from PIL import Image
+
+from .tasks import task
+
+logger = logging.getLogger(__name__)
+
+# target -> (model, file field)
+UPLOAD_TARGETS = {
+    "banner.video": ("content.Banner", "video"),
+    "notice.attachment": ("content.Notice", "attachment"),
+    "projectimage.image": ("content.ProjectImage", "image"),
+}
+
+STREAM_BLOCK_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    pass
+
+
+def upload_dir(upload):
+    return os.path.join(settings.UPLOAD_TEMP_DIR, str(upload.pk))
+
+
+def chunk_path(upload, index):
+    return os.path.join(upload_dir(upload), f"{index:06d}.part")
+
+
+def expected_chunk_size(upload, index):
+    if index == upload.total_chunks - 1:
+        return upload.size - index * upload.chunk_size
+    return upload.chunk_size
+
+
+def received_chunks(upload):
+    try:
+        names = os.listdir(upload_dir(upload))
+    except FileNotFoundError:
+        return []
+    return sorted(int(name[:-5]) for name in names if name.endswith(".part"))
+
+
+def write_chunk(upload, index, stream):
+    """
+    Stream chunk ``index`` from ``stream`` to disk.
+
+    The chunk is written under a temporary name and moved into place only
+    once it has exactly the expected length, so a broken connection never
+    leaves a partial chunk behind.
+    """
+    if not 0 <= index < upload.total_chunks:
+        raise UploadError(f"Chunk index must be between 0 and {upload.total_chunks - 1}.")
+    expected = expected_chunk_size(upload, index)
+    path = chunk_path(upload, index)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    written = 0
+    try:
+        with open(tmp_path, "wb") as fh:
+            while written <= expected:
+                block = stream.read(min(STREAM_BLOCK_SIZE, expected + 1 - written))
+                if not block:
+                    break
+                fh.write(block)
+                written += len(block)
+        if written != expected:
+            raise UploadError(f"Chunk {index} must be exactly {expected} bytes.")
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return written
+
+
+def assemble(upload):
+    """Join the chunks into one file next to them; returns its path and SHA-256."""
+    missing = sorted(set(range(upload.total_chunks)) - set(received_chunks(upload)))
+    if missing:
+        raise UploadError(f"Missing chunks: {', '.join(map(str, missing[:20]))}")
+    path = os.path.join(upload_dir(upload), "assembled")
+    digest = hashlib.sha256()
+    with open(path, "wb") as out:
+        for index in range(upload.total_chunks):
+            with open(chunk_path(upload, index), "rb") as part:
+                while block := part.read(STREAM_BLOCK_SIZE):
+                    digest.update(block)
+                    out.write(block)
+    return path, digest.hexdigest()
+
+
+def attach(upload, path):
+    """Store the file on its target field and mark the upload complete, atomically."""
+    model = upload.target_field.model
+    field_name = upload.target_field.name
+    with transaction.atomic(), open(path, "rb") as fh:
+        if upload.object_id:
+            instance = model._base_manager.select_for_update().get(pk=upload.object_id)
+        else:
+            instance = model(**upload.create_fields)
+        field_file = getattr(instance, field_name)
+        field_file.save(upload.filename, File(fh), save=False)
+        try:
+            instance.save()
+            upload.object_id = instance.pk
+            upload.status = upload.COMPLETE
+            upload.completed_at = timezone.now()
+            upload.save(update_fields=["object_id", "status", "completed_at", "updated_at"])
+        except Exception:
+            field_file.delete(save=False)
+            raise
+    return instance
+
+
+@task
+def discard_chunks(upload_id):
+    shutil.rmtree(os.path.join(settings.UPLOAD_TEMP_DIR, str(upload_id)), ignore_errors=True)
+
+
+@task(max_attempts=1)
+def finalize_upload(upload_id):
+    ChunkedUpload = apps.get_model("content", "ChunkedUpload")
+    upload = ChunkedUpload.objects.filter(pk=upload_id, status=ChunkedUpload.ASSEMBLING).first()
+    if upload is None:
+        return
+    try:
+        path, sha256 = assemble(upload)
+        if sha256 != upload.sha256:
+            raise UploadError("Checksum mismatch: the file was corrupted in transit, upload it again.")
+        if isinstance(upload.target_field, models.ImageField):
+            try:
+                with Image.open(path) as image:
+                    image.verify()
+            except Exception:
+                raise UploadError("The uploaded file is not a valid image.")
+        attach(upload, path)
+    except Exception as exc:
+        if not isinstance(exc, UploadError):
+            logger.exception("Could not finalize upload %s", upload_id)
+        ChunkedUpload.objects.filter(pk=upload_id).update(
+            status=ChunkedUpload.FAILED, error=str(exc), updated_at=timezone.now(),
+        )
+    finally:
+        discard_chunks(upload_id)
+
+
+@task
+def purge_expired_uploads():
+    """Drop uploads (and their chunks) not touched for ``UPLOAD_EXPIRY`` seconds."""
+    ChunkedUpload = apps.get_model("content", "ChunkedUpload")
+    cutoff = timezone.now() - timedelta(seconds=settings.UPLOAD_EXPIRY)
+    expired = ChunkedUpload.objects.filter(updated_at__lt=cutoff).exclude(status=ChunkedUpload.ASSEMBLING)
+    for upload_id in expired.values_list("pk", flat=True):
+        discard_chunks(upload_id)
+    expired.delete()
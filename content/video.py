@@ -0,0 +1,280 @@
+"""
+Banner video renditions.
+
+The uploaded banner video is transcoded once, by a background task queued
+when ``Banner.video`` changes, into an MP4 ladder of lower resolutions and
+bitrates plus an HLS stream built from the same encodes. When the banner has
+no poster, a compressed frame of the video becomes its poster.
+
+Everything produced is stored under ``banners/renditions/`` and recorded in
+``Banner.video_renditions``; ``BannerSerializer`` exposes it so the homepage
+can pick the cheapest stream that still fits the visitor's screen. Without
+ffmpeg on the worker the banner keeps serving the original file.
+"""
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import uuid
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files import File
+from django.db.models import Q
+
+from .caching import bump_generation
+from .images import build_derivatives
+from .tasks import delete_files, heartbeat, task
+
+logger = logging.getLogger(__name__)
+
+# (height, video kbit/s, audio kbit/s), largest first
+RENDITION_LADDER = (
+    (1080, 5000, 160),
+    (720, 2800, 128),
+    (480, 1400, 96),
+    (360, 800, 64),
+)
+
+HLS_SEGMENT_SECONDS = 6
+POSTER_MAX_WIDTH = 1920
+
+# Values of Banner.video_renditions["status"]
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+UNAVAILABLE = "unavailable"
+
+
+class VideoError(Exception):
+    pass
+
+
+def ffmpeg_available():
+    return bool(shutil.which(settings.FFMPEG_BINARY) and shutil.which(settings.FFPROBE_BINARY))
+
+
+def _run(args):
+    heartbeat()  # each run may take up to VIDEO_PROCESSING_TIMEOUT: see lock_timeout()
+    try:
+        return subprocess.run(
+            args, check=True, capture_output=True, text=True, timeout=settings.VIDEO_PROCESSING_TIMEOUT,
+        ).stdout
+    except subprocess.CalledProcessError as exc:
+        raise VideoError(exc.stderr.strip().splitlines()[-1] if exc.stderr.strip() else str(exc))
+    except subprocess.TimeoutExpired:
+        raise VideoError(f"{os.path.basename(args[0])} timed out after {settings.VIDEO_PROCESSING_TIMEOUT}s")
+
+
+def probe(path):
+    """Return ``(width, height, duration, has_audio)`` of the video at ``path``."""
+    output = _run([
+        settings.FFPROBE_BINARY, "-v", "error", "-print_format", "json",
+        "-show_format", "-show_streams", path,
+    ])
+    info = json.loads(output)
+    streams = info.get("streams", [])
+    video = next((s for s in streams if s.get("codec_type") == "video"), None)
+    if video is None:
+        raise VideoError("The file has no video stream.")
+    width, height = int(video["width"]), int(video["height"])
+    # Phone recordings store portrait video as landscape plus a rotation;
+    # ffmpeg applies it while encoding, so report the displayed size
+    rotation = video.get("tags", {}).get("rotate") or next(
+        (side.get("rotation") for side in video.get("side_data_list", []) if "rotation" in side), 0,
+    )
+    if abs(int(float(rotation))) % 180 == 90:
+        width, height = height, width
+    duration = float(info.get("format", {}).get("duration") or video.get("duration") or 0)
+    has_audio = any(s.get("codec_type") == "audio" for s in streams)
+    return width, height, duration, has_audio
+
+
+def target_ladder(source_height):
+    """Rungs of ``RENDITION_LADDER`` for a source ``source_height`` pixels tall, smallest first."""
+    # Never upscale: taller rungs collapse onto the (even) source height,
+    # keeping the bitrates of the smallest of them
+    cap = source_height - source_height % 2
+    ladder = {}
+    for height, video_kbps, audio_kbps in reversed(RENDITION_LADDER):
+        ladder.setdefault(min(height, cap), (video_kbps, audio_kbps))
+    return sorted((height, *rates) for height, rates in ladder.items())
+
+
+def encode_mp4(source, out_path, height, video_kbps, audio_kbps, has_audio):
+    args = [
+        settings.FFMPEG_BINARY, "-nostdin", "-y", "-v", "error", "-i", source,
+        "-map", "0:v:0", "-vf", f"scale=-2:{height}",
+        "-c:v", "libx264", "-preset", "veryfast", "-profile:v", "main", "-pix_fmt", "yuv420p",
+        "-b:v", f"{video_kbps}k", "-maxrate", f"{round(video_kbps * 1.07)}k", "-bufsize", f"{video_kbps * 2}k",
+        # Keyframes on a fixed 2s grid so every rung splits into aligned HLS segments
+        "-force_key_frames", "expr:gte(t,n_forced*2)",
+    ]
+    if has_audio:
+        args += ["-map", "0:a:0", "-c:a", "aac", "-b:a", f"{audio_kbps}k", "-ac", "2"]
+    args += ["-movflags", "+faststart", out_path]
+    _run(args)
+
+
+def segment_hls(mp4_path, out_dir, stem):
+    """Cut an encoded rung into HLS segments without re-encoding; returns the playlist file name."""
+    playlist = f"{stem}.m3u8"
+    _run([
+        settings.FFMPEG_BINARY, "-nostdin", "-y", "-v", "error", "-i", mp4_path,
+        "-c", "copy", "-f", "hls", "-hls_time", str(HLS_SEGMENT_SECONDS), "-hls_playlist_type", "vod",
+        "-hls_segment_filename", os.path.join(out_dir, f"{stem}_%04d.ts"),
+        os.path.join(out_dir, playlist),
+    ])
+    return playlist
+
+
+def master_playlist(variants):
+    lines = ["#EXTM3U", "#EXT-X-VERSION:3"]
+    for variant in variants:
+        lines.append(
+            f"#EXT-X-STREAM-INF:BANDWIDTH={variant['bandwidth']},"
+            f"RESOLUTION={variant['width']}x{variant['height']}"
+        )
+        lines.append(variant["playlist"])
+    return "\n".join(lines) + "\n"
+
+
+def extract_poster(source, out_path, duration):
+    # A second in skips fade-ins; very short clips use their midpoint
+    offset = min(1.0, duration / 2) if duration else 0
+    _run([
+        settings.FFMPEG_BINARY, "-nostdin", "-y", "-v", "error", "-ss", f"{offset:.2f}", "-i", source,
+        "-frames:v", "1", "-vf", f"scale='min({POSTER_MAX_WIDTH},iw)':-2", "-q:v", "4", out_path,
+    ])
+
+
+def build_renditions(source, work_dir, poster_path=None):
+    """
+    Transcode ``source`` into ``work_dir`` (and its poster to ``poster_path``).
+
+    Returns a manifest listing the MP4 rungs and the HLS master playlist by
+    their path relative to ``work_dir``.
+    """
+    width, height, duration, has_audio = probe(source)
+    mp4s, variants = [], []
+    for rung_height, video_kbps, audio_kbps in target_ladder(height):
+        stem = f"{rung_height}p"
+        mp4_path = os.path.join(work_dir, f"{stem}.mp4")
+        encode_mp4(source, mp4_path, rung_height, video_kbps, audio_kbps, has_audio)
+        rung_width, _, _, _ = probe(mp4_path)
+        bandwidth = (round(video_kbps * 1.07) + (audio_kbps if has_audio else 0)) * 1000
+        mp4s.append({"file": f"{stem}.mp4", "width": rung_width, "height": rung_height, "bitrate": bandwidth})
+        variants.append({
+            "playlist": segment_hls(mp4_path, work_dir, stem),
+            "width": rung_width, "height": rung_height, "bandwidth": bandwidth,
+        })
+    with open(os.path.join(work_dir, "master.m3u8"), "w") as fh:
+        fh.write(master_playlist(variants))
+
+    if poster_path:
+        extract_poster(source, poster_path, duration)
+    return {"width": width, "height": height, "duration": duration, "mp4": mp4s, "hls": "master.m3u8"}
+
+
+def store_directory(storage, local_dir, prefix):
+    """Save every file of ``local_dir`` under ``prefix``; returns the stored names."""
+    names = []
+    for entry in sorted(os.listdir(local_dir)):
+        heartbeat()
+        with open(os.path.join(local_dir, entry), "rb") as fh:
+            name = storage.save(f"{prefix}/{entry}", File(fh))
+        # Playlists refer to segments by name, so the storage must not rename them
+        names.append(name)
+        if name != f"{prefix}/{entry}":
+            for stored in names:
+                storage.delete(stored)
+            raise VideoError(f"Storage renamed {prefix}/{entry} to {name}")
+    return names
+
+
+def _local_copy(field_file, work_dir):
+    """Path of ``field_file`` on local disk, downloading it from remote storage if needed."""
+    try:
+        return field_file.storage.path(field_file.name)
+    except NotImplementedError:
+        path = os.path.join(work_dir, "source" + os.path.splitext(field_file.name)[1])
+        with field_file.storage.open(field_file.name, "rb") as src, open(path, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        return path
+
+
+def _record(Banner, pk, source, renditions):
+    """Store ``renditions`` unless the banner's video changed meanwhile; returns whether it did."""
+    updated = Banner.objects.filter(pk=pk, video=source).update(video_renditions=renditions)
+    bump_generation(Banner)
+    return bool(updated)
+
+
+def lock_timeout():
+    """
+    How long a transcode may go without a heartbeat before the queue takes
+    its worker for dead: one ffmpeg run, plus the default allowance for the
+    work between runs.
+    """
+    return settings.VIDEO_PROCESSING_TIMEOUT + settings.TASK_LOCK_TIMEOUT
+
+
+@task(max_attempts=2, retry_delay=60, lock_timeout=lock_timeout)
+def process_banner_video(pk, source):
+    """Build the renditions (and missing poster) of banner ``pk``'s video ``source``."""
+    Banner = apps.get_model("content", "Banner")
+    banner = Banner.objects.filter(pk=pk, video=source).first()
+    if banner is None:  # deleted, or the video was replaced before the task ran
+        return
+    if not ffmpeg_available():
+        logger.warning("ffmpeg not found, serving banner video %s as uploaded", source)
+        _record(Banner, pk, source, {"source": source, "status": UNAVAILABLE})
+        return
+
+    storage = banner.video.storage
+    prefix = f"banners/renditions/{os.path.splitext(os.path.basename(source))[0]}-{uuid.uuid4().hex[:8]}"
+    stored, poster_name = [], None
+    with tempfile.TemporaryDirectory() as work_dir:
+        out_dir = os.path.join(work_dir, "out")
+        os.mkdir(out_dir)
+        poster_path = None if banner.video_poster else os.path.join(work_dir, "poster.jpg")
+        try:
+            manifest = build_renditions(_local_copy(banner.video, work_dir), out_dir, poster_path)
+            stored = store_directory(storage, out_dir, prefix)
+            if poster_path:
+                with open(poster_path, "rb") as fh:
+                    poster_name = storage.save(
+                        f"{Banner.video_poster.field.upload_to}{os.path.basename(prefix)}.jpg", File(fh),
+                    )
+        except VideoError as exc:
+            # ffmpeg rejects the same file every time: record it rather than retry
+            logger.warning("Could not process banner video %s: %s", source, exc)
+            _record(Banner, pk, source, {"source": source, "status": FAILED, "error": str(exc)})
+            return
+        except Exception:
+            for name in stored:
+                storage.delete(name)
+            raise
+
+    renditions = {
+        "source": source,
+        "status": READY,
+        **manifest,
+        "mp4": [{**rung, "file": f"{prefix}/{rung['file']}"} for rung in manifest["mp4"]],
+        "hls": f"{prefix}/{manifest['hls']}",
+        "files": stored,
+    }
+    if poster_name:
+        # Only fill the poster if nobody uploaded one while we were encoding
+        no_poster = Q(video_poster="") | Q(video_poster__isnull=True)
+        if Banner.objects.filter(no_poster, pk=pk, video=source).update(video_poster=poster_name):
+            build_derivatives.enqueue(Banner._meta.label, pk, ["video_poster"])
+        else:
+            delete_files.enqueue([poster_name])
+    if not _record(Banner, pk, source, renditions):
+        delete_files.enqueue(stored)
+    elif (banner.video_renditions or {}).get("files"):
+        # A rebuild of the same video replaces the previous streams
+        delete_files.enqueue(banner.video_renditions["files"])
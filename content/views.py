@@ -1,10 +1,26 @@
-from rest_framework import viewsets, permissions, filters, status, parsers
+import hashlib
+from io import BytesIO
+
+from rest_framework import viewsets, mixins, permissions, filters, status, parsers
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter, OpenApiExample, OpenApiResponse, OpenApiTypes
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Prefetch, prefetch_related_objects
+from django.utils import timezone
 from django.middleware.csrf import get_token
-from .models import Banner, About, Project, Lead, ProjectCategory, BlogCategory, TeamMember, BlogPost, SiteConfig, Service, ServiceCategory, Client, Career, Notice, JobApplication
-from .serializers import BannerSerializer, AboutSerializer, ProjectSerializer, LeadSerializer, ProjectCategorySerializer, BlogCategorySerializer, TeamMemberSerializer, BlogPostSerializer, SiteConfigSerializer, ServiceSerializer, ServiceCategorySerializer, ClientSerializer, UserRegistrationSerializer, CareerSerializer, NoticeSerializer, JobApplicationSerializer
+from .models import Banner, About, Project, ProjectImage, Lead, ProjectCategory, BlogCategory, TeamMember, BlogPost, SiteConfig, Service, ServiceCategory, Client, Career, Notice, JobApplication, ChunkedUpload
+from .caching import PAGE_KEY, CachedResponseMixin, bump_generation, get_generations
+from .counters import record_view
+from .gallery import GalleryError, add_images
+from .intake import DuplicateSubmission, IntakeEmailThrottle, IntakeIPThrottle, accept_submission
+from .metrics import record_cache
+from .search import FullTextSearchFilter
+from .stats import SERIES_DAYS, dashboard_stats, status_counts
+from .serializers import BulkListSerializer, BannerSerializer, AboutSerializer, ProjectSerializer, LeadSerializer, ProjectCategorySerializer, BlogCategorySerializer, TeamMemberSerializer, BlogPostSerializer, SiteConfigSerializer, ServiceSerializer, ServiceCategorySerializer, ClientSerializer, UserRegistrationSerializer, CareerSerializer, NoticeSerializer, JobApplicationSerializer, JobApplicationTriageSerializer, ChunkedUploadSerializer, ChunkedUploadCompleteSerializer, ProjectGalleryUploadSerializer, ProjectImageSerializer
+from .uploads import UploadError, discard_chunks, finalize_upload, purge_expired_uploads, received_chunks, write_chunk
 from rest_framework.views import APIView
 from rest_framework import generics
 from django.contrib.auth.models import User
@@ -51,12 +67,14 @@ class DashboardView(TemplateView):
         context = super().get_context_data(**kwargs)
         # Add dashboard context data
         context['user'] = self.request.user
-        context['total_posts'] = BlogPost.objects.count()
-        context['total_projects'] = Project.objects.count()
-        context['total_services'] = Service.objects.count()
-        context['total_team_members'] = TeamMember.objects.count()
-        context['published_posts'] = BlogPost.objects.filter(status='published').count()
-        context['draft_posts'] = BlogPost.objects.filter(status='draft').count()
+        stats = dashboard_stats()
+        context['stats'] = stats
+        context['total_posts'] = stats['blog_posts']['total']
+        context['total_projects'] = stats['projects']['total']
+        context['total_services'] = stats['services']['total']
+        context['total_team_members'] = stats['team_members']['total']
+        context['published_posts'] = stats['blog_posts']['published']
+        context['draft_posts'] = stats['blog_posts']['draft']
         return context
 
 
@@ -168,11 +186,184 @@ class IsAdminOrReadOnly(permissions.BasePermission):
         # Allow authenticated users to create/update
         return request.user and request.user.is_authenticated
 
+# Gallery images in display order, each with its variants
+PROJECT_IMAGES = Prefetch('images', queryset=ProjectImage.objects.order_by('order', 'id').prefetch_related('image_derivatives'))
+
+
+class BulkWriteMixin:
+    """
+    ``/bulk/`` for a content viewset, one transaction per request:
+
+    * ``POST`` an array of objects to create them,
+    * ``PATCH`` an array of partial objects, each with its ``id``, to update them,
+    * ``DELETE`` ``{"ids": [...]}`` to delete rows.
+
+    Creates and updates are validated with the viewset's serializer and
+    written with ``bulk_create``/``bulk_update`` (content.bulk). A single
+    invalid item rejects the batch with a list of per-item errors aligned
+    with the input. Successful writes answer with the items in input order.
+    """
+    bulk_max_items = 500
+
+    def get_bulk_serializer(self, *args, **kwargs):
+        kwargs.setdefault('context', self.get_serializer_context())
+        child = self.get_serializer_class()(partial=kwargs.get('partial', False), context=kwargs['context'])
+        return BulkListSerializer(*args, child=child, max_length=self.bulk_max_items, allow_empty=False, **kwargs)
+
+    def bulk_response(self, instances, status_code):
+        lookups = self.get_queryset()._prefetch_related_lookups
+        if lookups:
+            prefetch_related_objects(instances, *lookups)
+        serializer = self.get_bulk_serializer(instances)
+        return Response(serializer.data, status=status_code)
+
+    @action(detail=False, methods=['post', 'patch', 'delete'], url_path='bulk')
+    def bulk(self, request):
+        if request.method == 'POST':
+            serializer = self.get_bulk_serializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            return self.bulk_response(serializer.save(), status.HTTP_201_CREATED)
+        if request.method == 'PATCH':
+            return self.bulk_update(request)
+        return self.bulk_destroy(request)
+
+    def bulk_update(self, request):
+        items = request.data
+        if not isinstance(items, list):
+            return Response({'error': 'Expected a list of objects'}, status=status.HTTP_400_BAD_REQUEST)
+        ids = [item.get('id') if isinstance(item, dict) else None for item in items]
+        id_errors = [
+            {} if isinstance(pk, int) and not isinstance(pk, bool) and ids.count(pk) == 1
+            else {'id': ['A unique integer id is required.']}
+            for pk in ids
+        ]
+        if any(id_errors):
+            return Response(id_errors, status=status.HTTP_400_BAD_REQUEST)
+        with transaction.atomic():
+            instances = self.get_queryset().select_for_update(of=('self',)).in_bulk(ids)
+            missing = [{} if pk in instances else {'id': ['Not found.']} for pk in ids]
+            if any(missing):
+                return Response(missing, status=status.HTTP_400_BAD_REQUEST)
+            serializer = self.get_bulk_serializer(instances, data=items, partial=True)
+            serializer.is_valid(raise_exception=True)
+            updated = serializer.save()
+        return self.bulk_response(updated, status.HTTP_200_OK)
+
+    def bulk_destroy(self, request):
+        ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        if not isinstance(ids, list) or not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in ids):
+            return Response({'error': 'Expected {"ids": [...]} with integer ids'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > self.bulk_max_items:
+            return Response(
+                {'error': f'At most {self.bulk_max_items} ids per request'}, status=status.HTTP_400_BAD_REQUEST,
+            )
+        with transaction.atomic():
+            rows = self.get_queryset().filter(pk__in=ids)
+            found = set(rows.values_list('pk', flat=True))
+            rows.delete()
+        return Response({'results': [
+            {'id': pk, 'status': 'deleted' if pk in found else 'not_found'} for pk in ids
+        ]})
+
+
+class IntakeCreateMixin:
+    """
+    Public ``create`` through the intake pipeline (content.intake): throttled
+    per client address and per email, an identical resubmission acknowledged
+    (200) without a new row, and the row written at once while
+    ``intake_file_fields`` and notifications are left to the task queue.
+    """
+    # Fields that make two submissions "the same"
+    intake_key_fields = ('email',)
+    intake_file_fields = ()
+
+    def get_throttles(self):
+        if self.action == 'create':
+            return [IntakeIPThrottle(), IntakeEmailThrottle()]
+        return super().get_throttles()
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            instance, created = accept_submission(serializer, self.intake_key_fields, self.intake_file_fields)
+        except DuplicateSubmission:
+            return Response(
+                {'error': 'This submission is already being processed'}, status=status.HTTP_409_CONFLICT,
+            )
+        if not created:
+            # Anyone can repeat someone else's email: never echo the stored row
+            return Response({'status': 'received'}, status=status.HTTP_200_OK)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+def bulk_schema(serializer_class):
+    """OpenAPI description of ``BulkWriteMixin.bulk`` for a viewset serializing with ``serializer_class``."""
+    return extend_schema(
+        summary="Bulk create, update or delete (admin only)",
+        description=(
+            "POST an array to create, PATCH an array of objects with `id` to update, or DELETE "
+            "`{\"ids\": [...]}`. All-or-nothing: any invalid item rejects the request with per-item errors."
+        ),
+        request=serializer_class(many=True),
+        responses={
+            200: serializer_class(many=True),
+            201: serializer_class(many=True),
+            400: OpenApiResponse(description='Per-item validation errors'),
+        },
+    )
+
+
+class SparseFieldsetMixin:
+    """
+    ``?fields=a,b`` / ``?omit=a,b`` on the reads of a viewset whose serializer
+    uses SparseFieldsMixin, and the compact summary representation for
+    ``summary_actions`` when neither is given. The heavy text columns the
+    response does not include are deferred, so they are not even read.
+    Custom actions serialize with ``get_serializer`` and pass their
+    querysets through ``without_unused_columns``.
+    """
+    summary_actions = ('list',)
+
+    def sparse_fieldset(self):
+        if self.request is None or self.request.method not in permissions.SAFE_METHODS:
+            return {}
+        params = self.request.query_params
+        return {
+            'fields': split_param(params.get('fields')),
+            'omit': split_param(params.get('omit')),
+            'summary': self.action in self.summary_actions,
+        }
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.update(self.sparse_fieldset())
+        return super().get_serializer(*args, **kwargs)
+
+    def without_unused_columns(self, queryset):
+        if not self.sparse_fieldset():
+            return queryset
+        deferred = self.get_serializer().deferred_columns()
+        return queryset.defer(*deferred) if deferred else queryset
+
+    def get_queryset(self):
+        return self.without_unused_columns(super().get_queryset())
+
+
+def split_param(value):
+    return [name.strip() for name in value.split(',') if name.strip()] if value else []
+
+
+SPARSE_FIELDSET_PARAMETERS = [
+    OpenApiParameter(name="fields", description="Comma-separated fields to return (default for lists: the summary fields)", required=False, type=str),
+    OpenApiParameter(name="omit", description="Comma-separated fields to leave out of the full representation", required=False, type=str),
+]
+
+
 # BlogPost ViewSet
 @extend_schema_view(
     list=extend_schema(
         summary="List blog posts",
-        description="Returns a list of blog posts. Supports filtering by status, category, and tags.",
+        description="Returns a list of blog posts. Supports filtering by status, category, and tags. Items carry the summary fields unless `fields` or `omit` is given.",
         parameters=[
             OpenApiParameter(name="status", description="Filter by status (draft, published, archived)", required=False, type=str),
             OpenApiParameter(name="category", description="Filter by category", required=False, type=str),
@@ -189,18 +380,24 @@ class IsAdminOrReadOnly(permissions.BasePermission):
                 required=False,
                 type=OpenApiTypes.DATE,
             ),
+            OpenApiParameter(name="render", description="Pass 'html' to get content_html, content_toc and plain_excerpt instead of raw markdown", required=False, type=str),
+            *SPARSE_FIELDSET_PARAMETERS,
         ],
         responses={200: BlogPostSerializer(many=True)}
     ),
-    retrieve=extend_schema(summary="Retrieve a blog post", responses={200: BlogPostSerializer}),
+    retrieve=extend_schema(summary="Retrieve a blog post", parameters=SPARSE_FIELDSET_PARAMETERS, responses={200: BlogPostSerializer}),
     create=extend_schema(summary="Create a blog post", request=BlogPostSerializer, responses={201: BlogPostSerializer}),
     update=extend_schema(summary="Update a blog post", request=BlogPostSerializer, responses={200: BlogPostSerializer}),
     partial_update=extend_schema(summary="Partially update a blog post", request=BlogPostSerializer, responses={200: BlogPostSerializer}),
     destroy=extend_schema(summary="Delete a blog post"),
+    bulk=bulk_schema(BlogPostSerializer),
 )
-class BlogPostViewSet(viewsets.ModelViewSet):
-    queryset = BlogPost.objects.all()
+class BlogPostViewSet(SparseFieldsetMixin, BulkWriteMixin, CachedResponseMixin, viewsets.ModelViewSet):
+    queryset = BlogPost.objects.prefetch_related('image_derivatives')
     serializer_class = BlogPostSerializer
+    summary_actions = ('list', 'published')
+    # Most queries each read endpoint may run, whatever the page size (asserted in content.tests)
+    query_budgets = {'list': 3, 'retrieve': 2, 'published': 2, 'by_slug': 3}
     
     def get_permissions(self):
         """Allow public read-only endpoints, require auth for write operations."""
@@ -209,8 +406,11 @@ class BlogPostViewSet(viewsets.ModelViewSet):
         if self.action in public_actions:
             return [AllowAny()]
         return [IsAdmin()]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ["title", "content", "tags", "category", "author"]
+    # Full-text search runs last so relevance ordering overrides the default
+    filter_backends = [filters.OrderingFilter, FullTextSearchFilter]
+    # ILIKE fallback for databases without a full-text index
+    search_fields = ["title", "content", "tags", "category__name", "author"]
+    cursor_ordering = ("-published_at", "-created_at", "id")
     ordering_fields = ["published_at", "created_at", "view_count"]
     # Allow ordering by the date-only fields too
     ordering_fields += ["created_date", "last_edited_date"]
@@ -240,8 +440,11 @@ class BlogPostViewSet(viewsets.ModelViewSet):
     )
     def published(self, request):
         """Get all published blog posts"""
-        posts = BlogPost.objects.filter(status='published')
-        serializer = BlogPostSerializer(posts, many=True)
+        return self.cached_response(request, self._published)
+
+    def _published(self, request):
+        posts = self.without_unused_columns(self.queryset.filter(status='published'))
+        serializer = self.get_serializer(posts, many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'], url_path='slug/(?P<slug>[-\\w]+)', permission_classes=[AllowAny])
@@ -253,14 +456,20 @@ class BlogPostViewSet(viewsets.ModelViewSet):
     )
     def by_slug(self, request, slug=None):
         """Get blog post by slug"""
+        response = self.cached_response(request, self._by_slug, slug=slug)
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            record_view(BlogPost, response.instance_pk)
+        return response
+
+    def _by_slug(self, request, slug=None):
         try:
-            post = BlogPost.objects.get(slug=slug, status='published')
-            post.view_count += 1
-            post.save(update_fields=['view_count'])
-            serializer = BlogPostSerializer(post)
-            return Response(serializer.data)
+            post = self.without_unused_columns(self.queryset).get(slug=slug, status='published')
         except BlogPost.DoesNotExist:
             return Response({'error': 'Blog post not found'}, status=status.HTTP_404_NOT_FOUND)
+        serializer = self.get_serializer(post)
+        response = Response(serializer.data)
+        response.instance_pk = post.pk  # the serialized fields may leave out id
+        return response
 
 @extend_schema_view(
     list=extend_schema(
@@ -274,7 +483,7 @@ class BlogPostViewSet(viewsets.ModelViewSet):
     partial_update=extend_schema(summary="Partially update banner", tags=['Banners']),
     destroy=extend_schema(summary="Delete banner", tags=['Banners']),
 )
-class BannerViewSet(viewsets.ModelViewSet):
+class BannerViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     queryset = Banner.objects.all()
     serializer_class = BannerSerializer
     permission_classes = [IsAdmin]  # Admin dashboard only
@@ -297,6 +506,14 @@ class BannerViewSet(viewsets.ModelViewSet):
         # Only allow one banner (singleton)
         return Banner.objects.all()[:1]
 
+    def is_response_cacheable(self, request):
+        # The singleton is the same for everyone
+        return settings.CONTENT_CACHE_TIMEOUT > 0 and request.method in ("GET", "HEAD")
+
+    def _get_cached_singleton(self):
+        """Singleton banner for public reads, served from the process-local cache."""
+        return Banner.get_cached() or self._get_or_create_singleton()
+
     def _get_or_create_singleton(self):
         """
         Return the singleton banner, creating a fallback stub if none exists.
@@ -340,9 +557,7 @@ class BannerViewSet(viewsets.ModelViewSet):
         responses={200: BannerSerializer()}
     )
     def singleton(self, request):
-        banner = self._get_or_create_singleton()
-        serializer = BannerSerializer(banner, context={'request': request})
-        return Response(serializer.data)
+        return self.cached_response(request, self._singleton)
 
     @action(detail=False, methods=['get'], url_path='active', permission_classes=[AllowAny])
     @extend_schema(
@@ -353,7 +568,10 @@ class BannerViewSet(viewsets.ModelViewSet):
     )
     def active(self, request):
         """Return the first banner (singleton) as the active banner"""
-        banner = self._get_or_create_singleton()
+        return self.cached_response(request, self._singleton)
+
+    def _singleton(self, request):
+        banner = self._get_cached_singleton()
         serializer = BannerSerializer(banner, context={'request': request})
         return Response(serializer.data)
 
@@ -395,9 +613,10 @@ class BannerViewSet(viewsets.ModelViewSet):
         tags=['About']
     ),
 )
-class AboutViewSet(viewsets.ModelViewSet):
-    queryset = About.objects.filter(is_published=True)
+class AboutViewSet(CachedResponseMixin, viewsets.ModelViewSet):
+    queryset = About.objects.filter(is_published=True).prefetch_related('image_derivatives')
     serializer_class = AboutSerializer
+    query_budgets = {'list': 3}
     
     def get_permissions(self):
         """Allow public GET requests, require auth for write operations"""
@@ -414,14 +633,17 @@ class AboutViewSet(viewsets.ModelViewSet):
         ],
     ),
     retrieve=extend_schema(summary="Retrieve a project"),
+    bulk=bulk_schema(ProjectSerializer),
 )
-class ProjectViewSet(viewsets.ModelViewSet):
-    queryset = Project.objects.all()
+class ProjectViewSet(BulkWriteMixin, CachedResponseMixin, viewsets.ModelViewSet):
+    queryset = Project.objects.select_related('category').prefetch_related('image_derivatives', PROJECT_IMAGES)
     serializer_class = ProjectSerializer
+    query_budgets = {'list': 5, 'retrieve': 4, 'completed': 4, 'by_slug': 4}
+    cache_models = (Project, ProjectCategory, ProjectImage)
     
     def get_permissions(self):
         """Allow public GET requests, require auth for write operations"""
-        if self.action in ('list', 'retrieve'):
+        if self.action in ('list', 'retrieve', 'completed', 'by_slug'):
             return [AllowAny()]
         return [IsAdmin()]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
@@ -447,7 +669,10 @@ class ProjectViewSet(viewsets.ModelViewSet):
     )
     def completed(self, request):
         """Get all completed projects"""
-        projects = Project.objects.filter(status='completed')
+        return self.cached_response(request, self._completed)
+
+    def _completed(self, request):
+        projects = self.queryset.filter(status='completed')
         serializer = ProjectSerializer(projects, many=True)
         return Response(serializer.data)
 
@@ -460,18 +685,46 @@ class ProjectViewSet(viewsets.ModelViewSet):
     )
     def by_slug(self, request, slug=None):
         """Get project by slug"""
+        return self.cached_response(request, self._by_slug, slug=slug)
+
+    def _by_slug(self, request, slug=None):
         try:
-            project = Project.objects.get(slug=slug)
-            serializer = ProjectSerializer(project)
-            return Response(serializer.data)
+            project = self.queryset.get(slug=slug)
         except Project.DoesNotExist:
             return Response({'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
+        serializer = ProjectSerializer(project)
+        return Response(serializer.data)
+
+    @extend_schema(
+        summary="Upload gallery images",
+        description="Add many images to the project's gallery in one request, after its existing images "
+                    "and in the order submitted. Images are verified, rotated upright, stripped of metadata "
+                    "and scaled down to GALLERY_MAX_DIMENSION. Admin only.",
+        tags=['Projects'],
+        request={'multipart/form-data': ProjectGalleryUploadSerializer},
+        responses={201: ProjectImageSerializer(many=True), 400: OpenApiResponse(description='Invalid images')}
+    )
+    @action(detail=True, methods=['post'], url_path='gallery', filter_backends=[], pagination_class=None,
+            parser_classes=[parsers.MultiPartParser, parsers.FormParser])
+    def gallery(self, request, pk=None):
+        project = self.get_object()
+        serializer = ProjectGalleryUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            images = add_images(project, **serializer.validated_data)
+        except GalleryError as exc:
+            return Response({'images': exc.args[0]}, status=status.HTTP_400_BAD_REQUEST)
+        prefetch_related_objects(images, 'image_derivatives')
+        serializer = ProjectImageSerializer(images, many=True, context=self.get_serializer_context())
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 @extend_schema_view(
     list=extend_schema(summary="List leads (contact form submissions)"),
     create=extend_schema(
         summary="Create a lead",
-        description="Public endpoint for contact form submissions. No authentication required.",
+        description="Public endpoint for contact form submissions. No authentication required. "
+                    "Rate limited per client and per email (429); resending the same message within "
+                    "a few minutes returns the lead already created (200). The attached file is stored shortly after.",
         examples=[
             OpenApiExample(
                 "Create lead example",
@@ -482,9 +735,13 @@ class ProjectViewSet(viewsets.ModelViewSet):
     retrieve=extend_schema(summary="Retrieve a lead (admin only)"),
     destroy=extend_schema(summary="Delete a lead (admin only)"),
 )
-class LeadViewSet(viewsets.ModelViewSet):
+class LeadViewSet(IntakeCreateMixin, viewsets.ModelViewSet):
     queryset = Lead.objects.all()
     serializer_class = LeadSerializer
+    intake_key_fields = ('email', 'message')
+    intake_file_fields = ('attached_file',)
+    query_budgets = {'list': 2}
+    cursor_ordering = ("-created_at", "id")
     
     def get_permissions(self):
         """Allow public create (contact form); admin-only for list/retrieve/delete"""
@@ -495,6 +752,7 @@ class LeadViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=["post"], url_path="mark-read", permission_classes=[permissions.IsAdminUser])
     def mark_all_read(self, request):
         Lead.objects.filter(is_read=False).update(is_read=True)
+        bump_generation(Lead)  # update() sends no post_save
         return Response({"status": "ok"}, status=status.HTTP_200_OK)
 
 
@@ -502,9 +760,10 @@ class LeadViewSet(viewsets.ModelViewSet):
     list=extend_schema(summary="List Project Categories", description="Public endpoint listing project categories."),
     retrieve=extend_schema(summary="Get Project Category Details"),
 )
-class ProjectCategoryViewSet(viewsets.ModelViewSet):
+class ProjectCategoryViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     queryset = ProjectCategory.objects.all()
     serializer_class = ProjectCategorySerializer
+    query_budgets = {'list': 2}
     
     def get_permissions(self):
         """Allow public GET requests, require auth for write operations"""
@@ -521,9 +780,10 @@ class ProjectCategoryViewSet(viewsets.ModelViewSet):
     create=extend_schema(summary="Create Blog Category (admin only)"),
     retrieve=extend_schema(summary="Get Blog Category Details"),
 )
-class BlogCategoryViewSet(viewsets.ModelViewSet):
+class BlogCategoryViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     queryset = BlogCategory.objects.all()
     serializer_class = BlogCategorySerializer
+    query_budgets = {'list': 2}
     
     def get_permissions(self):
         """Allow public GET requests, require auth for write operations"""
@@ -539,10 +799,12 @@ class BlogCategoryViewSet(viewsets.ModelViewSet):
     list=extend_schema(summary="List Team Members", description="Publicly visible team member info."),
     retrieve=extend_schema(summary="Get single team member details"),
     create=extend_schema(summary="Add new team member (admin only)"),
+    bulk=bulk_schema(TeamMemberSerializer),
 )
-class TeamMemberViewSet(viewsets.ModelViewSet):
-    queryset = TeamMember.objects.filter(is_active=True)
+class TeamMemberViewSet(BulkWriteMixin, CachedResponseMixin, viewsets.ModelViewSet):
+    queryset = TeamMember.objects.filter(is_active=True).prefetch_related('image_derivatives')
     serializer_class = TeamMemberSerializer
+    query_budgets = {'list': 3}
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ["name", "position"]
@@ -551,16 +813,18 @@ class TeamMemberViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         # allow admins to see inactive members as well
         if self.request.user and self.request.user.is_staff:
-            return TeamMember.objects.all()
+            return TeamMember.objects.prefetch_related('image_derivatives')
         return super().get_queryset()
 
 @extend_schema_view(
     list=extend_schema(summary="List clients", description="Public endpoint for clients/companies."),
     retrieve=extend_schema(summary="Get client details"),
+    bulk=bulk_schema(ClientSerializer),
 )
-class ClientViewSet(viewsets.ModelViewSet):
-    queryset = Client.objects.filter(is_active=True)
+class ClientViewSet(BulkWriteMixin, CachedResponseMixin, viewsets.ModelViewSet):
+    queryset = Client.objects.filter(is_active=True).prefetch_related('image_derivatives')
     serializer_class = ClientSerializer
+    query_budgets = {'list': 3}
     
     def get_permissions(self):
         """Allow public GET requests, require auth for write operations"""
@@ -574,16 +838,17 @@ class ClientViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         # allow admins to see inactive clients as well
         if self.request.user and self.request.user.is_staff:
-            return Client.objects.all()
+            return Client.objects.prefetch_related('image_derivatives')
         return super().get_queryset()
 
 @extend_schema_view(
     list=extend_schema(summary="List service categories", description="Public endpoint for service categories."),
     retrieve=extend_schema(summary="Get service category details"),
 )
-class ServiceCategoryViewSet(viewsets.ModelViewSet):
+class ServiceCategoryViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     queryset = ServiceCategory.objects.filter(is_active=True)
     serializer_class = ServiceCategorySerializer
+    query_budgets = {'list': 2}
     
     def get_permissions(self):
         """Allow public GET requests, require auth for write operations"""
@@ -603,30 +868,34 @@ class ServiceCategoryViewSet(viewsets.ModelViewSet):
 @extend_schema_view(
     list=extend_schema(
         summary="List services",
-        description="Returns a list of published services. Supports filtering by status, category, and featured.",
+        description="Returns a list of published services. Supports filtering by status, category, and featured. Items carry the summary fields unless `fields` or `omit` is given.",
         parameters=[
             OpenApiParameter(name="status", description="Filter by status (draft, published, archived)", required=False, type=str),
             OpenApiParameter(name="category", description="Filter by category ID", required=False, type=int),
             OpenApiParameter(name="is_featured", description="Filter featured services", required=False, type=bool),
+            *SPARSE_FIELDSET_PARAMETERS,
         ],
         responses={200: ServiceSerializer(many=True)}
     ),
-    retrieve=extend_schema(summary="Retrieve a service", responses={200: ServiceSerializer}),
+    retrieve=extend_schema(summary="Retrieve a service", parameters=SPARSE_FIELDSET_PARAMETERS, responses={200: ServiceSerializer}),
     create=extend_schema(summary="Create a service (admin only)", request=ServiceSerializer, responses={201: ServiceSerializer}),
     update=extend_schema(summary="Update a service (admin only)", request=ServiceSerializer, responses={200: ServiceSerializer}),
     partial_update=extend_schema(summary="Partially update a service (admin only)", request=ServiceSerializer, responses={200: ServiceSerializer}),
     destroy=extend_schema(summary="Delete a service (admin only)"),
+    bulk=bulk_schema(ServiceSerializer),
 )
-class ServiceViewSet(viewsets.ModelViewSet):
-    queryset = Service.objects.all()
+class ServiceViewSet(SparseFieldsetMixin, BulkWriteMixin, CachedResponseMixin, viewsets.ModelViewSet):
+    queryset = Service.objects.select_related('category').prefetch_related('image_derivatives')
     serializer_class = ServiceSerializer
+    query_budgets = {'list': 3, 'retrieve': 2, 'by_slug': 3}
+    cache_models = (Service, ServiceCategory)
     
     def get_permissions(self):
         """Allow public GET requests, require auth for write operations"""
         if self.action in ('list', 'retrieve', 'by_slug'):
             return [AllowAny()]
         return [IsAdmin()]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [filters.OrderingFilter, FullTextSearchFilter]
     search_fields = ["title", "content", "category__name"]
     ordering_fields = ["published_at", "created_at", "order", "is_featured"]
     ordering = ["-is_featured", "order", "-created_at"]
@@ -655,15 +924,21 @@ class ServiceViewSet(viewsets.ModelViewSet):
     )
     def by_slug(self, request, slug=None):
         """Get service by slug"""
-        try:
-            service = Service.objects.get(slug=slug)
+        response = self.cached_response(request, self._by_slug, slug=slug)
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
             # Increment view count
-            service.view_count += 1
-            service.save(update_fields=['view_count'])
-            serializer = ServiceSerializer(service)
-            return Response(serializer.data)
+            record_view(Service, response.instance_pk)
+        return response
+
+    def _by_slug(self, request, slug=None):
+        try:
+            service = self.without_unused_columns(self.queryset).get(slug=slug)
         except Service.DoesNotExist:
             return Response({'error': 'Service not found'}, status=status.HTTP_404_NOT_FOUND)
+        serializer = self.get_serializer(service)
+        response = Response(serializer.data)
+        response.instance_pk = service.pk  # the serialized fields may leave out id
+        return response
 
 
 
@@ -697,9 +972,10 @@ class ServiceViewSet(viewsets.ModelViewSet):
         responses={200: SiteConfigSerializer}
     ),
 )
-class SiteConfigViewSet(viewsets.ViewSet):
+class SiteConfigViewSet(CachedResponseMixin, viewsets.ViewSet):
     """Singleton resource for site configuration - only one config is maintained"""
     serializer_class = SiteConfigSerializer
+    query_budgets = {'list': 2}
     # Provide queryset so drf-spectacular can infer path parameter types for detail routes
     queryset = SiteConfig.objects.all()
     parser_classes = [parsers.MultiPartParser, parsers.FormParser, parsers.JSONParser]
@@ -710,9 +986,16 @@ class SiteConfigViewSet(viewsets.ViewSet):
             return [AllowAny()]
         return [IsAdmin()]
 
+    def is_response_cacheable(self, request):
+        # The singleton is the same for everyone
+        return settings.CONTENT_CACHE_TIMEOUT > 0 and request.method in ("GET", "HEAD")
+
     def list(self, request):
         """Get the current site configuration"""
-        config = SiteConfig.get_config()
+        return self.cached_response(request, self._config)
+
+    def _config(self, request):
+        config = SiteConfig.get_cached_config()
         serializer = SiteConfigSerializer(config, context={'request': request})
         return Response(serializer.data)
 
@@ -738,9 +1021,7 @@ class SiteConfigViewSet(viewsets.ViewSet):
 
     def retrieve(self, request, pk=None):
         """Retrieve the site configuration (support detail route)"""
-        config = SiteConfig.get_config()
-        serializer = self.serializer_class(config, context={"request": request})
-        return Response(serializer.data)
+        return self.cached_response(request, self._config)
 
     def partial_update(self, request, pk=None):
         """Partially update the site configuration"""
@@ -761,33 +1042,207 @@ class SiteConfigViewSet(viewsets.ViewSet):
     )
     def active(self, request):
         """Get the site configuration (always returns the single config)"""
-        config = SiteConfig.get_config()
-        serializer = SiteConfigSerializer(config, context={'request': request})
-        return Response(serializer.data)
+        return self.cached_response(request, self._config)
+
+
+# Homepage bundle
+class HomeView(CachedResponseMixin, APIView):
+    """Every homepage section in one response, cached as a unit."""
+    permission_classes = [AllowAny]
+    query_budgets = {'get': 16}
+    cache_models = (
+        SiteConfig, Banner, About, Service, ServiceCategory, Project, ProjectCategory,
+        ProjectImage, TeamMember, Client, BlogPost,
+    )
+    # Maximum number of items per list section
+    section_limits = {
+        "services": 6,
+        "projects": 6,
+        "team_members": 10,
+        "clients": 12,
+        "blog_posts": 3,
+    }
+
+    def is_response_cacheable(self, request):
+        # The bundle only ever contains public rows, so it is the same for everyone
+        return settings.CONTENT_CACHE_TIMEOUT > 0 and request.method in ("GET", "HEAD")
+
+    @extend_schema(
+        summary="Homepage bundle",
+        description="Site config, banner, about, services, projects, team, clients and recent blog posts "
+                    "in one response. Public endpoint.",
+        tags=['Home'],
+        responses={200: OpenApiResponse(description='Homepage sections keyed by name')}
+    )
+    def get(self, request):
+        return self.cached_response(request, self._home)
+
+    def _home(self, request):
+        limits = self.section_limits
+        context = {'request': request}
+        banner = Banner.get_cached()
+        about = About.objects.filter(is_published=True).prefetch_related('image_derivatives').first()
+
+        services = Service.objects.filter(
+            status='published', is_deleted=False
+        ).select_related('category').prefetch_related('image_derivatives')[:limits['services']]
+        projects = Project.objects.filter(
+            is_deleted=False
+        ).select_related('category').prefetch_related('image_derivatives', PROJECT_IMAGES)[:limits['projects']]
+        team_members = TeamMember.objects.filter(is_active=True).prefetch_related('image_derivatives')[:limits['team_members']]
+        clients = Client.objects.filter(is_active=True).prefetch_related('image_derivatives')[:limits['clients']]
+        blog_posts = BlogPost.objects.filter(
+            status='published', is_deleted=False
+        ).prefetch_related('image_derivatives')[:limits['blog_posts']]
+
+        return Response({
+            'site_config': SiteConfigSerializer(SiteConfig.get_cached_config(), context=context).data,
+            'banner': BannerSerializer(banner, context=context).data if banner else None,
+            'about': AboutSerializer(about, context=context).data if about else None,
+            'services': ServiceSerializer(services, many=True, context=context).data,
+            'projects': ProjectSerializer(projects, many=True, context=context).data,
+            'team_members': TeamMemberSerializer(team_members, many=True, context=context).data,
+            'clients': ClientSerializer(clients, many=True, context=context).data,
+            'blog_posts': BlogPostSerializer(blog_posts, many=True, context=context).data,
+        })
+
+
+class DashboardStatsView(APIView):
+    """Counters and daily series for the admin dashboard (content.stats)."""
+    permission_classes = [IsAdmin]
+    query_budgets = {'get': 9}
+
+    @extend_schema(
+        summary="Dashboard statistics",
+        description="Blog posts and projects by status, unread leads, applications by status per career, "
+                    f"active careers, published notices, and leads and applications per day for the last "
+                    f"{SERIES_DAYS} days. Cached briefly. Admin only.",
+        tags=['Dashboard'],
+        responses={200: OpenApiResponse(description='Dashboard statistics')},
+    )
+    def get(self, request):
+        return Response(dashboard_stats())
+
+
+# Server-rendered public detail pages
+class ContentPageView(TemplateView):
+    """
+    Detail page rendered with its data already in the HTML.
+
+    The object is serialized exactly as the API does (with pre-rendered
+    markdown) and embedded as ``initial-data`` JSON for the page script to
+    hydrate from. The payload is cached, and templates cache their rendered
+    fragments, on ``page_version``, which changes with any of ``cache_models``.
+    With ``SERVER_SIDE_RENDERING`` off the template is served as an empty shell.
+    """
+    model = None
+    serializer_class = None
+    page_type = None
+    cache_models = ()
+    # Lookup filters matching the public API for this model
+    public_filters = {}
+    prefetch = ()
+    count_views = True
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update(
+            page=None, page_version=None,
+            page_type=self.page_type, page_cache_timeout=settings.CONTENT_CACHE_TIMEOUT,
+        )
+        slug = self.kwargs.get('slug') or self.request.GET.get('slug')
+        if not settings.SERVER_SIDE_RENDERING or not slug:
+            return context
+
+        generations = get_generations(self.cache_models or (self.model,))
+        version = hashlib.md5('.'.join(map(str, generations)).encode()).hexdigest()
+        key = PAGE_KEY.format(self.page_type, hashlib.md5(f'{self.request.get_host()}:{slug}'.encode()).hexdigest(), version)
+        data = cache.get(key)
+        record_cache(type(self).__name__, "miss" if data is None else "hit")
+        if data is None:
+            obj = self.model.objects.filter(slug=slug, **self.public_filters).prefetch_related(*self.prefetch).first()
+            serializer_context = {'request': self.request, 'render_html': True}
+            data = dict(self.serializer_class(obj, context=serializer_context).data) if obj else {}
+            cache.set(key, data, settings.CONTENT_CACHE_TIMEOUT)
+        if not data:
+            raise Http404()
+
+        if self.count_views:
+            record_view(self.model, data['id'])
+        context.update(page=data, page_version=version)
+        return context
+
+
+class BlogPostPageView(ContentPageView):
+    template_name = 'blog-detail.html'
+    model = BlogPost
+    serializer_class = BlogPostSerializer
+    page_type = 'blog'
+    public_filters = {'status': 'published'}
+    prefetch = ('image_derivatives',)
+
+
+class ProjectPageView(ContentPageView):
+    template_name = 'project-detail.html'
+    model = Project
+    serializer_class = ProjectSerializer
+    page_type = 'project'
+    cache_models = (Project, ProjectCategory, ProjectImage)
+    prefetch = ('category', 'image_derivatives', PROJECT_IMAGES)
+    count_views = False  # projects have no view counter
+
+
+class ServicePageView(ContentPageView):
+    template_name = 'service-detail.html'
+    model = Service
+    serializer_class = ServiceSerializer
+    page_type = 'service'
+    cache_models = (Service, ServiceCategory)
+    prefetch = ('category', 'image_derivatives')
+
+
+class CareerPageView(ContentPageView):
+    template_name = 'career-detail.html'
+    model = Career
+    serializer_class = CareerSerializer
+    page_type = 'career'
+    public_filters = {'status': 'active'}
+
+
+class NoticePageView(ContentPageView):
+    template_name = 'notice-detail.html'
+    model = Notice
+    serializer_class = NoticeSerializer
+    page_type = 'notice'
+    public_filters = {'status': 'published'}
+    prefetch = ('image_derivatives',)
 
 
 # Career ViewSet
 @extend_schema_view(
     list=extend_schema(
         summary="List career opportunities",
-        description="Returns a list of career/job openings. Supports filtering by status and job type.",
+        description="Returns a list of career/job openings. Supports filtering by status and job type. Items carry the summary fields unless `fields` or `omit` is given.",
         tags=['Careers'],
         parameters=[
             OpenApiParameter(name="status", description="Filter by status (draft, active, closed)", required=False, type=str),
             OpenApiParameter(name="job_type", description="Filter by job type (full_time, part_time, contract, internship)", required=False, type=str),
             OpenApiParameter(name="location", description="Filter by location", required=False, type=str),
+            *SPARSE_FIELDSET_PARAMETERS,
         ],
         responses={200: CareerSerializer(many=True)}
     ),
-    retrieve=extend_schema(summary="Retrieve a career", tags=['Careers'], responses={200: CareerSerializer}),
+    retrieve=extend_schema(summary="Retrieve a career", tags=['Careers'], parameters=SPARSE_FIELDSET_PARAMETERS, responses={200: CareerSerializer}),
     create=extend_schema(summary="Create a career", tags=['Careers'], request=CareerSerializer, responses={201: CareerSerializer}),
     update=extend_schema(summary="Update a career", tags=['Careers'], request=CareerSerializer, responses={200: CareerSerializer}),
     partial_update=extend_schema(summary="Partially update a career", tags=['Careers'], request=CareerSerializer, responses={200: CareerSerializer}),
     destroy=extend_schema(summary="Delete a career", tags=['Careers']),
 )
-class CareerViewSet(viewsets.ModelViewSet):
+class CareerViewSet(SparseFieldsetMixin, CachedResponseMixin, viewsets.ModelViewSet):
     queryset = Career.objects.all()
     serializer_class = CareerSerializer
+    summary_actions = ('list', 'active')
+    query_budgets = {'list': 2, 'active': 2, 'by_slug': 2}
     permission_classes = [IsAdmin]  # Admin dashboard only
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ["title", "location", "department", "requirements"]
@@ -818,15 +1273,20 @@ class CareerViewSet(viewsets.ModelViewSet):
     )
     def active(self, request):
         """Get all active career opportunities with pagination"""
-        careers = Career.objects.filter(status='active').order_by('-is_featured', 'order', '-created_at')
+        return self.cached_response(request, self._active)
+
+    def _active(self, request):
+        careers = self.without_unused_columns(
+            self.queryset.filter(status='active').order_by('-is_featured', 'order', '-created_at')
+        )
         
         # Apply pagination
         page = self.paginate_queryset(careers)
         if page is not None:
-            serializer = CareerSerializer(page, many=True)
+            serializer = self.get_serializer(page, many=True)
             return self.get_paginated_response(serializer.data)
         
-        serializer = CareerSerializer(careers, many=True)
+        serializer = self.get_serializer(careers, many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'], url_path='slug/(?P<slug>[-\\w]+)', permission_classes=[AllowAny])
@@ -838,14 +1298,20 @@ class CareerViewSet(viewsets.ModelViewSet):
     )
     def by_slug(self, request, slug=None):
         """Get career by slug"""
+        response = self.cached_response(request, self._by_slug, slug=slug)
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            record_view(Career, response.instance_pk)
+        return response
+
+    def _by_slug(self, request, slug=None):
         try:
-            career = Career.objects.get(slug=slug, status='active')
-            career.view_count += 1
-            career.save(update_fields=['view_count'])
-            serializer = CareerSerializer(career)
-            return Response(serializer.data)
+            career = self.without_unused_columns(self.queryset).get(slug=slug, status='active')
         except Career.DoesNotExist:
             return Response({'error': 'Career not found'}, status=status.HTTP_404_NOT_FOUND)
+        serializer = self.get_serializer(career)
+        response = Response(serializer.data)
+        response.instance_pk = career.pk  # the serialized fields may leave out id
+        return response
 
     @action(detail=True, methods=['post'], url_path='increment-view')
     @extend_schema(
@@ -857,37 +1323,40 @@ class CareerViewSet(viewsets.ModelViewSet):
     def increment_view(self, request, pk=None):
         """Increment view count for career"""
         career = self.get_object()
-        career.view_count += 1
-        career.save(update_fields=['view_count'])
-        return Response({'view_count': career.view_count})
+        buffered = record_view(Career, career.pk)
+        return Response({'view_count': career.view_count + buffered})
 
 
 # Notice ViewSet
 @extend_schema_view(
     list=extend_schema(
         summary="List notices",
-        description="Returns a list of notices/announcements. Supports filtering by status and priority.",
+        description="Returns a list of notices/announcements. Supports filtering by status and priority. Items carry the summary fields unless `fields` or `omit` is given.",
         tags=['Notices'],
         parameters=[
             OpenApiParameter(name="status", description="Filter by status (draft, published, archived)", required=False, type=str),
             OpenApiParameter(name="priority", description="Filter by priority (low, normal, high, urgent)", required=False, type=str),
+            *SPARSE_FIELDSET_PARAMETERS,
         ],
         responses={200: NoticeSerializer(many=True)}
     ),
-    retrieve=extend_schema(summary="Retrieve a notice", tags=['Notices'], responses={200: NoticeSerializer}),
+    retrieve=extend_schema(summary="Retrieve a notice", tags=['Notices'], parameters=SPARSE_FIELDSET_PARAMETERS, responses={200: NoticeSerializer}),
     create=extend_schema(summary="Create a notice", tags=['Notices'], request=NoticeSerializer, responses={201: NoticeSerializer}),
     update=extend_schema(summary="Update a notice", tags=['Notices'], request=NoticeSerializer, responses={200: NoticeSerializer}),
     partial_update=extend_schema(summary="Partially update a notice", tags=['Notices'], request=NoticeSerializer, responses={200: NoticeSerializer}),
     destroy=extend_schema(summary="Delete a notice", tags=['Notices']),
 )
-class NoticeViewSet(viewsets.ModelViewSet):
-    queryset = Notice.objects.all()
+class NoticeViewSet(SparseFieldsetMixin, CachedResponseMixin, viewsets.ModelViewSet):
+    queryset = Notice.objects.prefetch_related('image_derivatives')
     serializer_class = NoticeSerializer
+    summary_actions = ('list', 'published')
+    query_budgets = {'list': 3, 'published': 3}
     permission_classes = [IsAdmin]  # Admin dashboard only
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ["title", "content", "excerpt"]
     ordering_fields = ["notice_date", "created_at", "updated_at", "order"]
     ordering = ["-is_sticky", "-is_featured", "-notice_date", "-created_at"]
+    cursor_ordering = ("-is_sticky", "-is_featured", "-notice_date", "-created_at", "id")
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -910,15 +1379,20 @@ class NoticeViewSet(viewsets.ModelViewSet):
     )
     def published(self, request):
         """Get all published notices with pagination"""
-        notices = Notice.objects.filter(status='published').order_by('-is_sticky', '-is_featured', '-notice_date', '-created_at')
+        return self.cached_response(request, self._published)
+
+    def _published(self, request):
+        notices = self.without_unused_columns(
+            self.queryset.filter(status='published').order_by('-is_sticky', '-is_featured', '-notice_date', '-created_at')
+        )
         
         # Apply pagination
         page = self.paginate_queryset(notices)
         if page is not None:
-            serializer = NoticeSerializer(page, many=True)
+            serializer = self.get_serializer(page, many=True)
             return self.get_paginated_response(serializer.data)
         
-        serializer = NoticeSerializer(notices, many=True)
+        serializer = self.get_serializer(notices, many=True)
         return Response(serializer.data)
 
     @action(detail=True, methods=['post'], url_path='increment-view')
@@ -931,9 +1405,8 @@ class NoticeViewSet(viewsets.ModelViewSet):
     def increment_view(self, request, pk=None):
         """Increment view count for notice"""
         notice = self.get_object()
-        notice.view_count += 1
-        notice.save(update_fields=['view_count'])
-        return Response({'view_count': notice.view_count})
+        buffered = record_view(Notice, notice.pk)
+        return Response({'view_count': notice.view_count + buffered})
 
 
 # Job Application ViewSet
@@ -952,22 +1425,29 @@ class NoticeViewSet(viewsets.ModelViewSet):
     retrieve=extend_schema(summary="Retrieve a job application", tags=['Job Applications'], responses={200: JobApplicationSerializer}),
     create=extend_schema(
         summary="Submit a job application",
-        description="Public endpoint for submitting job applications. Requires resume file upload.",
+        description="Public endpoint for submitting job applications. Requires resume file upload. "
+                    "Rate limited per client and per email (429); applying to the same career again within "
+                    "a few minutes returns the application already created (200). The resume is stored shortly after.",
         tags=['Job Applications'],
         request=JobApplicationSerializer,
-        responses={201: JobApplicationSerializer}
+        responses={201: JobApplicationSerializer, 200: JobApplicationSerializer}
     ),
     update=extend_schema(summary="Update application (Admin only)", tags=['Job Applications'], request=JobApplicationSerializer, responses={200: JobApplicationSerializer}),
     partial_update=extend_schema(summary="Partially update application (Admin only)", tags=['Job Applications'], request=JobApplicationSerializer, responses={200: JobApplicationSerializer}),
     destroy=extend_schema(summary="Delete application (Admin only)", tags=['Job Applications']),
 )
-class JobApplicationViewSet(viewsets.ModelViewSet):
-    queryset = JobApplication.objects.all()
+class JobApplicationViewSet(IntakeCreateMixin, viewsets.ModelViewSet):
+    queryset = JobApplication.objects.select_related('career')
     serializer_class = JobApplicationSerializer
+    # One application per career and applicant
+    intake_key_fields = ('email', 'career')
+    intake_file_fields = ('resume',)
+    query_budgets = {'list': 2, 'retrieve': 1, 'by_career': 3}
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ["full_name", "email", "phone", "current_position", "current_company"]
     ordering_fields = ["created_at", "updated_at", "reviewed_at", "status"]
     ordering = ["-created_at"]
+    cursor_ordering = ("-created_at", "id")
 
     def get_permissions(self):
         """Allow public POST (create), require admin for everything else"""
@@ -993,15 +1473,52 @@ class JobApplicationViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], url_path='by-career/(?P<career_id>[^/.]+)', permission_classes=[IsAdmin])
     @extend_schema(
         summary="Get applications by career",
-        description="Retrieve all applications for a specific career posting. Admin only.",
+        description="Applications for a specific career posting, a page at a time, with the number of "
+                    "applications in each status under status_counts. Accepts the list filters "
+                    "(status, search, ordering). Admin only.",
         tags=['Job Applications'],
         responses={200: JobApplicationSerializer(many=True)}
     )
     def by_career(self, request, career_id=None):
-        """Get all applications for a specific career"""
-        applications = JobApplication.objects.filter(career_id=career_id)
-        serializer = JobApplicationSerializer(applications, many=True)
-        return Response(serializer.data)
+        """Get a page of applications for a specific career, with counts by status"""
+        if not career_id.isdigit():
+            raise Http404("Career not found")
+        applications = self.filter_queryset(self.get_queryset()).filter(career_id=career_id)
+        # Counts over all the career's applications, whatever the filters
+        counts = JobApplication.objects.filter(career_id=career_id).aggregate(
+            total=Count('pk'), **status_counts('status', JobApplication.STATUS_CHOICES),
+        )
+
+        page = self.paginate_queryset(applications)
+        if page is not None:
+            response = self.get_paginated_response(self.get_serializer(page, many=True).data)
+            response.data['status_counts'] = counts
+            return response
+
+        serializer = self.get_serializer(applications, many=True)
+        return Response({'status_counts': counts, 'results': serializer.data})
+
+    @action(detail=False, methods=['post'], url_path='triage', permission_classes=[IsAdmin])
+    @extend_schema(
+        summary="Move applications to a status",
+        description="Set the status (and optionally the admin notes) of up to 500 applications at once. "
+                    "Applications leaving Pending Review get reviewed_at set. Answers with the result for "
+                    "each id: updated or not_found. Admin only.",
+        tags=['Job Applications'],
+        request=JobApplicationTriageSerializer,
+    )
+    def triage(self, request):
+        """Move many applications to a new status with one UPDATE"""
+        serializer = JobApplicationTriageSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+        with transaction.atomic():
+            rows = JobApplication.objects.filter(pk__in=ids)
+            found = set(rows.select_for_update().values_list('pk', flat=True))
+            rows.set_status(serializer.validated_data['status'], serializer.validated_data.get('admin_notes'))
+        return Response({'results': [
+            {'id': pk, 'status': 'updated' if pk in found else 'not_found'} for pk in ids
+        ]})
 
     @action(detail=True, methods=['patch'], url_path='update-status', permission_classes=[IsAdmin])
     @extend_schema(
@@ -1033,3 +1550,80 @@ class JobApplicationViewSet(viewsets.ModelViewSet):
         application.save()
         serializer = JobApplicationSerializer(application)
         return Response(serializer.data)
+
+
+# Chunked uploads
+@extend_schema_view(
+    create=extend_schema(
+        summary="Start a chunked upload",
+        description="Start uploading a large file (banner video, notice attachment, gallery image) in chunks. "
+                    "Send each chunk to chunks/<index>/, then call complete/. Admin only.",
+        tags=['Uploads'],
+    ),
+    retrieve=extend_schema(
+        summary="Get upload progress",
+        description="Status of an upload and the chunks received so far, for resuming. Admin only.",
+        tags=['Uploads'],
+    ),
+    destroy=extend_schema(summary="Abort an upload", tags=['Uploads']),
+)
+class ChunkedUploadViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin,
+                           mixins.DestroyModelMixin, viewsets.GenericViewSet):
+    queryset = ChunkedUpload.objects.all()
+    serializer_class = ChunkedUploadSerializer
+    permission_classes = [IsAdmin]
+
+    def perform_create(self, serializer):
+        serializer.save(created_by=self.request.user)
+        purge_expired_uploads.enqueue()
+
+    def perform_destroy(self, instance):
+        upload_id = str(instance.pk)
+        instance.delete()
+        discard_chunks.enqueue(upload_id)
+
+    @action(detail=True, methods=['put'], url_path=r'chunks/(?P<index>\d+)')
+    @extend_schema(
+        summary="Upload one chunk",
+        description="Raw chunk bytes (application/octet-stream). Every chunk but the last must be exactly "
+                    "chunk_size bytes. Re-sending a chunk replaces it.",
+        tags=['Uploads'],
+        request={'application/octet-stream': OpenApiTypes.BINARY},
+        responses={200: ChunkedUploadSerializer, 400: OpenApiResponse(description='Invalid chunk')},
+    )
+    def chunk(self, request, pk=None, index=None):
+        upload = self.get_object()
+        if upload.status != ChunkedUpload.UPLOADING:
+            return Response({'error': f'Upload is {upload.status}'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            # Read the body as a stream: it is never buffered in memory as a whole
+            write_chunk(upload, int(index), request.stream or BytesIO())
+        except UploadError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        ChunkedUpload.objects.filter(pk=upload.pk).update(updated_at=timezone.now())
+        return Response(self.get_serializer(upload).data)
+
+    @action(detail=True, methods=['post'])
+    @extend_schema(
+        summary="Finish a chunked upload",
+        description="Verify the file against its SHA-256 and attach it to the target. Runs in the "
+                    "background: poll the upload until its status is complete or failed.",
+        tags=['Uploads'],
+        request=ChunkedUploadCompleteSerializer,
+        responses={202: ChunkedUploadSerializer, 400: OpenApiResponse(description='Chunks missing')},
+    )
+    def complete(self, request, pk=None):
+        upload = self.get_object()
+        serializer = ChunkedUploadCompleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        missing = sorted(set(range(upload.total_chunks)) - set(received_chunks(upload)))
+        if missing:
+            return Response({'error': 'Chunks missing', 'missing_chunks': missing}, status=status.HTTP_400_BAD_REQUEST)
+        started = ChunkedUpload.objects.filter(pk=upload.pk, status=ChunkedUpload.UPLOADING).update(
+            status=ChunkedUpload.ASSEMBLING, sha256=serializer.validated_data['sha256'].lower(),
+        )
+        if not started:
+            return Response({'error': f'Upload is {upload.status}'}, status=status.HTTP_400_BAD_REQUEST)
+        finalize_upload.enqueue(str(upload.pk))
+        upload.refresh_from_db()
+        return Response(self.get_serializer(upload).data, status=status.HTTP_202_ACCEPTED)
@@ -0,0 +1,19 @@
+#!/bin/sh
+# Container entrypoint: `web` (the default) serves the site, `worker` runs the
+# background task queue. Run each as its own container so the platform
+# restarts whichever one exits.
+set -e
+
+case "$1" in
+    web)
+        python manage.py migrate --noinput
+        exec gunicorn cmspro.wsgi:application --bind "0.0.0.0:${PORT}"
+        ;;
+    worker)
+        # Serves no /metrics; gunicorn empties PROMETHEUS_MULTIPROC_DIR on start
+        exec env -u PROMETHEUS_MULTIPROC_DIR python manage.py run_task_worker
+        ;;
+    *)
+        exec "$@"
+        ;;
+esac
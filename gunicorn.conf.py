@@ -0,0 +1,25 @@
+"""
+gunicorn settings, read from the working directory when the server starts.
+
+With PROMETHEUS_MULTIPROC_DIR set, every worker writes its metrics to that
+directory (see content.metrics); these hooks keep it to the current run.
+Only gunicorn may write there: other processes (the task worker) must run
+without the variable, or their files are removed from under them.
+"""
+import os
+import shutil
+
+
+def on_starting(server):
+    # Files left by a previous run would be added to this run's numbers
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
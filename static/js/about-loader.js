@@ -24,6 +24,11 @@
    */
   const fetchAboutContent = async () => {
     try {
+      if (window.getHomeSection) {
+        const bundled = await window.getHomeSection('about');
+        if (bundled !== undefined) return bundled;
+      }
+
       const apiBaseUrl = getApiBaseUrl();
       const response = await fetch(`${apiBaseUrl}/api/about/`, {
         method: 'GET',
@@ -64,6 +69,11 @@
    */
   const fetchTeamMembers = async () => {
     try {
+      if (window.getHomeSection) {
+        const bundled = await window.getHomeSection('team_members');
+        if (bundled !== undefined) return bundled;
+      }
+
       const apiBaseUrl = getApiBaseUrl();
       const response = await fetch(`${apiBaseUrl}/api/team-members/`, {
         method: 'GET',
@@ -102,6 +112,11 @@
    */
   const fetchClients = async () => {
     try {
+      if (window.getHomeSection) {
+        const bundled = await window.getHomeSection('clients');
+        if (bundled !== undefined) return bundled;
+      }
+
       const apiBaseUrl = getApiBaseUrl();
       const response = await fetch(`${apiBaseUrl}/api/clients/`, {
         method: 'GET',
@@ -152,20 +152,23 @@ document.addEventListener('DOMContentLoaded', function() {
      */
     async function fetchFreshBanners() {
         try {
-            const response = await fetch(`${API_BASE_URL}${CONFIG.apiEndpoint}`, {
-                method: 'GET',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                cache: 'no-cache'
-            });
+            let banners = window.getHomeSection ? await window.getHomeSection('banner') : undefined;
+            if (banners === undefined) {
+                const response = await fetch(`${API_BASE_URL}${CONFIG.apiEndpoint}`, {
+                    method: 'GET',
+                    headers: {
+                        'Content-Type': 'application/json',
+                    },
+                    cache: 'no-cache'
+                });
+
+                if (!response.ok) {
+                    throw new Error(`API Error: ${response.status} ${response.statusText}`);
+                }
 
-            if (!response.ok) {
-                throw new Error(`API Error: ${response.status} ${response.statusText}`);
+                banners = await response.json();
             }
 
-            const banners = await response.json();
-
             const list = Array.isArray(banners)
                 ? banners
                 : (banners && typeof banners === 'object')
@@ -266,6 +269,33 @@ document.addEventListener('DOMContentLoaded', function() {
         setupVideoIntersectionObserver();
     }
 
+    /**
+     * Pick the cheapest stream that still fills the banner: native HLS where
+     * the browser plays it (it adapts on its own), otherwise the smallest MP4
+     * rendition at least as tall as the screen needs. Falls back to the
+     * original upload until the renditions are ready.
+     */
+    function selectVideoSource(banner) {
+        const renditions = banner.video_renditions || {};
+        const mp4s = (renditions.mp4 || []).filter(r => isValidUrl(r.url));
+        if (renditions.status !== 'ready' || !mp4s.length) {
+            return { url: banner.video, type: 'video/mp4' };
+        }
+
+        const probe = document.createElement('video');
+        if (renditions.hls && isValidUrl(renditions.hls) && probe.canPlayType('application/vnd.apple.mpegurl')) {
+            return { url: renditions.hls, type: 'application/vnd.apple.mpegurl' };
+        }
+
+        const connection = navigator.connection || {};
+        if (connection.saveData || ['slow-2g', '2g', '3g'].includes(connection.effectiveType)) {
+            return { url: mp4s[0].url, type: 'video/mp4' };
+        }
+        const neededHeight = window.innerHeight * Math.min(window.devicePixelRatio || 1, 2);
+        const fit = mp4s.find(r => r.height >= neededHeight) || mp4s[mp4s.length - 1];
+        return { url: fit.url, type: 'video/mp4' };
+    }
+
     /**
      * Create HTML for a single banner
      */
@@ -278,7 +308,8 @@ document.addEventListener('DOMContentLoaded', function() {
 
         // Check if banner has video
         if (banner.video && isValidUrl(banner.video)) {
-            const videoUrl = escapeHtml(banner.video);
+            const source = selectVideoSource(banner);
+            const videoUrl = escapeHtml(source.url);
             const posterUrl = banner.video_poster && isValidUrl(banner.video_poster) 
                 ? escapeHtml(banner.video_poster) 
                 : '';
@@ -297,7 +328,7 @@ document.addEventListener('DOMContentLoaded', function() {
                         preload="auto"
                         ${posterUrl ? `poster="${posterUrl}"` : ''}
                     >
-                        <source src="${videoUrl}" type="video/mp4">
+                        <source src="${videoUrl}" type="${source.type}">
                         Your browser does not support the video tag.
                     </video>
                 </div>
@@ -496,8 +496,15 @@
     };
 
     const fetchPost = async () => {
+      // Server-rendered pages embed the post; hydrate from it without a request
+      const initialData = document.getElementById('initial-data');
+      if (initialData) {
+        return JSON.parse(initialData.textContent);
+      }
+
       try {
-        const url = `${apiBaseUrl}/api/blog-posts/slug/${encodeURIComponent(slug)}/`;
+        // Ask for the HTML rendered on save instead of the raw source
+        const url = `${apiBaseUrl}/api/blog-posts/slug/${encodeURIComponent(slug)}/?render=html`;
         console.log('[BlogDetailLoader] Fetching from:', url);
         
         const response = await fetch(url, {
@@ -635,10 +642,10 @@
       }
 
       if (contentEl) {
-        if (post.content) {
+        if (post.content_html || post.content) {
           try {
             console.log('[BlogDetailLoader] Processing post content');
-            const htmlContent = processQuillContent(post.content);
+            const htmlContent = processQuillContent(post.content_html || post.content);
             contentEl.innerHTML = htmlContent;
             
             // Apply syntax highlighting if available
@@ -650,7 +657,7 @@
             console.error('[BlogDetailLoader] Error processing content:', error);
             contentEl.innerHTML = `<div class="error-message">
               <p>Error rendering content. Displaying raw text:</p>
-              <pre style="background: #f5f5f5; padding: 15px; border-radius: 5px; overflow-x: auto;">${escapeHtml(post.content)}</pre>
+              <pre style="background: #f5f5f5; padding: 15px; border-radius: 5px; overflow-x: auto;">${escapeHtml(post.content_html || post.content)}</pre>
             </div>`;
           }
         } else if (post.excerpt) {
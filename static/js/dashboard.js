@@ -705,7 +705,45 @@ const DashboardApp = (() => {
       });
     };
 
-    return { call, get, post, put, patch, delete: delete_, postFormData };
+    /**
+     * Upload a large file in chunks through /api/uploads/ instead of one
+     * multipart request. Each chunk is retried on its own, so a dropped
+     * connection only re-sends that chunk. Resolves with the finished upload
+     * (its object_id is the row the file was attached to).
+     */
+    const uploadChunked = async (file, { target, objectId = null, project = null, onProgress = null } = {}) => {
+      const digest = await crypto.subtle.digest('SHA-256', await file.arrayBuffer());
+      const sha256 = Array.from(new Uint8Array(digest), b => b.toString(16).padStart(2, '0')).join('');
+
+      const init = { target, filename: file.name, size: file.size };
+      if (objectId) init.object_id = objectId;
+      if (project) init.project = project;
+      let upload = await post('/api/uploads/', init);
+
+      for (let index = 0; index < upload.total_chunks; index++) {
+        const chunk = file.slice(index * upload.chunk_size, (index + 1) * upload.chunk_size);
+        await call(`/api/uploads/${upload.id}/chunks/${index}/`, {
+          method: 'PUT',
+          body: chunk,
+          isFormData: true,
+          retries: 4,
+          headers: { 'Content-Type': 'application/octet-stream' }
+        });
+        if (onProgress) onProgress((index + 1) / upload.total_chunks);
+      }
+
+      upload = await post(`/api/uploads/${upload.id}/complete/`, { sha256 });
+      while (upload.status === 'assembling') {
+        await new Promise(resolve => setTimeout(resolve, 1000));
+        upload = await get(`/api/uploads/${upload.id}/`);
+      }
+      if (upload.status !== 'complete') {
+        throw new Error(upload.error || 'Upload failed');
+      }
+      return upload;
+    };
+
+    return { call, get, post, put, patch, delete: delete_, postFormData, uploadChunked };
   })();
 
   // ============================================
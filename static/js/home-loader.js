@@ -0,0 +1,36 @@
+/**
+ * Homepage Bundle Loader
+ * Fetches every homepage section from /api/home/ in a single request.
+ * Section loaders read their data through window.getHomeSection() and fall
+ * back to their own endpoints when the bundle is unavailable.
+ */
+(function() {
+  'use strict';
+
+  const bundle = fetch('/api/home/', {
+    method: 'GET',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+    credentials: 'include'
+  })
+    .then((response) => {
+      if (!response.ok) {
+        console.warn('[HomeBundle] Failed to fetch homepage bundle:', response.status);
+        return null;
+      }
+      return response.json();
+    })
+    .catch((error) => {
+      console.error('[HomeBundle] Error fetching homepage bundle:', error);
+      return null;
+    });
+
+  /**
+   * Resolve one section of the bundle; undefined means "fetch it yourself".
+   */
+  window.getHomeSection = async (name) => {
+    const data = await bundle;
+    return data && name in data ? data[name] : undefined;
+  };
+})();
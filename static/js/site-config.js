@@ -24,6 +24,11 @@
    */
   const fetchSiteConfig = async () => {
     try {
+      if (window.getHomeSection) {
+        const bundled = await window.getHomeSection('site_config');
+        if (bundled !== undefined) return bundled;
+      }
+
       const apiBaseUrl = getApiBaseUrl();
       const response = await fetch(`${apiBaseUrl}/api/site-config/active/`, {
         method: 'GET',
@@ -19,18 +19,21 @@ document.addEventListener('DOMContentLoaded', function() {
      */
     async function fetchTeamMembers() {
         try {
-            const response = await fetch(`${API_BASE_URL}/team-members/`, {
-                method: 'GET',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-            });
+            let data = window.getHomeSection ? await window.getHomeSection('team_members') : undefined;
+            if (data === undefined) {
+                const response = await fetch(`${API_BASE_URL}/team-members/`, {
+                    method: 'GET',
+                    headers: {
+                        'Content-Type': 'application/json',
+                    },
+                });
 
-            if (!response.ok) {
-                throw new Error(`API Error: ${response.status} ${response.statusText}`);
-            }
+                if (!response.ok) {
+                    throw new Error(`API Error: ${response.status} ${response.statusText}`);
+                }
 
-            const data = await response.json();
+                data = await response.json();
+            }
             // Handle both paginated and non-paginated responses
             const teamMembers = data.results || data;
             